@@ -1,5 +1,11 @@
 # docgen/analyzers/__init__.py
-from .base_analyzer import BaseAnalyzer
+from .base_analyzer import BaseAnalyzer, analyzer_for, register_analyzer
 from .code_analyzer import CodeAnalyzer
+from .java_analyzer import JavaAnalyzer
+from .javascript_analyzer import JavaScriptAnalyzer
+from .python_analyzer import PythonAnalyzer
 
-__all__ = ['BaseAnalyzer', 'CodeAnalyzer']
\ No newline at end of file
+__all__ = [
+    'BaseAnalyzer', 'CodeAnalyzer', 'JavaAnalyzer', 'JavaScriptAnalyzer', 'PythonAnalyzer',
+    'analyzer_for', 'register_analyzer'
+]
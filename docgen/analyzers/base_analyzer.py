@@ -1,20 +1,74 @@
 # docgen/analyzers/base_analyzer.py
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Type
+
+# Structural analyzers by lower-case file extension (see ``register_analyzer``)
+_ANALYZERS: Dict[str, Type['BaseAnalyzer']] = {}
+
+
+def register_analyzer(*extensions: str) -> Callable[[Type['BaseAnalyzer']], Type['BaseAnalyzer']]:
+    """Class decorator registering a structural analyzer for file extensions."""
+    def decorator(cls: Type['BaseAnalyzer']) -> Type['BaseAnalyzer']:
+        cls.extensions = tuple(ext.lower() for ext in extensions)
+        for ext in cls.extensions:
+            _ANALYZERS[ext] = cls
+        return cls
+    return decorator
+
+
+def analyzer_for(path: Path) -> Optional[Type['BaseAnalyzer']]:
+    """Return the structural analyzer registered for ``path``'s extension, if any."""
+    return _ANALYZERS.get(Path(path).suffix.lower())
+
+
+def empty_structure() -> Dict[str, Any]:
+    """Structure returned for files without a structural analyzer.
+
+    Every language analyzer fills the same keys, which is the shape
+    ``MarkdownGenerator`` renders. Classes and functions carry 1-based
+    ``line``/``end_line`` spans (including decorators and doc comments where
+    the language attaches them).
+    """
+    return {
+        "file_docstring": None,
+        "imports": [],
+        "classes": [],
+        "functions": [],
+        "relationships": {"inheritance": [], "function_calls": []},
+    }
+
+
+def calls_relationships(symbols: List[Dict[str, Any]], calls: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    """Flatten ``{caller: [called, ...]}`` into relationship records in symbol order."""
+    return [
+        {"caller": symbol["name"], "called": called}
+        for symbol in symbols
+        for called in calls.get(symbol["name"], ())
+    ]
+
 
 class BaseAnalyzer(ABC):
-    def __init__(self, path: Path):
-        """Initialize the analyzer with a file path."""
+    extensions: tuple = ()
+    language: str = ""
+
+    def __init__(self, path: Path, source: Optional[str] = None):
+        """Initialize the analyzer with a file path.
+
+        If ``source`` is given the caller has already read the file, so the
+        filesystem checks are skipped.
+        """
         if not isinstance(path, Path):
             path = Path(path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
-        if not path.is_file():
-            raise ValueError(f"Path is not a file: {path}")
-        
+        if source is None:
+            if not path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+            if not path.is_file():
+                raise ValueError(f"Path is not a file: {path}")
+            source = path.read_text(encoding='utf-8')
+
         self.path = path
-        self.source = ""
+        self.source = source
         self.tree = None
 
     @abstractmethod
@@ -23,4 +77,4 @@ class BaseAnalyzer(ABC):
         Analyze a source code file and extract its structure.
         Must be implemented by language-specific analyzers.
         """
-        pass
\ No newline at end of file
+        pass
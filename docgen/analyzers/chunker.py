@@ -0,0 +1,223 @@
+# docgen/analyzers/chunker.py
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from docgen.utils.hashing import text_hash
+
+# Files estimated above this many tokens are documented symbol by symbol, and
+# no chunk is larger (4 characters per token, the same estimate as the server)
+DEFAULT_CHUNK_TOKENS = 6000
+CHARS_PER_TOKEN = 4
+
+# The context header repeated in front of every chunk is capped at this size
+MAX_HEADER_CHARS = 2000
+
+MODULE_CHUNK = '<module>'
+
+# Written by ``reassemble`` for chunks whose documentation failed
+MISSING_SYMBOL_DOC = '*Documentation unavailable.*'
+
+# Written in front of each symbol's heading by ``reassemble``; AI-written
+# markdown can contain any heading, so only this marker delimits symbols
+_SYMBOL_MARKER_RE = re.compile(r'^<!-- docgen:symbol (.+?) -->\n(?:### .*\n)?', re.MULTILINE)
+
+
+@dataclass
+class SymbolChunk:
+    """A unit of a source file that is documented on its own.
+
+    ``header`` carries shared context (file name, imports, the enclosing class
+    signature) and is sent along with ``source`` but is not part of the cache
+    key, so a symbol's documentation is reused as long as its own code is
+    unchanged.
+    """
+    name: str
+    kind: str  # 'module', 'class', 'function' or 'method'
+    line: int
+    end_line: int
+    source: str
+    header: str = ''
+    # Contiguous line ranges making up ``source`` (the module chunk has gaps)
+    spans: Tuple[Tuple[int, int], ...] = ()
+
+    @property
+    def code(self) -> str:
+        """Text sent to the AI: context header followed by the symbol's source."""
+        return f"{self.header}\n{self.source}" if self.header else self.source
+
+    def touches(self, ranges: Sequence[Tuple[int, int]]) -> bool:
+        """Whether any of the (first, last) line ranges overlaps this chunk."""
+        spans = self.spans or ((self.line, self.end_line),)
+        return any(first <= end and last >= start for first, last in ranges for start, end in spans)
+
+    @property
+    def key(self) -> str:
+        """Content hash identifying this symbol's documentation in the cache."""
+        return text_hash(f"{self.kind}\0{self.name}\0{self.source}")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def should_chunk(source: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> bool:
+    """Whether a file is too large to document in a single request."""
+    return max_tokens > 0 and estimate_tokens(source) > max_tokens
+
+
+def chunk_file(path: Path, analysis: Dict[str, Any], source: str,
+               max_tokens: int = DEFAULT_CHUNK_TOKENS) -> List[SymbolChunk]:
+    """Split a file into symbol-sized chunks using the analyzer's spans.
+
+    Top-level classes and functions become one chunk each; classes too large
+    for one chunk are split into their methods plus the remaining class body.
+    Everything outside a symbol (imports, constants, module code) forms the
+    leading ``<module>`` chunk. Files without structure, and symbols still too
+    large, are split at line boundaries.
+    """
+    lines = source.splitlines(keepends=True)
+    max_chars = max(1, max_tokens) * CHARS_PER_TOKEN
+    header = _context_header(path, analysis, lines)
+    symbols = sorted(
+        [(cls, 'class') for cls in analysis.get('classes') or []]
+        + [(func, 'function') for func in analysis.get('functions') or []],
+        key=lambda item: item[0].get('line') or 0
+    )
+
+    chunks: List[SymbolChunk] = []
+    module_lines: List[int] = []
+    pos = 1
+    for symbol, kind in symbols:
+        start, end = symbol.get('line'), symbol.get('end_line')
+        if not start or not end or start < pos:
+            continue  # no span, or nested in / overlapping the previous symbol
+        module_lines.extend(range(pos, start))
+        if kind == 'class' and _span_chars(lines, start, end) > max_chars:
+            chunks.extend(_class_chunks(symbol, lines, header, max_chars))
+        else:
+            chunks.extend(_split(symbol['name'], kind, lines, range(start, end + 1), header, max_chars))
+        pos = end + 1
+    module_lines.extend(range(pos, len(lines) + 1))
+
+    if any(lines[i - 1].strip() for i in module_lines):
+        chunks[:0] = _split(MODULE_CHUNK, 'module', lines, module_lines, header, max_chars)
+    return chunks
+
+
+def reassemble(chunks: Sequence[SymbolChunk], docs: Sequence[Optional[str]]) -> str:
+    """Join per-chunk documentation into one file section, in source order.
+
+    Each chunk gets a ``### `name``` heading preceded by a
+    ``<!-- docgen:symbol name -->`` marker, which is how a symbol's
+    documentation is found again within the section.
+    """
+    parts = []
+    for chunk, doc in zip(chunks, docs):
+        parts.append(f"{symbol_heading(chunk.name)}\n\n{doc or MISSING_SYMBOL_DOC}")
+    return '\n\n'.join(parts)
+
+
+def symbol_heading(name: str) -> str:
+    return f"<!-- docgen:symbol {name} -->\n### `{name}`"
+
+
+def split_symbol_docs(section: str) -> Dict[str, str]:
+    """Map symbol names to their documentation in a section built by ``reassemble``.
+
+    Symbols written with the ``MISSING_SYMBOL_DOC`` placeholder are left out,
+    so they are documented again rather than reused.
+    """
+    matches = list(_SYMBOL_MARKER_RE.finditer(section or ''))
+    docs = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(section)
+        doc = section[match.end():end].strip()
+        if doc != MISSING_SYMBOL_DOC:
+            docs[match.group(1)] = doc
+    return docs
+
+
+def missing_symbols(section: str) -> List[str]:
+    """Names of the symbols ``reassemble`` wrote with the ``MISSING_SYMBOL_DOC`` placeholder."""
+    matches = list(_SYMBOL_MARKER_RE.finditer(section or ''))
+    return [
+        match.group(1) for match, following in zip(matches, matches[1:] + [None])
+        if section[match.end():following.start() if following else len(section)].strip() == MISSING_SYMBOL_DOC
+    ]
+
+
+def _context_header(path: Path, analysis: Dict[str, Any], lines: List[str]) -> str:
+    header = [f"# File: {Path(path).name}"]
+    for imp in analysis.get('imports') or []:
+        line = imp.get('line')
+        if line and 0 < line <= len(lines):
+            header.append(lines[line - 1].rstrip())
+    text = '\n'.join(header)
+    return text if len(text) <= MAX_HEADER_CHARS else text[:MAX_HEADER_CHARS].rsplit('\n', 1)[0]
+
+
+def _class_chunks(cls: Dict[str, Any], lines: List[str], header: str, max_chars: int) -> List[SymbolChunk]:
+    """Split a large class into its body (without methods) and one chunk per method."""
+    start, end = cls['line'], cls['end_line']
+    methods = [m for m in cls.get('methods') or [] if m.get('line') and m.get('end_line')]
+    method_lines = {i for m in methods for i in range(m['line'], m['end_line'] + 1)}
+    first_method = min((m['line'] for m in methods), default=end + 1)
+    signature = ''.join(lines[start - 1:first_method - 1]).rstrip()
+    if len(signature) > MAX_HEADER_CHARS:
+        signature = lines[start - 1].rstrip()
+    method_header = f"{header}\n{signature}\n    ..." if header else f"{signature}\n    ..."
+
+    body = [i for i in range(start, end + 1) if i not in method_lines]
+    chunks = _split(cls['name'], 'class', lines, body, header, max_chars)
+    for method in methods:
+        chunks.extend(_split(
+            f"{cls['name']}.{method['name']}", 'method', lines,
+            range(method['line'], method['end_line'] + 1), method_header, max_chars
+        ))
+    return chunks
+
+
+def _split(name: str, kind: str, lines: List[str], line_numbers: Sequence[int],
+           header: str, max_chars: int) -> List[SymbolChunk]:
+    """One chunk for ``line_numbers``, or numbered parts if it exceeds ``max_chars``."""
+    groups: List[List[int]] = [[]]
+    size = 0
+    for number in line_numbers:
+        if number > len(lines):
+            break
+        length = len(lines[number - 1])
+        if groups[-1] and size + length > max_chars:
+            groups.append([])
+            size = 0
+        groups[-1].append(number)
+        size += length
+    groups = [group for group in groups if group]
+
+    chunks = []
+    for part, group in enumerate(groups, 1):
+        chunks.append(SymbolChunk(
+            name=name if len(groups) == 1 else f"{name} (part {part})",
+            kind=kind,
+            line=group[0],
+            end_line=group[-1],
+            source=''.join(lines[i - 1] for i in group),
+            header=header,
+            spans=_runs(group)
+        ))
+    return chunks
+
+
+def _runs(numbers: List[int]) -> Tuple[Tuple[int, int], ...]:
+    """Collapse sorted line numbers into (first, last) runs."""
+    runs: List[Tuple[int, int]] = []
+    for number in numbers:
+        if runs and runs[-1][1] == number - 1:
+            runs[-1] = (runs[-1][0], number)
+        else:
+            runs.append((number, number))
+    return tuple(runs)
+
+
+def _span_chars(lines: List[str], start: int, end: int) -> int:
+    return sum(len(line) for line in lines[start - 1:end])
@@ -1,35 +1,58 @@
 from pathlib import Path
-from typing import Dict, Any
-from .base_analyzer import BaseAnalyzer
+from typing import Dict, Any, Optional
+from .base_analyzer import BaseAnalyzer, analyzer_for, empty_structure
+# Imported for their side effect of registering per-language analyzers
+from . import java_analyzer, javascript_analyzer, python_analyzer  # noqa: F401
 
 class CodeAnalyzer(BaseAnalyzer):
-    def __init__(self, path: Path):
-        """Initialize the analyzer with a file path."""
+    def __init__(self, path: Path, source: Optional[str] = None):
+        """Initialize the analyzer with a file path.
+
+        If ``source`` is given the caller has already read the file, so the
+        filesystem checks and the second read are skipped.
+        """
         if not isinstance(path, Path):
             path = Path(path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {path}")
-        if not path.is_file():
-            raise ValueError(f"Path is not a file: {path}")
+        if source is None:
+            if not path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+            if not path.is_file():
+                raise ValueError(f"Path is not a file: {path}")
         
         self.path = path
-        self.source = ""
+        self.source = source
         
     def analyze_file(self) -> Dict[str, Any]:
         """
         Analyzes any source code file for AI documentation generation.
-        Returns basic file information and content.
+        Returns basic file information and content, plus the imports, classes,
+        functions and relationships found by the analyzer registered for the
+        file's extension. Files without one, or that fail to parse, get empty
+        structure so callers can always rely on the keys.
         """
         try:
-            with open(self.path, 'r', encoding='utf-8') as f:
-                self.source = f.read()
+            if self.source is None:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.source = f.read()
             
-            return {
+            result = {
                 "file_path": str(self.path),
                 "file_name": self.path.name,
                 "extension": self.path.suffix,
                 "source_code": self.source,
-                "size": len(self.source)
+                "size": len(self.source),
+                "language": None,
             }
         except Exception as e:
             raise Exception(f"Error analyzing file {self.path}: {str(e)}")
+
+        result.update(empty_structure())
+        analyzer_cls = analyzer_for(self.path)
+        if analyzer_cls is not None:
+            try:
+                result.update(analyzer_cls(self.path, self.source).analyze_file())
+                result["language"] = analyzer_cls.language
+            except Exception:
+                # Syntax errors, unsupported syntax: the source alone still documents
+                pass
+        return result
@@ -0,0 +1,152 @@
+# docgen/analyzers/java_analyzer.py
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+from .base_analyzer import BaseAnalyzer, calls_relationships, empty_structure, register_analyzer
+
+try:
+    import javalang
+except ImportError:  # Optional: without javalang, Java files get no structure
+    javalang = None
+
+
+class JavaAnalyzer(BaseAnalyzer):
+    """Structural analyzer for Java using ``javalang``."""
+
+    language = "java"
+
+    def analyze_file(self) -> Dict[str, Any]:
+        self.tree = javalang.parse.parse(self.source)
+        self._index_blocks(javalang.tokenizer.tokenize(self.source))
+        result = empty_structure()
+        calls: Dict[str, List[str]] = {}
+
+        for imp in self.tree.imports:
+            module, _, name = imp.path.rpartition('.')
+            if imp.wildcard:
+                module, name = imp.path, '*'
+            result["imports"].append({
+                "type": "from",
+                "module": module,
+                "names": [{"name": name, "asname": None}],
+                "line": imp.position.line if imp.position else None,
+            })
+
+        for node in self.tree.types:
+            class_info = self._class_info(node)
+            result["classes"].append(class_info)
+            for base in class_info["bases"]:
+                result["relationships"]["inheritance"].append(
+                    {"class": node.name, "inherits_from": base}
+                )
+            for method in self._methods(node):
+                calls[f"{node.name}.{method.name}"] = self._calls(method)
+
+        # Java has no free functions; method calls are keyed Class.method
+        methods = [
+            {"name": f"{cls['name']}.{m['name']}"} for cls in result["classes"] for m in cls["methods"]
+        ]
+        result["relationships"]["function_calls"] = calls_relationships(methods, calls)
+        return result
+
+    def _class_info(self, node) -> Dict[str, Any]:
+        bases = []
+        extends = getattr(node, 'extends', None)
+        if extends:
+            # Interfaces may extend several interfaces
+            bases.extend(self._type_name(t) for t in (extends if isinstance(extends, list) else [extends]))
+        bases.extend(self._type_name(t) for t in getattr(node, 'implements', None) or [])
+        line = self._start_line(node)
+        return {
+            "name": node.name,
+            "bases": bases,
+            "docstring": self._clean_doc(node.documentation),
+            "methods": [self._method_info(m) for m in self._methods(node)],
+            "line": line,
+            "end_line": self._end_line(node.position.line),
+        }
+
+    def _method_info(self, node) -> Dict[str, Any]:
+        return_type = getattr(node, 'return_type', None)
+        is_constructor = isinstance(node, javalang.tree.ConstructorDeclaration)
+        return {
+            "name": node.name,
+            "args": [f"{self._type_name(p.type)} {p.name}" for p in node.parameters],
+            "returns": None if is_constructor else (self._type_name(return_type) if return_type else 'void'),
+            "docstring": self._clean_doc(node.documentation),
+            "async": False,
+            "line": self._start_line(node),
+            "end_line": self._end_line(node.position.line),
+        }
+
+    @staticmethod
+    def _methods(node) -> list:
+        return [
+            m for m in node.body or []
+            if isinstance(m, (javalang.tree.MethodDeclaration, javalang.tree.ConstructorDeclaration))
+        ] if isinstance(node.body, list) else []
+
+    def _start_line(self, node) -> int:
+        line = node.position.line
+        # Annotations precede the declaration's reported position
+        for annotation in getattr(node, 'annotations', None) or []:
+            if annotation.position:
+                line = min(line, annotation.position.line)
+        if node.documentation:
+            line -= node.documentation.count('\n') + 1
+        return max(line, 1)
+
+    def _index_blocks(self, tokens) -> None:
+        """Pair every ``{`` with its closing ``}`` in one pass over the tokens.
+
+        ``_opener_lines`` holds the line of each ``{`` and ``;`` in source
+        order and ``_closer_lines`` the line where that block or statement
+        ends, so ``_end_line`` is a binary search instead of a token scan.
+        """
+        self._opener_lines: List[int] = []
+        self._closer_lines: List[int] = []
+        open_blocks = []
+        for token in tokens:
+            if token.value in ('{', ';'):
+                if token.value == '{':
+                    open_blocks.append(len(self._closer_lines))
+                self._opener_lines.append(token.position.line)
+                self._closer_lines.append(token.position.line)
+            elif token.value == '}' and open_blocks:
+                self._closer_lines[open_blocks.pop()] = token.position.line
+
+    def _end_line(self, line: int) -> int:
+        """Line of the brace closing the first block opened at or after ``line``.
+
+        Abstract and interface methods end at their ``;`` instead.
+        """
+        i = bisect_left(self._opener_lines, line)
+        return self._closer_lines[i] if i < len(self._opener_lines) else line
+
+    @staticmethod
+    def _type_name(node) -> str:
+        name = node.name
+        if getattr(node, 'sub_type', None):
+            name += '.' + JavaAnalyzer._type_name(node.sub_type)
+        if getattr(node, 'arguments', None):
+            args = [JavaAnalyzer._type_name(a.type) if a.type else '?' for a in node.arguments]
+            name += f"<{', '.join(args)}>"
+        return name + '[]' * len(getattr(node, 'dimensions', None) or [])
+
+    @staticmethod
+    def _clean_doc(doc: Optional[str]) -> Optional[str]:
+        if not doc:
+            return None
+        lines = [line.strip().lstrip('*').strip() for line in doc.strip('/*').splitlines()]
+        return '\n'.join(line for line in lines if line) or None
+
+    @staticmethod
+    def _calls(node) -> List[str]:
+        """Names called inside ``node``, in first-seen order."""
+        called = {}
+        for _, invocation in node.filter(javalang.tree.MethodInvocation):
+            called[invocation.member] = None
+        return list(called)
+
+
+if javalang is not None:
+    register_analyzer('.java')(JavaAnalyzer)
@@ -0,0 +1,181 @@
+# docgen/analyzers/javascript_analyzer.py
+from typing import Any, Dict, Iterator, List, Optional
+from .base_analyzer import BaseAnalyzer, calls_relationships, empty_structure, register_analyzer
+
+try:
+    import esprima
+except ImportError:  # Optional: without esprima, JS files get no structure
+    esprima = None
+
+_FUNCTION_TYPES = ('FunctionExpression', 'ArrowFunctionExpression')
+
+
+class JavaScriptAnalyzer(BaseAnalyzer):
+    """Structural analyzer for JavaScript using ``esprima``.
+
+    esprima parses ECMAScript only, so TypeScript files are not registered.
+    """
+
+    language = "javascript"
+
+    def analyze_file(self) -> Dict[str, Any]:
+        options = {'loc': True, 'comment': True, 'tolerant': True, 'jsx': True}
+        try:
+            self.tree = esprima.parseModule(self.source, options).toDict()
+        except esprima.Error:
+            self.tree = esprima.parseScript(self.source, options).toDict()
+        # JSDoc comments by the line they end on: (start line, cleaned text)
+        self._doc_comments = {
+            comment['loc']['end']['line']: (comment['loc']['start']['line'], self._clean_comment(comment['value']))
+            for comment in self.tree.get('comments') or []
+            if comment['type'] == 'Block' and comment['value'].startswith('*')
+        }
+
+        result = empty_structure()
+        calls: Dict[str, List[str]] = {}
+        body = self.tree.get('body') or []
+        if body and self._doc_comments:
+            first_line = body[0]['loc']['start']['line']
+            result["file_docstring"] = next(
+                (doc for line, (_, doc) in sorted(self._doc_comments.items()) if line < first_line), None
+            )
+
+        for statement in body:
+            node = statement
+            if node['type'] in ('ExportNamedDeclaration', 'ExportDefaultDeclaration') and node.get('declaration'):
+                node = node['declaration']
+
+            if statement['type'] == 'ImportDeclaration':
+                result["imports"].append({
+                    "type": "from",
+                    "module": statement['source']['value'],
+                    "names": [self._specifier(s) for s in statement['specifiers']],
+                    "line": statement['loc']['start']['line'],
+                })
+            elif node['type'] in ('ClassDeclaration', 'ClassExpression'):
+                class_info = self._class_info(node, statement)
+                result["classes"].append(class_info)
+                for base in class_info["bases"]:
+                    result["relationships"]["inheritance"].append(
+                        {"class": class_info["name"], "inherits_from": base}
+                    )
+            elif node['type'] in ('FunctionDeclaration',) + _FUNCTION_TYPES:
+                name = (node.get('id') or {}).get('name') or 'default'
+                result["functions"].append(self._function_info(name, node, statement))
+                calls[name] = self._calls(node)
+            elif node['type'] == 'VariableDeclaration':
+                # const handler = (req) => { ... }
+                for declarator in node['declarations']:
+                    init = declarator.get('init') or {}
+                    if init.get('type') in _FUNCTION_TYPES and declarator['id']['type'] == 'Identifier':
+                        name = declarator['id']['name']
+                        result["functions"].append(self._function_info(name, init, statement))
+                        calls[name] = self._calls(init)
+
+        result["relationships"]["function_calls"] = calls_relationships(result["functions"], calls)
+        return result
+
+    def _class_info(self, node: Dict, statement: Dict) -> Dict[str, Any]:
+        methods = []
+        for member in node['body']['body']:
+            if member['type'] == 'MethodDefinition' and member['value']:
+                methods.append(self._function_info(self._key_name(member['key']), member['value'], member))
+        superclass = node.get('superClass')
+        return {
+            "name": (node.get('id') or {}).get('name') or 'default',
+            "bases": [self._expression_name(superclass)] if superclass else [],
+            "docstring": self._doc_for(statement),
+            "methods": methods,
+            "line": self._start_line(statement),
+            "end_line": statement['loc']['end']['line'],
+        }
+
+    def _function_info(self, name: str, node: Dict, statement: Dict) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "args": [self._param(p) for p in node.get('params') or []],
+            "returns": None,
+            "docstring": self._doc_for(statement),
+            "async": bool(node.get('async')),
+            "line": self._start_line(statement),
+            "end_line": statement['loc']['end']['line'],
+        }
+
+    def _doc_for(self, node: Dict) -> Optional[str]:
+        comment = self._doc_comments.get(node['loc']['start']['line'] - 1)
+        return comment[1] if comment else None
+
+    def _start_line(self, node: Dict) -> int:
+        # A JSDoc comment ending right above the symbol belongs to it
+        line = node['loc']['start']['line']
+        comment = self._doc_comments.get(line - 1)
+        return comment[0] if comment else line
+
+    @staticmethod
+    def _clean_comment(value: str) -> str:
+        lines = [line.strip().lstrip('*').strip() for line in value.strip('*').splitlines()]
+        return '\n'.join(line for line in lines if line) or ''
+
+    @staticmethod
+    def _specifier(spec: Dict) -> Dict[str, Optional[str]]:
+        local = spec['local']['name']
+        if spec['type'] == 'ImportDefaultSpecifier':
+            return {"name": "default", "asname": local}
+        if spec['type'] == 'ImportNamespaceSpecifier':
+            return {"name": "*", "asname": local}
+        imported = spec['imported']['name']
+        return {"name": imported, "asname": local if local != imported else None}
+
+    def _param(self, param: Dict) -> str:
+        kind = param['type']
+        if kind == 'Identifier':
+            return param['name']
+        if kind == 'AssignmentPattern':
+            return f"{self._param(param['left'])}="
+        if kind == 'RestElement':
+            return f"...{self._param(param['argument'])}"
+        if kind == 'ObjectPattern':
+            return '{...}'
+        if kind == 'ArrayPattern':
+            return '[...]'
+        return 'arg'
+
+    @staticmethod
+    def _key_name(key: Dict) -> str:
+        return key.get('name') or str(key.get('value', 'computed'))
+
+    def _expression_name(self, node: Dict) -> str:
+        if node['type'] == 'Identifier':
+            return node['name']
+        if node['type'] == 'MemberExpression':
+            return f"{self._expression_name(node['object'])}.{self._key_name(node['property'])}"
+        return node['type']
+
+    def _calls(self, node: Dict) -> List[str]:
+        """Names called inside ``node``, in first-seen order."""
+        called = {}
+        for child in _walk(node):
+            if child.get('type') == 'CallExpression':
+                callee = child['callee']
+                if callee['type'] == 'Identifier':
+                    called[callee['name']] = None
+                elif callee['type'] == 'MemberExpression' and not callee.get('computed'):
+                    called[self._key_name(callee['property'])] = None
+        return list(called)
+
+
+def _walk(node: Any) -> Iterator[Dict]:
+    """Yield every AST node (dict with a ``type``) below ``node``."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if 'type' in item:
+                yield item
+            stack.extend(value for key, value in item.items() if key != 'loc')
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+if esprima is not None:
+    register_analyzer('.js', '.jsx', '.mjs', '.cjs')(JavaScriptAnalyzer)
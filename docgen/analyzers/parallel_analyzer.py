@@ -0,0 +1,39 @@
+# docgen/analyzers/parallel_analyzer.py
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from .code_analyzer import CodeAnalyzer
+from docgen.utils.hashing import content_hash
+
+# Skip files larger than 5MB; large files are documented per symbol chunk
+MAX_FILE_SIZE = 5_000_000
+
+
+def default_workers() -> int:
+    """Worker count for I/O-bound reads (same heuristic as ThreadPoolExecutor)."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def read_and_analyze(path: Path, max_file_size: int = MAX_FILE_SIZE) -> Optional[Tuple[Path, Dict, str]]:
+    """Read a file once and analyze it.
+
+    Returns:
+        Optional[Tuple[Path, Dict, str]]: (path, analysis, source), or None if the
+        file is too large, empty or not valid UTF-8
+    """
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > max_file_size:
+                return None
+            raw = f.read()
+        source = raw.decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    if not source.strip():
+        return None
+
+    analysis = CodeAnalyzer(path, source=source).analyze_file()
+    # Hash the bytes we already hold so cache keys never need a second pass
+    analysis['content_hash'] = content_hash(raw)
+    return path, analysis, source
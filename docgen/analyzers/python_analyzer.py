@@ -0,0 +1,111 @@
+# docgen/analyzers/python_analyzer.py
+import ast
+from typing import Any, Dict, List, Union
+from .base_analyzer import BaseAnalyzer, calls_relationships, empty_structure, register_analyzer
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+@register_analyzer('.py', '.pyi')
+class PythonAnalyzer(BaseAnalyzer):
+    """Structural analyzer for Python using the standard library ``ast`` module."""
+
+    language = "python"
+
+    def analyze_file(self) -> Dict[str, Any]:
+        self.tree = ast.parse(self.source, filename=str(self.path))
+        result = empty_structure()
+        result["file_docstring"] = ast.get_docstring(self.tree)
+        calls: Dict[str, List[str]] = {}
+
+        for node in ast.walk(self.tree):
+            if isinstance(node, ast.Import):
+                result["imports"].append({
+                    "type": "import",
+                    "module": None,
+                    "names": [{"name": a.name, "asname": a.asname} for a in node.names],
+                    "line": node.lineno,
+                })
+            elif isinstance(node, ast.ImportFrom):
+                result["imports"].append({
+                    "type": "from",
+                    "module": "." * node.level + (node.module or ""),
+                    "names": [{"name": a.name, "asname": a.asname} for a in node.names],
+                    "line": node.lineno,
+                })
+
+        for node in self.tree.body:
+            if isinstance(node, ast.ClassDef):
+                class_info = self._class_info(node)
+                result["classes"].append(class_info)
+                for base in class_info["bases"]:
+                    result["relationships"]["inheritance"].append(
+                        {"class": node.name, "inherits_from": base}
+                    )
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                result["functions"].append(self._function_info(node))
+                calls[node.name] = self._calls(node)
+
+        result["relationships"]["function_calls"] = calls_relationships(result["functions"], calls)
+        return result
+
+    def _class_info(self, node: ast.ClassDef) -> Dict[str, Any]:
+        methods = []
+        for child in node.body:
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                methods.append(self._function_info(child))
+        return {
+            "name": node.name,
+            "bases": [ast.unparse(base) for base in node.bases],
+            "docstring": ast.get_docstring(node),
+            "methods": methods,
+            "line": self._start_line(node),
+            "end_line": node.end_lineno,
+        }
+
+    def _function_info(self, node: FunctionNode) -> Dict[str, Any]:
+        return {
+            "name": node.name,
+            "args": self._format_args(node.args),
+            "returns": ast.unparse(node.returns) if node.returns else None,
+            "docstring": ast.get_docstring(node),
+            "async": isinstance(node, ast.AsyncFunctionDef),
+            "line": self._start_line(node),
+            "end_line": node.end_lineno,
+        }
+
+    @staticmethod
+    def _start_line(node: ast.AST) -> int:
+        # Decorators belong to the symbol they decorate
+        return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+
+    @staticmethod
+    def _format_args(args: ast.arguments) -> List[str]:
+        def fmt(arg: ast.arg, prefix: str = "") -> str:
+            text = prefix + arg.arg
+            if arg.annotation is not None:
+                text += f": {ast.unparse(arg.annotation)}"
+            return text
+
+        formatted = [fmt(a) for a in args.posonlyargs + args.args]
+        if args.vararg:
+            formatted.append(fmt(args.vararg, "*"))
+        elif args.kwonlyargs:
+            formatted.append("*")
+        formatted.extend(fmt(a) for a in args.kwonlyargs)
+        if args.kwarg:
+            formatted.append(fmt(args.kwarg, "**"))
+        return formatted
+
+    @staticmethod
+    def _calls(node: ast.AST) -> List[str]:
+        """Names called inside ``node``, in first-seen order."""
+        called = {}
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                func = child.func
+                if isinstance(func, ast.Name):
+                    called[func.id] = None
+                elif isinstance(func, ast.Attribute):
+                    called[func.attr] = None
+        return list(called)
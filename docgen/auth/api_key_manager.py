@@ -1,9 +1,9 @@
 import json
 from pathlib import Path
-import requests
 from typing import Optional, Tuple
 from ..utils.machine_utils import get_machine_id
 from docgen.config.urls import URLConfig
+from docgen.utils.http import get_session
 
 class APIKeyManager:
     def __init__(self):
@@ -40,7 +40,7 @@ class APIKeyManager:
     def validate_api_key(self, api_key: str) -> Tuple[bool, Optional[str]]:
         """Validate API key with server and return (success, plan)."""
         try:
-            response = requests.post(
+            response = get_session().post(
                 f"{URLConfig.AUTH_BASE_URL}/verify-key",
                 json={'api_key': api_key, 'machine_id': self.machine_id},
                 timeout=10
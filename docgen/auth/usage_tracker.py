@@ -1,9 +1,9 @@
-import requests
 from typing import Dict, Tuple, Optional
 from rich.console import Console
 from .api_key_manager import APIKeyManager
 from ..utils.machine_utils import get_machine_id
 from docgen.config.urls import URLConfig
+from docgen.utils.http import get_session
 from typing import Tuple
 
 console = Console()
@@ -25,7 +25,7 @@ class UsageTracker:
                 'x-api-key': self.api_key_manager.get_api_key()
             }
             
-            response = requests.get(
+            response = get_session().get(
                 f"{self.base_url}/check",
                 headers=headers,
                 timeout=10
@@ -51,7 +51,7 @@ class UsageTracker:
                 'x-api-key': self.api_key_manager.get_api_key()
             }
             
-            response = requests.post(
+            response = get_session().post(
                 f"{self.base_url}/track",
                 headers=headers,
                 json={'request_type': 'doc_generation'},  # Send as JSON body
@@ -0,0 +1,9 @@
+from .backends import CacheBackend, SharedDirectoryCache, HTTPCache, ReadThroughCache
+from .sqlite_cache import DocCache
+from .file_index import FileIndex, FileState
+from .memory_cache import MemoryLRU, TieredCache, get_shared_cache
+
+__all__ = [
+    'CacheBackend', 'SharedDirectoryCache', 'HTTPCache', 'ReadThroughCache',
+    'DocCache', 'FileIndex', 'FileState', 'MemoryLRU', 'TieredCache', 'get_shared_cache'
+]
@@ -0,0 +1,227 @@
+# docgen/cache/backends.py
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+
+Items = Union[Dict[str, str], Iterable[Tuple[str, str]]]
+
+
+def _as_pairs(items: Items) -> List[Tuple[str, str]]:
+    pairs = items.items() if isinstance(items, dict) else items
+    return [(key, content) for key, content in pairs if content and isinstance(content, str)]
+
+
+class CacheBackend(ABC):
+    """Interface for documentation cache backends.
+
+    Keys are content-addressed (see ``docgen.utils.hashing.doc_cache_key``), so
+    any backend can be shared between machines: an entry written by one
+    developer or CI job is a valid hit for everyone else.
+    """
+
+    ttl: timedelta = timedelta(days=1)
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Return ``{key: content}`` for the keys that are present."""
+
+    @abstractmethod
+    def put_many(self, items: Items) -> None:
+        """Store several entries."""
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, content: str) -> None:
+        self.put_many([(key, content)])
+
+    def touch(self, keys: Iterable[str]) -> None:
+        """Mark entries as recently used without reading them."""
+
+    def delete(self, keys: Iterable[str]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def prune(self) -> Dict[str, int]:
+        return {'expired': 0, 'evicted': 0}
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class SharedDirectoryCache(CacheBackend):
+    """Cache stored as one small file per key under a shared directory (e.g. NFS).
+
+    Files are sharded by the first two characters of the key and written
+    atomically (temporary file + rename), so concurrent writers on different
+    machines never expose partial entries.
+    """
+
+    def __init__(self, root: Path, ttl: timedelta = timedelta(days=7)):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        found = {}
+        now = time.time()
+        for key in keys:
+            try:
+                data = json.loads(self._entry_path(key).read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            if now - data.get('created_at', 0) <= self.ttl.total_seconds() and data.get('content'):
+                found[key] = data['content']
+        return found
+
+    def put_many(self, items: Items) -> None:
+        now = time.time()
+        for key, content in _as_pairs(items):
+            path = self._entry_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'content': content, 'created_at': now}, f, ensure_ascii=False)
+                os.replace(temp_name, path)
+            except OSError:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                self._entry_path(key).unlink()
+            except OSError:
+                pass
+
+
+class HTTPCache(CacheBackend):
+    """Remote cache speaking a minimal HTTP protocol.
+
+    ``GET {base_url}/{key}`` returns the content (200) or 404, and
+    ``PUT {base_url}/{key}`` stores the request body. ``docgen cache serve``
+    implements the server side. Network errors count as misses so a slow or
+    unreachable cache never fails documentation generation.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 5.0, max_workers: int = 8):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _get_one(self, key: str) -> Optional[str]:
+        try:
+            response = self.session.get(f"{self.base_url}/{key}", timeout=self.timeout)
+            if response.status_code == 200:
+                response.encoding = 'utf-8'
+                return response.text or None
+        except requests.RequestException:
+            pass
+        return None
+
+    def _put_one(self, item: Tuple[str, str]) -> None:
+        key, content = item
+        try:
+            self.session.put(
+                f"{self.base_url}/{key}",
+                data=content.encode('utf-8'),
+                headers={'Content-Type': 'text/plain; charset=utf-8'},
+                timeout=self.timeout
+            )
+        except requests.RequestException:
+            pass
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(keys))) as executor:
+            contents = list(executor.map(self._get_one, keys))
+        return {key: content for key, content in zip(keys, contents) if content}
+
+    def put_many(self, items: Items) -> None:
+        pairs = _as_pairs(items)
+        if not pairs:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pairs))) as executor:
+            list(executor.map(self._put_one, pairs))
+
+
+class ReadThroughCache(CacheBackend):
+    """A local cache backed by a shared remote cache.
+
+    Lookups hit the local cache first; remaining keys are fetched from the
+    remote and copied locally. Writes go to both, so one person's generation
+    becomes everyone's cache hit.
+    """
+
+    def __init__(self, local, remote: CacheBackend):
+        self.local = local
+        self.remote = remote
+
+    @property
+    def ttl(self) -> timedelta:
+        return self.local.ttl
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(dict.fromkeys(keys))
+        found = self.local.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from_remote = self.remote.get_many(missing)
+            if from_remote:
+                self.local.put_many(from_remote)
+                found.update(from_remote)
+        return found
+
+    def put_many(self, items: Items) -> None:
+        pairs = _as_pairs(items)
+        self.local.put_many(pairs)
+        self.remote.put_many(pairs)
+
+    def touch(self, keys: Iterable[str]) -> None:
+        self.local.touch(keys)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        self.local.delete(keys)
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def prune(self) -> Dict[str, int]:
+        return self.local.prune()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.local.stats()
+        stats['remote'] = type(self.remote).__name__
+        return stats
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+
+def create_remote_backend(location: str) -> CacheBackend:
+    """Build a shared backend from the ``shared_cache`` setting (URL or directory)."""
+    if location.startswith(('http://', 'https://')):
+        return HTTPCache(location)
+    return SharedDirectoryCache(Path(location).expanduser())
@@ -0,0 +1,84 @@
+# docgen/cache/file_index.py
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+DEFAULT_INDEX_FILE = Path('.docgen') / 'file_index.db'
+
+
+@dataclass(frozen=True)
+class FileState:
+    """What a file looked like when its documentation was last written."""
+    mtime_ns: int
+    size: int
+    inode: int
+    content_hash: str
+    doc_key: str
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Whether ``st`` shows the file unchanged since this state was recorded."""
+        return (st.st_mtime_ns, st.st_size, st.st_ino) == (self.mtime_ns, self.size, self.inode)
+
+
+class FileIndex:
+    """Project-local index of documented files, keyed by path.
+
+    Lets ``generate`` resolve an unchanged file with one ``stat`` call: if
+    mtime, size and inode all match, the recorded ``doc_key`` points at its
+    documentation in the cache and the file is never read. The whole index is
+    loaded once per run and written back in a single transaction.
+    """
+
+    def __init__(self, path: Path = DEFAULT_INDEX_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Loaded and saved from worker threads, one call at a time
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                doc_key TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def load(self) -> Dict[str, FileState]:
+        """All recorded states, by path."""
+        rows = self._conn.execute(
+            "SELECT path, mtime_ns, size, inode, content_hash, doc_key FROM files"
+        )
+        return {row[0]: FileState(*row[1:]) for row in rows}
+
+    def update(self, states: Dict[str, FileState]) -> None:
+        """Insert or replace the states of several files in one transaction."""
+        if not states:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, inode, content_hash, doc_key) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (path, s.mtime_ns, s.size, s.inode, s.content_hash, s.doc_key)
+                    for path, s in states.items()
+                ]
+            )
+
+    def remove(self, paths: Iterable[str]) -> None:
+        """Forget files that no longer exist."""
+        with self._conn:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in paths])
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def file_state(st: os.stat_result, content_hash: str, doc_key: str) -> FileState:
+    """Build a ``FileState`` from a stat result."""
+    return FileState(st.st_mtime_ns, st.st_size, st.st_ino, content_hash, doc_key)
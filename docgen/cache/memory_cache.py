@@ -0,0 +1,186 @@
+# docgen/cache/memory_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from .backends import CacheBackend
+
+DEFAULT_MEMORY_ENTRIES = 2048
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+
+
+class MemoryLRU:
+    """Bounded in-process LRU cache with hit/miss counters.
+
+    Entries are evicted least recently used first once either ``max_entries``
+    or ``max_bytes`` (UTF-8 size of the content) is exceeded. An optional
+    ``ttl_seconds`` keeps entries from outliving the persistent tier's TTL in
+    long-lived processes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_bytes: int = DEFAULT_MEMORY_BYTES,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[str, int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached content and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and time.time() - entry[2] > self.ttl_seconds:
+                self._remove_locked(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, content: str) -> None:
+        """Insert or refresh an entry, evicting old ones if needed."""
+        if not content or not isinstance(content, str):
+            return
+        size = len(content.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = (content, size, time.time())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+
+    def _remove_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove_locked(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TieredCache(CacheBackend):
+    """A ``MemoryLRU`` in front of a persistent cache such as ``DocCache``.
+
+    Exposes the same ``get``/``get_many``/``put``/``put_many`` interface as the
+    persistent cache. Lookups are served from memory when possible; only the
+    remaining keys go to the persistent tier, and its hits are promoted.
+    Memory hits are passed on with ``touch``, so the persistent tier's LRU
+    eviction does not drop the entries used most in this process.
+    """
+
+    def __init__(self, persistent: CacheBackend, memory: Optional[MemoryLRU] = None):
+        self.persistent = persistent
+        self.memory = memory or MemoryLRU(ttl_seconds=persistent.ttl.total_seconds())
+
+    @property
+    def ttl(self):
+        return self.persistent.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        remaining = []
+        for key in dict.fromkeys(keys):
+            content = self.memory.get(key)
+            if content is not None:
+                found[key] = content
+            else:
+                remaining.append(key)
+        if found:
+            self.persistent.touch(list(found))
+        if remaining:
+            from_disk = self.persistent.get_many(remaining)
+            for key, content in from_disk.items():
+                self.memory.put(key, content)
+            found.update(from_disk)
+        return found
+
+    def put(self, key: str, content: str) -> None:
+        self.put_many([(key, content)])
+
+    def put_many(self, items: Union[Dict[str, str], Iterable[Tuple[str, str]]]) -> None:
+        items = list(items.items() if isinstance(items, dict) else items)
+        for key, content in items:
+            self.memory.put(key, content)
+        self.persistent.put_many(items)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        for key in keys:
+            self.memory.delete(key)
+        self.persistent.delete(keys)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.persistent.clear()
+
+    def prune(self) -> Dict[str, int]:
+        return self.persistent.prune()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.persistent.stats()
+        stats['memory'] = self.memory.stats()
+        return stats
+
+    def __len__(self) -> int:
+        return len(self.persistent)
+
+
+_shared_cache: Optional[TieredCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> TieredCache:
+    """Process-wide documentation cache shared by ``AIClient`` and ``AIDocGenerator``.
+
+    When ``shared_cache`` is configured (a directory such as an NFS mount, or
+    an HTTP cache URL), the local SQLite cache reads through to it.
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            from docgen.config.config_handler import ConfigHandler
+            from .backends import ReadThroughCache, create_remote_backend
+            from .sqlite_cache import DocCache
+            persistent = DocCache.from_config()
+            shared_location = ConfigHandler().get('shared_cache')
+            if shared_location:
+                persistent = ReadThroughCache(persistent, create_remote_backend(shared_location))
+            _shared_cache = TieredCache(persistent)
+        return _shared_cache
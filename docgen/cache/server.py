@@ -0,0 +1,73 @@
+# docgen/cache/server.py
+import re
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from .backends import SharedDirectoryCache
+
+# Cache keys are hex digests; anything else is rejected
+_KEY_PATTERN = re.compile(r'^/([0-9a-f]{16,128})$')
+
+MAX_ENTRY_BYTES = 16 * 1024 * 1024
+
+
+class CacheServer(ThreadingHTTPServer):
+    """HTTP cache server; ``url`` is the address it is actually bound to."""
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def make_server(directory: Path, host: str = '127.0.0.1', port: int = 8765,
+                ttl: timedelta = timedelta(days=7)) -> CacheServer:
+    """Create an HTTP cache server (GET/PUT ``/<key>``) backed by a directory.
+
+    Pass ``port=0`` to bind any free port and read it back from ``url``.
+    """
+    store = SharedDirectoryCache(directory, ttl=ttl)
+
+    class CacheRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _key(self):
+            match = _KEY_PATTERN.match(self.path)
+            if not match:
+                self._reply(400)
+            return match.group(1) if match else None
+
+        def _reply(self, status: int, body: bytes = b'') -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            key = self._key()
+            if key is None:
+                return
+            content = store.get(key)
+            if content is None:
+                self._reply(404)
+            else:
+                self._reply(200, content.encode('utf-8'))
+
+        def do_PUT(self):
+            key = self._key()
+            if key is None:
+                return
+            length = int(self.headers.get('Content-Length', 0))
+            if length <= 0 or length > MAX_ENTRY_BYTES:
+                self._reply(413 if length > 0 else 400)
+                return
+            content = self.rfile.read(length).decode('utf-8', errors='replace')
+            store.put(key, content)
+            self._reply(204)
+
+        def log_message(self, format, *args):
+            pass
+
+    return CacheServer((host, port), CacheRequestHandler)
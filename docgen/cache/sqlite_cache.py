@@ -0,0 +1,358 @@
+# docgen/cache/sqlite_cache.py
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from .backends import CacheBackend
+
+DEFAULT_CACHE_DIR = Path.home() / '.docgen' / 'cache'
+DEFAULT_CACHE_FILE = 'docs.db'
+
+# Entries written with a different schema version are treated as misses
+SCHEMA_VERSION = 1
+
+# Size limits and TTL, overridable with `docgen config cache_max_bytes --value ...`
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL_DAYS = 1
+
+# Run an opportunistic prune after this many writes
+PRUNE_EVERY_WRITES = 1000
+
+# Access times and hit/miss counts from lookups are buffered in memory and
+# written once this many keys have been touched, or with the next write,
+# prune, stats call or close
+FLUSH_TOUCHES_EVERY = 1000
+
+# Age buckets reported by stats(), in seconds
+AGE_BUCKETS = [
+    ('< 1 hour', 3600),
+    ('< 1 day', 86400),
+    ('< 7 days', 7 * 86400),
+    ('older', None),
+]
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 500
+
+# Open caches, pruned and closed by one exit hook
+_open_caches: 'weakref.WeakSet[DocCache]' = weakref.WeakSet()
+
+
+def _close_open_caches() -> None:
+    for cache in list(_open_caches):
+        cache._on_exit()
+
+
+atexit.register(_close_open_caches)
+
+
+class DocCache(CacheBackend):
+    """Documentation cache stored in a single SQLite database.
+
+    Every entry has the same schema regardless of which component wrote it:
+    ``content`` plus creation/access timestamps, size and schema version.
+    Lookups and writes can be batched with ``get_many``/``put_many`` so a whole
+    request batch is resolved in one query.
+
+    The cache is bounded: entries expire after ``ttl`` and, once ``max_bytes``
+    or ``max_entries`` is exceeded, the least recently used entries are evicted.
+    Pruning runs every ``PRUNE_EVERY_WRITES`` writes and once at exit. Reads
+    stay read-only: the access times and counters they update are buffered
+    and flushed in batches.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: timedelta = timedelta(days=DEFAULT_TTL_DAYS),
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / DEFAULT_CACHE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._writes_since_prune = 0
+        self._touched: Dict[str, float] = {}
+        self._counts = {'hits': 0, 'misses': 0}
+        self._closed = False
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                version INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        self._conn.commit()
+        _open_caches.add(self)
+
+    @classmethod
+    def from_config(cls, path: Optional[Path] = None) -> 'DocCache':
+        """Create a cache using the limits stored in the DocGen configuration."""
+        from docgen.config.config_handler import ConfigHandler
+        config = ConfigHandler()
+        return cls(
+            path,
+            ttl=timedelta(days=float(config.get('cache_ttl_days', DEFAULT_TTL_DAYS))),
+            max_bytes=int(config.get('cache_max_bytes', DEFAULT_MAX_BYTES)),
+            max_entries=int(config.get('cache_max_entries', DEFAULT_MAX_ENTRIES))
+        )
+
+    def _is_fresh(self, created_at: float, version: int, now: float) -> bool:
+        return version == SCHEMA_VERSION and now - created_at <= self.ttl.total_seconds()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached content for ``key`` or None if missing or expired."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Return ``{key: content}`` for every key that has a fresh entry.
+
+        Hits refresh the entry's access time for LRU eviction and the hit/miss
+        counters are updated; both are buffered (see ``FLUSH_TOUCHES_EVERY``).
+        """
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        stale = []
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _MAX_PARAMS):
+                chunk = keys[start:start + _MAX_PARAMS]
+                rows = self._conn.execute(
+                    f"SELECT key, content, created_at, version FROM entries "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, content, created_at, version in rows:
+                    if self._is_fresh(created_at, version, now):
+                        found[key] = content
+                    else:
+                        stale.append(key)
+            for key in found:
+                self._touched[key] = now
+            self._counts['hits'] += len(found)
+            self._counts['misses'] += len(keys) - len(found)
+            if stale or len(self._touched) >= FLUSH_TOUCHES_EVERY:
+                self._delete_locked(stale)
+                self._flush_locked()
+                self._conn.commit()
+        return found
+
+    def touch(self, keys: Iterable[str]) -> None:
+        """Refresh the access time of entries used through another tier (buffered)."""
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                self._touched[key] = now
+            if len(self._touched) >= FLUSH_TOUCHES_EVERY:
+                self._flush_locked()
+                self._conn.commit()
+
+    def put(self, key: str, content: str) -> None:
+        """Store one entry."""
+        self.put_many([(key, content)])
+
+    def put_many(self, items: Union[Dict[str, str], Iterable[Tuple[str, str]]]) -> None:
+        """Store several entries in one transaction. Empty or non-string content is skipped."""
+        if isinstance(items, dict):
+            items = items.items()
+        now = time.time()
+        rows = [
+            (key, content, now, now, len(content.encode('utf-8')), SCHEMA_VERSION)
+            for key, content in items
+            if content and isinstance(content, str)
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, content, created_at, accessed_at, size, version) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._flush_locked()
+            self._conn.commit()
+            self._writes_since_prune += len(rows)
+            should_prune = self._writes_since_prune >= PRUNE_EVERY_WRITES
+        if should_prune:
+            self.prune()
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Remove entries."""
+        with self._lock:
+            self._delete_locked(list(keys))
+            self._conn.commit()
+
+    def _delete_locked(self, keys: list) -> None:
+        for start in range(0, len(keys), _MAX_PARAMS):
+            chunk = keys[start:start + _MAX_PARAMS]
+            self._conn.execute(
+                f"DELETE FROM entries WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+
+    def _flush_locked(self) -> None:
+        """Write buffered access times and counters (the caller commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+        for name, amount in self._counts.items():
+            self._bump_locked(name, amount)
+            self._counts[name] = 0
+
+    def _bump_locked(self, name: str, amount: int) -> None:
+        if amount:
+            self._conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, amount)
+            )
+
+    def prune(self) -> Dict[str, int]:
+        """Drop expired entries, then evict least recently used ones until within limits.
+
+        Returns:
+            Dict[str, int]: Number of entries removed as ``expired`` and ``evicted``
+        """
+        now = time.time()
+        with self._lock:
+            self._flush_locked()
+            expired = self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ? OR version != ?",
+                (now - self.ttl.total_seconds(), SCHEMA_VERSION)
+            ).rowcount
+
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            evict_keys = []
+            if count > self.max_entries or total > self.max_bytes:
+                for key, size in self._conn.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+                ):
+                    if count <= self.max_entries and total <= self.max_bytes:
+                        break
+                    evict_keys.append(key)
+                    count -= 1
+                    total -= size
+                self._delete_locked(evict_keys)
+            self._bump_locked('evictions', len(evict_keys))
+            self._conn.commit()
+            self._writes_since_prune = 0
+        return {'expired': expired, 'evicted': len(evict_keys)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize size, hit ratio and the age distribution of entries."""
+        now = time.time()
+        with self._lock:
+            self._flush_locked()
+            self._conn.commit()
+            count, total, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at), MAX(created_at) FROM entries"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            ages = {label: 0 for label, _ in AGE_BUCKETS}
+            for (created_at,) in self._conn.execute("SELECT created_at FROM entries"):
+                age = now - created_at
+                for label, limit in AGE_BUCKETS:
+                    if limit is None or age < limit:
+                        ages[label] += 1
+                        break
+
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        lookups = hits + misses
+        return {
+            'path': str(self.path),
+            'entries': count,
+            'bytes': total,
+            'file_bytes': self.path.stat().st_size if self.path.exists() else 0,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl.total_seconds(),
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+            'evictions': counters.get('evictions', 0),
+            'oldest_age_seconds': now - oldest if oldest else None,
+            'newest_age_seconds': now - newest if newest else None,
+            'age_distribution': ages,
+        }
+
+    def export(self, output_path: Path) -> int:
+        """Write all entries to a JSON Lines file and return the number exported."""
+        exported = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, content, created_at, accessed_at, size, version FROM entries ORDER BY key"
+            )
+            with open(output_path, 'w', encoding='utf-8') as out:
+                for key, content, created_at, accessed_at, size, version in rows:
+                    out.write(json.dumps({
+                        'key': key,
+                        'content': content,
+                        'created_at': created_at,
+                        'accessed_at': accessed_at,
+                        'size': size,
+                        'version': version,
+                    }, ensure_ascii=False) + '\n')
+                    exported += 1
+        return exported
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._touched.clear()
+            self._counts = {'hits': 0, 'misses': 0}
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM counters")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _on_exit(self) -> None:
+        """Compact on interpreter exit if anything was written since the last prune."""
+        try:
+            if self._writes_since_prune:
+                self.prune()
+            self.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Flush buffered access times and close the database connection."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._flush_locked()
+                self._conn.commit()
+            finally:
+                self._conn.close()
+        _open_caches.discard(self)
@@ -7,18 +7,28 @@ from rich.console import Console
 from pathlib import Path
 from typing import Optional, Dict, List
 import glob
-from docgen.config.config_handler import ConfigHandler
+from docgen.config.config_handler import ConfigHandler, DEFAULT_CONFIG
 from docgen.analyzers.code_analyzer import CodeAnalyzer
+from docgen.analyzers.parallel_analyzer import MAX_FILE_SIZE, read_and_analyze
+from docgen.analyzers.chunker import missing_symbols
 from docgen.generators.ai_doc_generator import AIDocGenerator
+from docgen.generators.doc_writer import DocumentWriter, parse_sections, rewrite_sections
+from docgen.generators.pipeline import GenerationPipeline
 from datetime import datetime
 import time
 import asyncio
+import os
 from docgen.utils.git_utils import GitAnalyzer
-from docgen.utils.extension import SUPPORTED_EXTENSIONS
+from docgen.utils.file_discovery import FileDiscovery
+from docgen.utils.ignore_matcher import IgnoreMatcher
+from docgen.utils.watcher import ChangeBatcher, DEFAULT_DEBOUNCE, DELETED, make_watcher
 from docgen.auth.api_key_manager import APIKeyManager
 from docgen.auth.usage_tracker import UsageTracker
-import requests
+from docgen.utils.http import get_session
 from docgen.config.urls import URLConfig
+from docgen.cache.sqlite_cache import DocCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_FILE
+from docgen.cache.file_index import FileIndex, DEFAULT_INDEX_FILE, file_state
+from docgen.cache.server import make_server
 # from docgen.utils.ai_client import AIClient
 
 app = typer.Typer(
@@ -33,9 +43,11 @@ Commands:\n
   • analyze        Analyze code structure and complexity\n
   • config         Configure DocGen settings and preferences\n
   • update (u)     Update docs for changed files (Git-aware)\n
+  • watch          Keep docs up to date while files change\n
   • clean (c)      Remove generated documentation files\n
   • version        Display DocGen version information\n
-  • clear-cache    Clear the documentation generation cache\n\n
+  • clear-cache    Clear the documentation generation cache\n
+  • cache          Cache statistics, pruning, export and shared server\n\n
 
 Quick Start:\n
   $ docgen generate --current-dir\n
@@ -104,10 +116,10 @@ async def process_file(path: Path, output_format: str, output_dir: Optional[Path
             return
             
         # Generate AI documentation
-        ai_generator = AIDocGenerator()
-        documentation = await ai_generator.generate_documentation_batch([
-            (path, analysis_result, source_code)
-        ])
+        async with AIDocGenerator() as ai_generator:
+            documentation = await ai_generator.generate_documentation_batch([
+                (path, analysis_result, source_code)
+            ])
         
         # Get the documentation for the single file
         doc_content = documentation.get(path)
@@ -134,50 +146,10 @@ async def process_file(path: Path, output_format: str, output_dir: Optional[Path
     except Exception as e:
         console.print(f"[red]Error processing {path}: {str(e)}[/red]")
 
-def should_process_file(file_path: Path, base_path: Path) -> bool:
-    """Check if the file should be processed.
-    
-    Args:
-        file_path: Path to the file to check
-        base_path: Base directory path for relative path calculation
-        
-    Returns:
-        bool: True if file should be processed, False otherwise
-    """
-    # Common exclude patterns for directories
-    exclude_patterns = {
-        # Virtual environments
-        'venv', 'env', '.env', '.venv',
-        # Package directories
-        'site-packages', 'node_modules',
-        # Cache directories
-        '__pycache__', '.pytest_cache', '.mypy_cache',
-        # Build directories
-        'build', 'dist', '.build',
-        # Package info
-        '*.egg-info',
-        # Git directory
-        '.git',
-        # IDE directories
-        '.idea', '.vscode',
-        # Other common config directories
-        '.github', '.circleci', '.husky'
-    }
-    
-    try:
-        rel_path = file_path.relative_to(base_path)
-        
-        # Check if any parent directory starts with a dot
-        for parent in rel_path.parents:
-            if parent.name.startswith('.'):
-                return False
-                
-        # Check if path contains any excluded pattern
-        path_str = str(rel_path)
-        return not any(pattern in path_str for pattern in exclude_patterns)
-        
-    except Exception:
-        return False
+def _build_ignore_matcher(base_path: Path) -> IgnoreMatcher:
+    """Create the exclusion matcher for a project root from built-ins, config and ignore files."""
+    exclude_patterns = ConfigHandler().get("exclude_patterns", DEFAULT_CONFIG["exclude_patterns"])
+    return IgnoreMatcher(base_path, exclude_patterns or [])
 
 @app.command(name="generate", help="Generate documentation for code", short_help="Generate docs")
 def generate(
@@ -248,92 +220,58 @@ async def _generate_async(
             return
 
         # Directory mode (current dir or full codebase)
-        if current_dir:
-            files = []
-            for ext in SUPPORTED_EXTENSIONS:
-                files.extend(list(base_path.glob(f"*{ext}")))
-        else:
-            files = []
-            for ext in SUPPORTED_EXTENSIONS:
-                files.extend(list(base_path.rglob(f"*{ext}")))
-
-        source_files = [f for f in files if should_process_file(f, base_path)]
-        
-        if not source_files:
-            console.print("[yellow]No source code files found to process[/yellow]")
-            raise typer.Exit(1)
-
-        # Prepare batch processing data
-        files_data = []
-        total_size = 0
+        # Discovery, analysis, AI requests and output writing run as one
+        # streaming pipeline; sections are spooled to disk as they finish
+        discovery = FileDiscovery(matcher=_build_ignore_matcher(base_path))
+        output_filename = "codebase_documentation.md" if not current_dir else "directory_documentation.md"
+        output_path = (output_dir or base_path) / output_filename
+        scope = "Codebase" if not current_dir else "Current Directory"
+        writer = DocumentWriter(output_path, scope)
         
+        # Project-local index of file states: unchanged files are resolved
+        # with a stat call instead of being read again
+        file_index = FileIndex(base_path / DEFAULT_INDEX_FILE)
         try:
-            for file_path in source_files:
-                try:
-                    # Skip large files
-                    file_size = file_path.stat().st_size
-                    if file_size > 1_000_000:  # Skip files larger than 1MB
-                        continue
-                    
-                    total_size += file_size
-                    source_code = file_path.read_text()
-                    analyzer = CodeAnalyzer(file_path)
-                    analysis_result = analyzer.analyze_file()
-                    files_data.append((file_path, analysis_result, source_code))
-                except Exception as e:
-                    continue
+            async with AIDocGenerator() as ai_generator:
+                pipeline = GenerationPipeline(ai_generator, discovery, base_path, file_index=file_index)
+                stats = await pipeline.run(writer, recursive=not current_dir)
+        except BaseException:
+            writer.close()
+            raise
         finally:
+            file_index.close()
             analysis_status.stop()
 
-        # Generate documentation asynchronously
-        generation_status = console.status("[bold green]Generating documentation...", spinner="dots")
-        generation_status.start()
-        
-        try:
-            ai_generator = AIDocGenerator()
-            docs_results = await ai_generator.generate_documentation_batch(files_data)
-        finally:
-            generation_status.stop()
-
-        # Combine documentation
-        output_filename = "codebase_documentation.md" if not current_dir else "directory_documentation.md"
-        output_path = (output_dir or base_path) / output_filename
-
-        combined_docs = []
-        scope = "Codebase" if not current_dir else "Current Directory"
-        combined_docs.extend([
-            f"# {scope} Documentation\n",
-            f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
-            "## Table of Contents\n"
-        ])
-
-        # Add table of contents
-        for file_path in sorted(source_files):
-            rel_path = file_path.relative_to(base_path)
-            combined_docs.append(f"- [{rel_path}]\n")
-
-        # Add file documentation
-        for file_path in sorted(source_files):
-            rel_path = file_path.relative_to(base_path)
-            anchor = rel_path.as_posix().replace('/', '-')
-            combined_docs.extend([
-                f"\n<a id='{anchor}'></a>\n",
-                f"## {rel_path}\n",
-                docs_results.get(file_path, "Error: Documentation generation failed"),
-                "\n---\n"
-            ])
+        if not stats.discovered:
+            writer.close()
+            console.print("[yellow]No source code files found to process[/yellow]")
+            raise typer.Exit(1)
 
         # Write combined documentation
-        output_path.write_text("\n".join(combined_docs))
+        rel_paths = [str(f.relative_to(base_path)) for f in sorted(stats.discovered)]
+        writer.finalize(rel_paths)
         
         elapsed_time = time.time() - start_time
         console.print(f"[green]Documentation generated: {output_path}[/green]")
         console.print(f"[blue]Time taken: {elapsed_time:.2f} seconds[/blue]")
-        console.print(f"[blue]Processed {len(files_data)} source files ({total_size/1024:.1f} KB)[/blue]")
+        console.print(f"[blue]Processed {stats.processed} source files ({stats.total_size/1024:.1f} KB)[/blue]")
+        if stats.unchanged:
+            console.print(f"[blue]{stats.unchanged} unchanged files reused their documentation[/blue]")
+        _print_server_metrics(ai_generator.ai_client.metrics())
 
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
 
+def _print_server_metrics(metrics: dict) -> None:
+    """Show the concurrency chosen for each server that handled requests."""
+    for url, m in metrics.items():
+        if not (m['successes'] or m['overloads'] or m['errors']):
+            continue
+        console.print(
+            f"[dim]{url}: concurrency {m['limit']}, "
+            f"{m['successes']} ok, {m['overloads']} overloaded, {m['errors']} failed[/dim]"
+        )
+
 # Add command alias for shorter version
 app.command(name="g", help="Alias for generate command")(generate)
 
@@ -366,15 +304,14 @@ def clean(
     try:
         base_path = Path.cwd() if current_dir else Path.cwd().resolve()
         
-        # Find all .md files
-        pattern = "*.md"
-        md_files = base_path.glob(pattern) if current_dir else base_path.rglob(pattern)
+        # Find all .md files outside excluded directories
+        discovery = FileDiscovery(extensions=[".md"], matcher=_build_ignore_matcher(base_path))
+        md_files = discovery.find_files(base_path, recursive=not current_dir)
         
         deleted_count = 0
         for file_path in md_files:
-            # Skip README.md and files in excluded directories
-            if (file_path.name.lower() == "readme.md" or 
-                not should_process_file(file_path, base_path)):
+            # Skip README.md
+            if file_path.name.lower() == "readme.md":
                 continue
                 
             try:
@@ -397,17 +334,13 @@ app.command(name="c", help="Alias for clean command")(clean)
 def clean_cache():
     """Clean all documentation caches including generation and update caches."""
     try:
-        cache_dir = Path.home() / '.docgen' / 'cache'
+        cache_dir = DEFAULT_CACHE_DIR
         if cache_dir.exists():
-            # Remove all files and subdirectories in cache
-            for item in cache_dir.glob('**/*'):
-                if item.is_file():
-                    item.unlink()
-                elif item.is_dir():
-                    for subitem in item.glob('*'):
-                        subitem.unlink()
-                    item.rmdir()
-            cache_dir.rmdir()
+            DocCache.from_config(cache_dir / DEFAULT_CACHE_FILE).clear()
+            # Remove entries left by the old one-file-per-entry cache; other
+            # files such as .machine_id are kept
+            for item in cache_dir.glob('*.json'):
+                item.unlink()
             console.print("[green]All caches cleaned successfully![/green]")
         else:
             console.print("[yellow]Cache directory doesn't exist.[/yellow]")
@@ -415,6 +348,78 @@ def clean_cache():
         console.print(f"[red]Error cleaning cache: {str(e)}[/red]")
         raise typer.Exit(1)
 
+cache_app = typer.Typer(help="Inspect and maintain the documentation cache", no_args_is_help=True)
+app.add_typer(cache_app, name="cache")
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+@cache_app.command(name="stats", help="Show cache size, hit ratio and entry ages")
+def cache_stats():
+    """Show documentation cache statistics."""
+    try:
+        stats = DocCache.from_config().stats()
+        console.print("\n[bold]Documentation Cache[/bold]")
+        console.print(f"Location: {stats['path']}")
+        console.print(f"Entries: {stats['entries']}/{stats['max_entries']}")
+        console.print(f"Size: {_format_bytes(stats['bytes'])}/{_format_bytes(stats['max_bytes'])} "
+                      f"(on disk: {_format_bytes(stats['file_bytes'])})")
+        console.print(f"TTL: {stats['ttl_seconds'] / 3600:.1f} hours")
+        console.print(f"Hit ratio: {stats['hit_ratio']:.1%} ({stats['hits']} hits, {stats['misses']} misses)")
+        console.print(f"Evictions: {stats['evictions']}")
+        console.print("Age distribution:")
+        for label, count in stats['age_distribution'].items():
+            console.print(f"  {label}: {count}")
+    except Exception as e:
+        console.print(f"[red]Error reading cache statistics: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+@cache_app.command(name="prune", help="Remove expired entries and enforce size limits")
+def cache_prune():
+    """Prune the documentation cache."""
+    try:
+        removed = DocCache.from_config().prune()
+        console.print(f"[green]Removed {removed['expired']} expired and "
+                      f"{removed['evicted']} evicted entries[/green]")
+    except Exception as e:
+        console.print(f"[red]Error pruning cache: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+@cache_app.command(name="export", help="Export cache entries to a JSON Lines file")
+def cache_export(
+    output: Path = typer.Argument(..., help="Destination file (JSON Lines)")
+):
+    """Export the documentation cache."""
+    try:
+        count = DocCache.from_config().export(output)
+        console.print(f"[green]Exported {count} entries to {output}[/green]")
+    except Exception as e:
+        console.print(f"[red]Error exporting cache: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+@cache_app.command(name="serve", help="Serve a shared HTTP cache for teams and CI")
+def cache_serve(
+    directory: Path = typer.Option(Path.home() / ".docgen" / "shared-cache", "--dir", "-d", help="Directory holding cache entries"),
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8765, "--port", "-p", help="Port to listen on")
+):
+    """Serve cache entries over HTTP (GET/PUT /<key>).
+
+    Point clients at it with: docgen config shared_cache --value http://HOST:PORT
+    """
+    server = make_server(directory, host, port)
+    console.print(f"[green]Serving documentation cache from {directory} on {server.url}[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
 @app.command(name="update", help="Update documentation for changed files")
 def update_docs(
     output_dir: Optional[Path] = typer.Option(None, "--output-dir", "-o", help="Output directory for documentation"),
@@ -467,8 +472,9 @@ async def _update_docs_async(
         
         start_time = time.time()
         
-        # Get changed files
-        git_analyzer = GitAnalyzer()
+        # Get changed files, with the same exclusions as ``generate``
+        base_path = Path.cwd()
+        git_analyzer = GitAnalyzer(FileDiscovery(matcher=_build_ignore_matcher(base_path)))
         changed_files = git_analyzer.get_changed_files()
         
         if not changed_files:
@@ -476,23 +482,29 @@ async def _update_docs_async(
             return
 
         # Ensure all paths are resolved relative to the project root
-        base_path = Path.cwd()
         output_dir = output_dir if output_dir else base_path
         
         # Prepare batch data
         files_data = []
         total_size = 0
+        deleted: List[Path] = []
+        renamed: Dict[Path, Path] = {}  # old path -> new path
         with console.status("[bold green]Analyzing changed files...") as status:
             for file_path, change_info in changed_files.items():
+                if change_info['type'] == 'deleted':
+                    deleted.append(file_path)
+                    continue
+                if change_info['type'] == 'renamed':
+                    renamed[change_info['old_path']] = file_path
                 try:
                     if file_path.exists():
                         file_size = file_path.stat().st_size
-                        if file_size > 2_000_000:  # Skip files larger than 2MB
+                        if file_size > MAX_FILE_SIZE:
                             console.print(f"[yellow]Skipping large file: {file_path}[/yellow]")
                             continue
                             
                         total_size += file_size
-                        analyzer = CodeAnalyzer(file_path)
+                        analyzer = CodeAnalyzer(file_path, source=change_info['full_code'])
                         analysis_result = analyzer.analyze_file()
 
                         files_data.append((
@@ -505,20 +517,36 @@ async def _update_docs_async(
                 except Exception as e:
                     console.print(f"[yellow]Warning: Could not analyze {file_path}: {str(e)}[/yellow]")
 
-        if not files_data:
+        if not files_data and not deleted:
             console.print("[yellow]No files to process after analysis[/yellow]")
             return
 
+        # Current sections let large files be updated per changed symbol
+        # (renamed files keep the section recorded under their old path);
+        # incremental updates describe only the changed symbols
+        doc_file = output_dir / "codebase_documentation.md"
+        existing_docs = {} if full_update else None
+        if full_update and doc_file.exists():
+            sections = parse_sections(doc_file.read_text())
+            old_paths = {new: old for old, new in renamed.items()}
+            for path, _, _, _ in files_data:
+                section = sections.get(str(old_paths.get(path, path)))
+                if section is not None:
+                    existing_docs[path] = section
+
         # Generate documentation in batch
-        ai_generator = AIDocGenerator()
-        with console.status("[bold green]Generating documentation...") as status:
-            docs_results = await ai_generator.generate_update_documentation_batch(files_data)
+        docs_results = {}
+        if files_data:
+            async with AIDocGenerator() as ai_generator:
+                with console.status("[bold green]Generating documentation...") as status:
+                    docs_results = await ai_generator.generate_update_documentation_batch(files_data, existing_docs)
 
         # Handle documentation updates
-        doc_file = output_dir / "codebase_documentation.md"
         if full_update:
             if doc_file.exists():
-                update_existing_documentation(doc_file, docs_results, [f[0] for f in files_data])
+                update_existing_documentation(
+                    doc_file, docs_results, [f[0] for f in files_data], renamed=renamed, deleted=deleted
+                )
                 console.print(f"[green]Updated full documentation for {len(files_data)} files[/green]")
         else:
             if updates_file:
@@ -534,8 +562,19 @@ async def _update_docs_async(
                 console.print("[yellow]No existing documentation found, generating new...[/yellow]")
                 await _generate_async(None, False, output_dir, output_format)
         
-        # Update last documented state
-        git_analyzer.update_last_documented_state()
+        # Update last documented state; files that failed or were skipped are
+        # kept as pending, so the next run retries them even once the diff
+        # base has moved past their changes
+        documented = {
+            path: changed_files[path]['content_hash']
+            for path, _, _, changes in files_data
+            if not changes.strip() or _is_documented(docs_results.get(path, "Error:"))
+        }
+        failed = [
+            path for path, info in changed_files.items()
+            if info['type'] != 'deleted' and path not in documented
+        ]
+        git_analyzer.update_last_documented_state(documented, removed=deleted + list(renamed), failed=failed)
 
         elapsed_time = time.time() - start_time
         console.print(f"[green]Documentation updated successfully![/green]")
@@ -546,11 +585,33 @@ async def _update_docs_async(
         console.print(f"[red]Error updating documentation: {str(e)}[/red]")
         raise typer.Exit(1)
 
-def update_existing_documentation(doc_file: Path, docs_results: Dict[Path, str], changed_files: List[Path]):
-    """Update existing documentation file with changes."""
+def _is_documented(doc: str) -> bool:
+    """Whether an update result is complete: not an error, and no symbol left undocumented."""
+    return not doc.startswith("Error:") and not missing_symbols(doc)
+
+def update_existing_documentation(
+    doc_file: Path,
+    docs_results: Dict[Path, str],
+    changed_files: List[Path],
+    renamed: Optional[Dict[Path, Path]] = None,
+    deleted: Optional[List[Path]] = None
+):
+    """Update existing documentation file with changes.
+
+    Sections of renamed files move to their new path and sections of deleted
+    files are removed, together with their table of contents entries.
+    """
     try:
-        content = doc_file.read_text()
-        lines = content.split('\n')
+        sections = parse_sections(doc_file.read_text())
+        docs = {str(path): doc for path, doc in docs_results.items()}
+        removed = [str(path) for path in deleted or []]
+        for old_path, new_path in (renamed or {}).items():
+            removed.append(str(old_path))
+            if str(old_path) in sections:
+                docs.setdefault(str(new_path), sections[str(old_path)])
+        rewrite_sections(doc_file, docs, removed)
+        
+        lines = doc_file.read_text().split('\n')
         
         # Add updates section at the top if it doesn't exist
         if not any(line.startswith('## Recent Updates') for line in lines[:10]):
@@ -565,8 +626,6 @@ def update_existing_documentation(doc_file: Path, docs_results: Dict[Path, str],
         update_index = lines.index("## Recent Updates")
         date_line = f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         
-        # Convert paths to strings relative to the current directory
-        base_path = Path.cwd()
         changed_files_list = "\n".join(
             f"- {str(f)}" for f in changed_files
         )
@@ -576,21 +635,6 @@ def update_existing_documentation(doc_file: Path, docs_results: Dict[Path, str],
         lines[update_index + 2] = "### Changed Files"
         lines.insert(update_index + 3, changed_files_list)
         
-        # Update individual file sections
-        for file_path, new_doc in docs_results.items():
-            # Use string path for header
-            file_header = f"## {str(file_path)}"
-            try:
-                file_start = next(i for i, line in enumerate(lines) if line.strip() == file_header)
-                file_end = next((i for i, line in enumerate(lines[file_start + 1:], file_start + 1) 
-                                 if line.startswith('## ') or line.startswith('---')), len(lines))
-                
-                # Replace old documentation with new
-                lines[file_start:file_end] = [file_header, new_doc]
-            except StopIteration:
-                # File doesn't exist in documentation yet, append it
-                lines.extend(["\n", file_header, new_doc, "---"])
-        
         # Write updated content
         doc_file.write_text('\n'.join(lines))
         
@@ -661,6 +705,130 @@ def add_incremental_update(
 # Add command alias for shorter version
 app.command(name="u", help="Alias for update command")(update_docs)
 
+# How often the watch loop collects events and checks whether a burst has settled
+WATCH_TICK = 0.1
+
+@app.command(name="watch", help="Regenerate documentation sections as files change")
+def watch(
+    output_dir: Optional[Path] = typer.Option(None, "--output-dir", "-o", help="Output directory for documentation"),
+    debounce: float = typer.Option(DEFAULT_DEBOUNCE, "--debounce", help="Seconds of quiet before regenerating"),
+    poll: bool = typer.Option(False, "--poll", help="Poll for changes instead of using filesystem events")
+):
+    """Watch the codebase and rewrite the sections of changed files in place."""
+    try:
+        asyncio.run(_watch_async(output_dir, debounce, poll))
+    except KeyboardInterrupt:
+        console.print("[blue]Stopped watching[/blue]")
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error watching files: {str(e)}[/red]")
+        raise typer.Exit(1)
+
+async def _watch_async(output_dir: Optional[Path], debounce: float, poll: bool):
+    base_path = Path.cwd()
+    doc_file = (output_dir or base_path) / "codebase_documentation.md"
+    if not doc_file.exists():
+        console.print("[yellow]No existing documentation found, generating new...[/yellow]")
+        await _generate_async(None, False, output_dir, "markdown")
+        if not doc_file.exists():
+            raise typer.Exit(1)
+
+    discovery = FileDiscovery(matcher=_build_ignore_matcher(base_path))
+    watcher = make_watcher(base_path, discovery, force_polling=poll)
+    batcher = ChangeBatcher(debounce)
+    file_index = FileIndex(base_path / DEFAULT_INDEX_FILE)
+    await asyncio.to_thread(watcher.start)
+    try:
+        async with AIDocGenerator() as ai_generator:
+            console.print(f"[green]Watching {base_path} ({watcher.name}), press Ctrl+C to stop[/green]")
+            while True:
+                for path, kind in await asyncio.to_thread(watcher.poll):
+                    batcher.add(path, kind)
+                if batcher.ready():
+                    usage_tracker = UsageTracker()
+                    can_request, _ = usage_tracker.can_make_request()
+                    if not can_request:
+                        _show_api_key_instructions()
+                        return
+                    await _watch_burst(batcher.drain(), base_path, doc_file, ai_generator, file_index, usage_tracker)
+                await asyncio.sleep(WATCH_TICK)
+    finally:
+        watcher.stop()
+        file_index.close()
+
+async def _watch_burst(
+    changes: Dict[Path, str],
+    base_path: Path,
+    doc_file: Path,
+    ai_generator: AIDocGenerator,
+    file_index: Optional[FileIndex],
+    usage_tracker: UsageTracker
+) -> None:
+    """Handle one settled burst of changes without ever ending watch mode."""
+    try:
+        updated = await regenerate_changed(changes, base_path, doc_file, ai_generator, file_index)
+    except Exception as e:
+        # Keep watching; the files are picked up again on their next change
+        console.print(f"[red]Error updating documentation: {str(e)}[/red]")
+        return
+    # Only bursts that produced documentation count as a request
+    if len(updated) > sum(1 for kind in changes.values() if kind == DELETED):
+        usage_tracker.track_request()
+
+def _stat_and_read(path: Path):
+    # Stat before reading: if the file changes in between, the recorded state
+    # is older than the content and the next run simply reads it again
+    st = os.stat(path)
+    return st, read_and_analyze(path)
+
+async def regenerate_changed(
+    changes: Dict[Path, str],
+    base_path: Path,
+    doc_file: Path,
+    ai_generator: AIDocGenerator,
+    file_index: Optional[FileIndex] = None
+) -> List[str]:
+    """Document changed files in one batch and rewrite their sections of ``doc_file``.
+
+    Returns:
+        List[str]: Relative paths whose sections were rewritten or removed
+    """
+    removed = [str(path.relative_to(base_path)) for path, kind in changes.items() if kind == DELETED]
+    stats = {}
+    files_data = []
+    for path in [path for path, kind in changes.items() if kind != DELETED]:
+        try:
+            st, result = await asyncio.to_thread(_stat_and_read, path)
+        except OSError:
+            continue
+        if result is not None:
+            stats[path] = st
+            files_data.append(result)
+
+    docs_results = await ai_generator.generate_documentation_batch(files_data) if files_data else {}
+    sections = {}
+    states = {}
+    for path, analysis, _ in files_data:
+        rel_path = str(path.relative_to(base_path))
+        doc = docs_results.get(path)
+        if doc is None or doc.startswith("Error:"):
+            console.print(f"[yellow]Warning: Could not document {rel_path}; keeping its previous section[/yellow]")
+            continue
+        sections[rel_path] = doc
+        content_hash = analysis['content_hash']
+        states[rel_path] = file_state(stats[path], content_hash, ai_generator.doc_key(content_hash))
+
+    if sections or removed:
+        rewrite_sections(doc_file, sections, removed)
+        if file_index is not None:
+            file_index.update(states)
+            file_index.remove(removed)
+        updated = sorted(sections) + sorted(removed)
+        console.print(f"[green]{datetime.now().strftime('%H:%M:%S')} updated {', '.join(updated)}[/green]")
+        return updated
+    return []
+
 @app.command(name="auth")
 def auth(
     command: str = typer.Argument(..., help="Login or logout"),
@@ -686,7 +854,7 @@ def auth(
     elif command.lower() == "logout":
         try:
             # Send logout request to server using URLConfig
-            response = requests.post(
+            response = get_session().post(
                 f"{URLConfig.AUTH_BASE_URL}/logout-key",
                 headers={
                     'x-machine-id': tracker.machine_id,
@@ -716,7 +884,7 @@ def usage():
     tracker = UsageTracker()
     
     try:
-        response = requests.get(
+        response = get_session().get(
             f"{URLConfig.USAGE_BASE_URL}/check",
             headers={
                 'x-machine-id': tracker.machine_id,
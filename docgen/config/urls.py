@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 class URLConfig:
     # Base URLs for AI servers
@@ -7,6 +7,16 @@ class URLConfig:
         "https://api2.docgen.dev",
     ]
     
+    # Per-server rate limits: `requests` per `window` seconds, with bursts of
+    # up to `burst` requests. A burst above 1 lets one window hold up to
+    # requests + burst - 1 requests, so the server limit is only kept with
+    # burst 1. Servers not listed use DEFAULT_RATE_LIMIT.
+    DEFAULT_RATE_LIMIT: Dict[str, float] = {"requests": 15, "window": 60, "burst": 1}
+    SERVER_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "https://api1.docgen.dev": {"requests": 15, "window": 60, "burst": 1},
+        "https://api2.docgen.dev": {"requests": 15, "window": 60, "burst": 1},
+    }
+    
     # Usage and auth endpoints
     USAGE_BASE_URL: str = f"{SERVER_URLS[0]}/api/v1/usage"
     AUTH_BASE_URL: str = f"{SERVER_URLS[1]}/api/v1/auth"
@@ -1,6 +1,6 @@
 from rich.console import Console
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import json
 import hashlib
 from datetime import datetime
@@ -9,30 +9,50 @@ import time
 from ratelimit import limits, sleep_and_retry
 from docgen.auth.api_key_manager import APIKeyManager
 from docgen.utils.ai_client import AIClient
+from docgen.config.config_handler import ConfigHandler
+from docgen.generators.similarity import (
+    DEFAULT_THRESHOLD, cluster_near_duplicates, identifier_mapping, minhash_signature, source_diff
+)
+from docgen.analyzers.chunker import (
+    DEFAULT_CHUNK_TOKENS, SymbolChunk, chunk_file, reassemble, should_chunk, split_symbol_docs
+)
+from docgen.utils.git_utils import changed_line_ranges
+import asyncio
+import re
 
 console = Console()
 
+# Fenced code blocks and inline code spans of markdown documentation
+_CODE_SPAN_RE = re.compile(r'```.*?```|`[^`\n]+`', re.DOTALL)
+
 class AIDocGenerator:
     def __init__(self):
         self.api_key_manager = APIKeyManager()
         self.ai_client = AIClient()
         
-        # Cache and rate limit settings
-        self.cache_dir = Path.home() / '.docgen' / 'cache'
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Cache and rate limit settings (entries live in the AI client's cache)
+        self.cache_dir = self.ai_client.cache_dir
         self.CALLS_PER_MINUTE = 14
         self.PERIOD = 60
         self.MIN_WAIT_TIME = 5
         self.MAX_RETRIES = 3 
         self.BACKOFF_FACTOR = 2 
         
-        # Initialize memory cache
-        self._memory_cache = {}
         self.console = Console()
         self.BATCH_SIZE = 5
         self.PARALLEL_WORKERS = min(multiprocessing.cpu_count(), 4)
         self._cache_hits = 0
         self._api_calls = 0
+        
+        # Near-duplicate files (Jaccard similarity of normalized tokens at or
+        # above this) share one full request; set to 0 to disable
+        self.near_duplicate_threshold = float(
+            ConfigHandler().get('near_duplicate_threshold', DEFAULT_THRESHOLD) or 0
+        )
+        
+        # Files estimated above this many tokens are documented per symbol
+        # (see docgen.analyzers.chunker); set to 0 to always send whole files
+        self.chunk_tokens = int(ConfigHandler().get('chunk_tokens', DEFAULT_CHUNK_TOKENS) or 0)
 
     @sleep_and_retry
     @limits(calls=14, period=60)
@@ -81,76 +101,210 @@ class AIDocGenerator:
         
         return results
 
-    async def generate_documentation_batch(self, files_data: List[Tuple[Path, Dict, str]]) -> Dict[Path, str]:
-        """Generate documentation for multiple files concurrently."""
-        try:
-            # Prepare batch requests
-            requests = [
-                {
-                    'code': code,
-                    'prompt_type': 'doc',
-                    'file_path': str(path)
-                }
-                for path, _, code in files_data
-            ]
+    async def generate_documentation_batch(
+        self,
+        files_data: List[Tuple[Path, Dict, str]],
+        on_result: Optional[Callable[[Path, str], None]] = None
+    ) -> Dict[Path, str]:
+        """Generate documentation for multiple files concurrently.
 
-            # Generate documentation concurrently
-            results = await self.ai_client.generate_text_batch(requests)
-            
-            # Map results back to files
-            return {
-                path: result for (path, _, _), result in zip(files_data, results)
-                if result is not None
-            }
-            
-        finally:
-            await self.ai_client.close()
+        Near-duplicate files are grouped first: only each group's representative
+        is documented in full, and every other member gets the representative's
+        documentation adapted to its names plus a small request describing its
+        diff from the representative. Grouping only sees the files of one
+        call; the generation pipeline calls this once per batch, so duplicates
+        that land in different batches are documented separately. Files too
+        large for one request are split into symbol chunks that are
+        documented (and cached) separately and reassembled into one section.
 
-    def _group_similar_files(self, files_data: List[Tuple[Path, Dict, str]]) -> List[List[Tuple[Path, Dict, str]]]:
-        """Group similar files to reduce redundant processing."""
-        groups = {}
+        The HTTP session stays open so later batches reuse its connections;
+        use the generator as an async context manager (or call ``close()``)
+        to release it. ``on_result(path, doc)`` is called for each document as
+        soon as it is available.
+        """
+        whole_files = [f for f in files_data if not should_chunk(f[2], self.chunk_tokens)]
+        large_files = [f for f in files_data if should_chunk(f[2], self.chunk_tokens)]
+        if self.near_duplicate_threshold and len(whole_files) > 1:
+            groups = await asyncio.to_thread(self._group_similar_files, whole_files)
+        else:
+            groups = [[file_data] for file_data in whole_files]
         
-        for file_data in files_data:
-            path, analysis, code = file_data
-            
-            # Create a signature based on file structure
-            signature = self._get_file_signature(analysis)
-            
-            if signature not in groups:
-                groups[signature] = []
-            groups[signature].append(file_data)
+        # Prepare batch requests: one full request per group, one diff request
+        # per member, one request per symbol chunk of a large file
+        requests = []
+        owners: List[Tuple[Path, bool]] = []  # (path, is_member) per request
+        chunk_owner: Dict[int, Tuple[Path, int]] = {}  # request index -> (path, chunk index)
+        chunks_of: Dict[Path, List[SymbolChunk]] = {}
+        chunk_texts: Dict[Path, List[Optional[str]]] = {}
+        for path, analysis, code in large_files:
+            chunks = await asyncio.to_thread(chunk_file, path, analysis, code, self.chunk_tokens)
+            chunks_of[path] = chunks
+            chunk_texts[path] = [None] * len(chunks)
+            for i, chunk in enumerate(chunks):
+                chunk_owner[len(requests)] = (path, i)
+                owners.append((path, False))
+                requests.append({
+                    'code': chunk.code,
+                    'prompt_type': 'doc',
+                    'file_path': str(path),
+                    # Cached per symbol: unchanged symbols are never resent
+                    'analysis': {'content_hash': chunk.key}
+                })
+        rep_index: Dict[Path, int] = {}
+        member_requests: Dict[Path, Tuple[int, Tuple[Path, Dict, str], Tuple[Path, Dict, str]]] = {}
+        for group in groups:
+            rep_path, rep_analysis, rep_code = rep = group[0]
+            rep_index[rep_path] = len(requests)
+            owners.append((rep_path, False))
+            requests.append({
+                'code': rep_code,
+                'prompt_type': 'doc',
+                'file_path': str(rep_path),
+                'analysis': rep_analysis
+            })
+            for member in group[1:]:
+                diff = source_diff(rep_code, member[2], rep_path.name, member[0].name)
+                if not diff.strip():
+                    # Exact duplicate: the representative's docs are all it needs
+                    member_requests[member[0]] = (None, rep, member)
+                    continue
+                member_requests[member[0]] = (len(requests), rep, member)
+                owners.append((member[0], True))
+                requests.append({
+                    'code': diff,
+                    'changes': diff,
+                    'prompt_type': 'update',
+                    'file_path': str(member[0])
+                })
+        members_of: Dict[Path, List[Path]] = {}
+        for member_path, (_, rep, _) in member_requests.items():
+            members_of.setdefault(rep[0], []).append(member_path)
         
-        return list(groups.values())
-
-    def _get_file_signature(self, analysis: Dict) -> str:
-        """Create a signature for file grouping."""
-        signature_parts = {
-            'class_count': len(analysis.get('classes', [])),
-            'func_count': len(analysis.get('functions', [])),
-            'import_count': len(analysis.get('imports', []))
+        texts: List[Optional[str]] = [None] * len(requests)
+        docs: Dict[Path, str] = {}
+        
+        def member_doc(member_path: Path) -> Optional[str]:
+            index, rep, member = member_requests[member_path]
+            rep_doc = texts[rep_index[rep[0]]]
+            if rep_doc is None:
+                return None
+            return self._adapt_template(rep_doc, rep, member, texts[index] if index is not None else None)
+        
+        def emit(path: Path, doc: Optional[str]) -> None:
+            if doc is None or path in docs:
+                return
+            docs[path] = doc
+            if on_result:
+                on_result(path, doc)
+        
+        def handle_result(index: int, text: str) -> None:
+            texts[index] = text
+            if index in chunk_owner:
+                path, i = chunk_owner[index]
+                chunk_texts[path][i] = text
+                if all(t is not None for t in chunk_texts[path]):
+                    emit(path, reassemble(chunks_of[path], chunk_texts[path]))
+                return
+            path, is_member = owners[index]
+            if is_member:
+                if member_requests[path][1][0] in docs:
+                    emit(path, member_doc(path))
+                return
+            emit(path, text)
+            for member_path in members_of.get(path, ()):
+                member_index = member_requests[member_path][0]
+                if member_index is None or texts[member_index] is not None:
+                    emit(member_path, member_doc(member_path))
+        
+        # Generate documentation concurrently
+        results = await self.ai_client.generate_text_batch(requests, on_result=handle_result)
+        for index, text in enumerate(results):
+            if text is not None and texts[index] is None:
+                handle_result(index, text)
+        
+        # Members whose diff request failed still get the adapted representative docs
+        for member_path in member_requests:
+            emit(member_path, member_doc(member_path))
+        
+        # Large files with some failed chunks still get the symbols that succeeded
+        for path, texts_for_file in chunk_texts.items():
+            if any(t is not None for t in texts_for_file):
+                emit(path, reassemble(chunks_of[path], texts_for_file))
+        
+        # Composed documents are cached under the file's own key too (see
+        # doc_key), except for large files with missing symbols
+        composed = {
+            self._fast_cache_key(code, analysis): docs[path]
+            for path, analysis, code in files_data
+            if path in docs and (
+                path in member_requests
+                or (path in chunk_texts and all(t is not None for t in chunk_texts[path]))
+            )
         }
-        return json.dumps(signature_parts, sort_keys=True)
+        if composed:
+            await asyncio.to_thread(self.ai_client._save_many_to_cache, composed)
+        
+        # Map results back to files, in input order
+        return {path: docs[path] for path, _, _ in files_data if path in docs}
+
+    async def __aenter__(self) -> 'AIDocGenerator':
+        await self.ai_client.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
 
-    def _adapt_template(self, template: str, analysis: Dict, code: str) -> str:
-        """Adapt template documentation for similar files."""
+    async def close(self):
+        """Close the underlying AI client session."""
+        await self.ai_client.close()
+
+    def _group_similar_files(self, files_data: List[Tuple[Path, Dict, str]]) -> List[List[Tuple[Path, Dict, str]]]:
+        """Group near-duplicate files; each group's representative comes first."""
+        clusters = cluster_near_duplicates(
+            [code for _, _, code in files_data], self.near_duplicate_threshold
+        )
+        return [[files_data[i] for i in cluster] for cluster in clusters]
+
+    def _get_file_signature(self, code: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of the file's normalized tokens (None for tiny files)."""
+        return minhash_signature(code)
+
+    def _adapt_template(
+        self,
+        template: str,
+        representative: Tuple[Path, Dict, str],
+        member: Tuple[Path, Dict, str],
+        diff_doc: Optional[str] = None
+    ) -> str:
+        """Derive a member's documentation from its group representative's.
+
+        Names that were substituted between the two files (identifiers, the
+        file name and stem) are replaced inside the code spans and fenced
+        blocks of the representative's docs; prose is left alone, since
+        short names such as ``a`` or ``index`` are also ordinary words. The
+        documentation of the diff is appended.
+        """
+        rep_path, _, rep_code = representative
+        member_path, _, member_code = member
         try:
-            # Extract key elements
-            class_names = [c['name'] for c in analysis.get('classes', [])]
-            func_names = [f['name'] for f in analysis.get('functions', [])]
-            
-            # Replace relevant parts
+            mapping = identifier_mapping(rep_code, member_code)
+            mapping[rep_path.name] = member_path.name
+            if rep_path.stem != member_path.stem:
+                mapping.setdefault(rep_path.stem, member_path.stem)
+            pattern = re.compile(
+                r'(?<![\w$])(' + '|'.join(re.escape(name) for name in sorted(mapping, key=len, reverse=True)) + r')(?![\w$])'
+            )
+            doc = _CODE_SPAN_RE.sub(
+                lambda span: pattern.sub(lambda m: mapping[m.group(1)], span.group(0)), template
+            )
+        except Exception:
+            self.console.print(f"[yellow]Warning: Template adaptation failed for {member_path}[/yellow]")
             doc = template
-            for old_name in class_names + func_names:
-                if old_name in doc:
-                    # Find corresponding name in current file
-                    new_name = next((name for name in (class_names + func_names) 
-                                   if name != old_name and len(name) > 3), old_name)
-                    doc = doc.replace(old_name, new_name)
-            
-            return doc
-        except Exception as e:
-            self.console.print(f"[yellow]Warning: Template adaptation failed, generating new doc[/yellow]")
-            return self._generate_doc(analysis, code)
+        
+        note = f"*Near-duplicate of `{rep_path}`; documentation derived from it.*"
+        if diff_doc:
+            return f"{doc}\n\n{note}\n\n**Differences from `{rep_path.name}`:**\n\n{diff_doc}"
+        return f"{doc}\n\n{note}"
 
     def _create_cache_key(self, code: str, analysis: Dict) -> str:
         """Create efficient cache key."""
@@ -158,41 +312,31 @@ class AIDocGenerator:
         return hashlib.md5(content.encode()).hexdigest()
 
     def _get_cached_doc(self, cache_key: str) -> str:
-        """Get from memory or file cache."""
-        # Check memory cache first
-        if cache_key in self._memory_cache:
-            return self._memory_cache[cache_key]
-            
-        # Check file cache
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            try:
-                data = json.loads(cache_file.read_text())
-                self._memory_cache[cache_key] = data['doc']
-                return data['doc']
-            except Exception:
-                return None
-        
-        return None
+        """Get from the shared cache (in-memory LRU tier, then disk)."""
+        return self.ai_client._get_cached_doc(cache_key)
+
+    def get_cached_docs(self, cache_keys: List[str]) -> Dict[str, str]:
+        """Get several entries from the shared cache in one lookup."""
+        return self.ai_client._get_cached_docs(cache_keys)
+
+    def doc_key(self, content_hash: str) -> str:
+        """Cache key of the documentation for a file with this content hash.
+
+        Every document ``generate_documentation_batch`` produces is cached
+        under this key, whichever way it was generated.
+        """
+        return self._fast_cache_key('', {'content_hash': content_hash})
 
     def _save_to_cache(self, cache_key: str, doc: str) -> None:
-        """Save to both memory and file cache."""
+        """Save to the shared cache (both tiers)."""
         try:
-            # Save to memory cache
-            self._memory_cache[cache_key] = doc
-            
-            # Save to file cache
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            cache_file.write_text(json.dumps({'doc': doc, 'timestamp': datetime.now().isoformat()}))
+            self.ai_client._save_to_cache(cache_key, doc)
         except Exception as e:
             self.console.print(f"[yellow]Warning: Failed to cache documentation: {str(e)}[/yellow]") 
 
-    def _fast_cache_key(self, code: str, analysis: Dict, query: bool=False) -> str:
-        """Faster cache key generation."""
-        key_content = f"{code[:100]}{str(analysis.get('classes', []))}{str(analysis.get('functions', []))}"
-        if query:
-            key_content += f"update"
-        return hashlib.md5(key_content.encode()).hexdigest() 
+    def _fast_cache_key(self, code: str, analysis: Dict, query: bool=False, changes: Optional[str] = None) -> str:
+        """Content-addressed cache key; shares the AI client's key scheme."""
+        return self.ai_client._fast_cache_key(code, analysis, 'update' if query else 'generate', changes)
     
     @sleep_and_retry
     @limits(calls=14, period=60)
@@ -225,8 +369,18 @@ class AIDocGenerator:
         except Exception as e:
             raise Exception(f"Failed to generate update documentation: {str(e)}")
 
-    async def generate_update_documentation_batch(self, files_data: List[Tuple[Path, Dict, str, str]]) -> Dict[Path, str]:
-        """Generate documentation updates for multiple files concurrently."""
+    async def generate_update_documentation_batch(
+        self,
+        files_data: List[Tuple[Path, Dict, str, str]],
+        existing_docs: Optional[Dict[Path, str]] = None
+    ) -> Dict[Path, str]:
+        """Generate documentation updates for multiple files concurrently.
+
+        Files large enough to be documented per symbol are updated per symbol
+        (see ``_update_symbols``). ``existing_docs`` holds their current
+        documentation sections when the update rewrites them in place; when
+        it is None the results are incremental update notes.
+        """
         try:
             # Filter out files with no changes
             files_to_process = [
@@ -237,6 +391,12 @@ class AIDocGenerator:
             
             if not files_to_process:
                 return {}
+            
+            symbol_files = [f for f in files_to_process if should_chunk(f[2], self.chunk_tokens)]
+            files_to_process = [f for f in files_to_process if not should_chunk(f[2], self.chunk_tokens)]
+            path_results = await self._update_symbols(symbol_files, existing_docs) if symbol_files else {}
+            if not files_to_process:
+                return path_results
                 
             # Process files in batches through AI client
             # Convert Path objects to strings before passing to AI client
@@ -247,7 +407,6 @@ class AIDocGenerator:
             results = await self.ai_client.generate_update_documentation_batch(serializable_files)
             
             # Convert string paths back to Path objects for the result dictionary
-            path_results = {}
             for str_path, doc in results.items():
                 # Find the original Path object
                 original_path = next(path for path, _, _, _ in files_to_process if str(path) == str_path)
@@ -255,11 +414,8 @@ class AIDocGenerator:
                 
                 # Cache successful results
                 if not doc.startswith("Error:"):
-                    cache_key = self._fast_cache_key(
-                        next(code for p, _, code, _ in files_to_process if str(p) == str_path),
-                        next(analysis for p, analysis, _, _ in files_to_process if str(p) == str_path),
-                        query=True
-                    )
+                    _, analysis, code, changes = next(f for f in files_to_process if str(f[0]) == str_path)
+                    cache_key = self._fast_cache_key(code, analysis, query=True, changes=changes)
                     self._save_to_cache(cache_key, doc)
             
             return path_results
@@ -271,13 +427,67 @@ class AIDocGenerator:
                 for path, _, _, _ in files_data
             }
 
+    async def _update_symbols(
+        self,
+        files_data: List[Tuple[Path, Dict, str, str]],
+        existing_docs: Optional[Dict[Path, str]]
+    ) -> Dict[Path, str]:
+        """Update large files' documentation one symbol at a time.
+
+        Diff hunks are mapped to the symbol chunks they touch; changes without
+        hunks (pending or untracked files carry their whole content) touch
+        every symbol. With ``existing_docs``, untouched symbols keep their
+        documentation from the existing section, touched symbols and any
+        without existing documentation are regenerated (or found in the
+        per-symbol cache), and the result is the spliced, complete section.
+        Without it, only the touched symbols are described, with the update
+        prompt like any other changed file. Symbols that failed keep the
+        ``MISSING_SYMBOL_DOC`` placeholder (see ``missing_symbols``).
+        """
+        requests = []
+        owners: List[Tuple[Path, int]] = []  # (path, chunk index) per request
+        plans: Dict[Path, Tuple[List[SymbolChunk], List[Optional[str]]]] = {}
+        for path, analysis, code, changes in files_data:
+            chunks = await asyncio.to_thread(chunk_file, path, analysis, code, self.chunk_tokens)
+            ranges = changed_line_ranges(changes)
+            if existing_docs is None:
+                chunks = [chunk for chunk in chunks if not ranges or chunk.touches(ranges)]
+            previous = split_symbol_docs(existing_docs.get(path, '')) if existing_docs and ranges else {}
+            docs: List[Optional[str]] = []
+            for i, chunk in enumerate(chunks):
+                if chunk.name in previous and not chunk.touches(ranges):
+                    docs.append(previous[chunk.name])
+                    continue
+                docs.append(None)
+                owners.append((path, i))
+                request = {
+                    'code': chunk.code,
+                    'prompt_type': 'doc',
+                    'file_path': str(path),
+                    'analysis': {'content_hash': chunk.key}
+                }
+                if existing_docs is None:
+                    request.update(prompt_type='update', changes=changes)
+                requests.append(request)
+            plans[path] = (chunks, docs)
+        
+        if requests:
+            results = await self.ai_client.generate_text_batch(requests)
+            for (path, i), text in zip(owners, results):
+                plans[path][1][i] = text
+        for path, (chunks, docs) in plans.items():
+            failed = [chunk.name for chunk, doc in zip(chunks, docs) if not doc]
+            if failed:
+                self.console.print(f"[yellow]Warning: Could not document {', '.join(failed)} in {path}[/yellow]")
+        return {path: reassemble(chunks, docs) for path, (chunks, docs) in plans.items()}
+
     def _process_update_group(self, group: List[Tuple[Path, Dict, str, str]]) -> Dict[Path, str]:
         """Process a group of similar files for updates."""
         results = {}
         
         for path, analysis, code, changes in group:
             try:
-                cache_key = self._fast_cache_key(code + changes, analysis, query=True)
+                cache_key = self._fast_cache_key(code, analysis, query=True, changes=changes)
                 doc = self._get_cached_doc(cache_key)
                 
                 if doc:
@@ -0,0 +1,138 @@
+# docgen/generators/doc_writer.py
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+MISSING_DOC = "Error: Documentation generation failed"
+
+_SECTION_RE = re.compile(r"^<a id='[^']*'></a>\n+## (.+)\n", re.MULTILINE)
+
+
+def section_anchor(rel_path: str) -> str:
+    """HTML anchor used for a file section."""
+    return rel_path.replace('\\', '/').replace('/', '-')
+
+
+def format_section(rel_path: str, doc: str) -> List[str]:
+    """Lines making up one file section of the combined documentation."""
+    return [
+        f"\n<a id='{section_anchor(rel_path)}'></a>\n",
+        f"## {rel_path}\n",
+        doc,
+        "\n---\n"
+    ]
+
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Map each file section's path to its documentation (inverse of ``format_section``)."""
+    matches = list(_SECTION_RE.finditer(text))
+    sections = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        body = text[match.end():following.start() if following else len(text)].strip()
+        if body.endswith('---'):
+            body = body[:-3].rstrip()
+        sections[match.group(1).strip()] = body
+    return sections
+
+
+def rewrite_sections(path: Path, docs: Dict[str, str], removed: Iterable[str] = ()) -> None:
+    """Replace, add or drop file sections of a combined document in place.
+
+    Sections not named in ``docs`` or ``removed`` are kept byte for byte.
+    New sections are appended, and the table of contents gains or loses
+    the matching entries.
+    """
+    text = path.read_text(encoding='utf-8')
+    removed = set(removed) - set(docs)
+    matches = list(_SECTION_RE.finditer(text))
+    header = text[:matches[0].start()] if matches else text.rstrip('\n') + '\n\n'
+
+    def render(rel_path: str) -> str:
+        return "\n".join(format_section(rel_path, docs[rel_path])).lstrip('\n') + '\n\n'
+
+    spans = []
+    present = set()
+    for match, following in zip(matches, matches[1:] + [None]):
+        rel_path = match.group(1).strip()
+        present.add(rel_path)
+        if rel_path in removed:
+            header = re.sub(rf"^- \[{re.escape(rel_path)}\]\n\n?", '', header, count=1, flags=re.MULTILINE)
+        elif rel_path in docs:
+            spans.append(render(rel_path))
+        else:
+            end = following.start() if following else len(text)
+            spans.append(text[match.start():end].rstrip('\n') + '\n\n')
+    for rel_path in docs:
+        if rel_path not in present:
+            spans.append(render(rel_path))
+            toc = list(re.finditer(r"^- \[.*\]\n", header, flags=re.MULTILINE))
+            if toc:
+                header = header[:toc[-1].end()] + f"\n- [{rel_path}]\n" + header[toc[-1].end():]
+
+    temp_path = path.with_name(path.name + '.tmp')
+    try:
+        temp_path.write_text((header + ''.join(spans)).rstrip('\n') + '\n', encoding='utf-8')
+        temp_path.replace(path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+class DocumentWriter:
+    """Streams finished file sections to disk and assembles the combined document.
+
+    Sections arrive in completion order and are appended to a temporary spool
+    file; only their offsets are kept in memory. ``finalize`` writes the header,
+    table of contents and sections in path order, then atomically replaces the
+    output file.
+    """
+
+    def __init__(self, output_path: Path, scope: str):
+        self.output_path = Path(output_path)
+        self.scope = scope
+        self._spool = tempfile.TemporaryFile(mode='w+b')
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+
+    def add_section(self, rel_path: str, doc: str) -> None:
+        """Spool the documentation for one file."""
+        data = doc.encode('utf-8')
+        self._spool.seek(0, 2)
+        self._offsets[rel_path] = (self._spool.tell(), len(data))
+        self._spool.write(data)
+
+    def _read_section(self, rel_path: str) -> str:
+        offset, length = self._offsets[rel_path]
+        self._spool.seek(offset)
+        return self._spool.read(length).decode('utf-8')
+
+    def finalize(self, rel_paths: Iterable[str]) -> Path:
+        """Write the combined documentation for ``rel_paths`` (in the given order)."""
+        rel_paths = list(rel_paths)
+        header = [
+            f"# {self.scope} Documentation\n",
+            f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+            "## Table of Contents\n"
+        ] + [f"- [{rel_path}]\n" for rel_path in rel_paths]
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.output_path.with_name(self.output_path.name + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as out:
+                out.write("\n".join(header))
+                for rel_path in rel_paths:
+                    doc = self._read_section(rel_path) if rel_path in self._offsets else MISSING_DOC
+                    out.write("\n")
+                    out.write("\n".join(format_section(rel_path, doc)))
+            temp_path.replace(self.output_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+            self.close()
+        return self.output_path
+
+    def close(self) -> None:
+        """Discard the spool file."""
+        if not self._spool.closed:
+            self._spool.close()
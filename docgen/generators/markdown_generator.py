@@ -31,7 +31,7 @@ class MarkdownGenerator:
                 doc_parts.append(self._generate_class_markdown(class_info))
                 
                 # Add inheritance information
-                inheritance = [rel for rel in analysis_result["relationships"]["inheritance"] 
+                inheritance = [rel for rel in analysis_result.get("relationships", {}).get("inheritance", []) 
                              if rel["class"] == class_info["name"]]
                 if inheritance:
                     doc_parts.append("\n### Inheritance\n")
@@ -45,7 +45,7 @@ class MarkdownGenerator:
                 doc_parts.append(self._generate_function_markdown(function_info))
                 
                 # Add function relationships
-                calls = [rel for rel in analysis_result["relationships"]["function_calls"] 
+                calls = [rel for rel in analysis_result.get("relationships", {}).get("function_calls", []) 
                         if rel["caller"] == function_info["name"]]
                 if calls:
                     doc_parts.append("\n### Function Calls\n")
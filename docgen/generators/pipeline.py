@@ -0,0 +1,280 @@
+# docgen/generators/pipeline.py
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from docgen.analyzers.parallel_analyzer import read_and_analyze, default_workers
+from docgen.cache.file_index import FileIndex, FileState, file_state
+from docgen.generators.doc_writer import DocumentWriter
+
+_DONE = object()
+
+# Unchanged files found through the file index are resolved against the
+# cache in groups of this size
+RESOLVE_BATCH = 200
+
+
+@dataclass
+class PipelineStats:
+    """Counters collected while the pipeline runs."""
+    discovered: List[Path] = field(default_factory=list)
+    processed: int = 0
+    documented: int = 0
+    total_size: int = 0
+    unchanged: int = 0  # resolved from the file index without reading the file
+
+
+class GenerationPipeline:
+    """Producer/consumer pipeline for directory-mode documentation generation.
+
+    Stages are connected by bounded asyncio queues::
+
+        discovery thread -> analysis workers -> batcher -> AI batch tasks -> writer
+
+    The first batches are sent while discovery is still walking the tree, and
+    finished sections go straight to the ``DocumentWriter`` spool, so peak
+    memory is bounded by the queue sizes and ``max_in_flight`` batches rather
+    than by the size of the codebase. For the same reason near-duplicate
+    files are only grouped within a batch (see
+    ``AIDocGenerator.generate_documentation_batch``): grouping across the
+    whole tree would hold every analyzed file until discovery ends.
+
+    With a ``FileIndex``, files whose stat matches the index skip reading,
+    analysis and the AI stages: their documentation is fetched from the cache
+    by the recorded key and goes straight to the writer.
+    """
+
+    def __init__(
+        self,
+        ai_generator,
+        discovery,
+        base_path: Path,
+        batch_size: int = 100,
+        batch_linger: float = 0.5,
+        max_in_flight: int = 8,
+        analysis_workers: Optional[int] = None,
+        file_index: Optional[FileIndex] = None
+    ):
+        self.ai_generator = ai_generator
+        self.discovery = discovery
+        self.base_path = Path(base_path)
+        self.batch_size = batch_size
+        self.batch_linger = batch_linger
+        self.max_in_flight = max_in_flight
+        self.analysis_workers = analysis_workers or default_workers()
+        self.file_index = file_index
+        self._known: Dict[str, FileState] = {}
+        # Stat and content hash of files being documented, until their section is written
+        self._pending: Dict[Path, Tuple[os.stat_result, str]] = {}
+        self._new_states: Dict[str, FileState] = {}
+
+    async def run(self, writer: DocumentWriter, recursive: bool = True) -> PipelineStats:
+        """Run all stages to completion, streaming sections into ``writer``."""
+        stats = PipelineStats()
+        loop = asyncio.get_running_loop()
+        path_queue: asyncio.Queue = asyncio.Queue(maxsize=self.analysis_workers * 4)
+        analyzed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size * 2)
+        output_queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        if self.file_index is not None:
+            self._known = await asyncio.to_thread(self.file_index.load)
+
+        with ThreadPoolExecutor(max_workers=self.analysis_workers, thread_name_prefix='docgen-read') as executor:
+            stages = [
+                asyncio.create_task(self._discover(loop, path_queue, stats, recursive, stop)),
+                asyncio.create_task(self._analyze(loop, executor, path_queue, analyzed_queue, output_queue, stats)),
+                asyncio.create_task(self._batch(analyzed_queue, output_queue)),
+                asyncio.create_task(self._write(output_queue, writer, stats)),
+            ]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                stop.set()
+                for task in stages:
+                    task.cancel()
+                await asyncio.gather(*stages, return_exceptions=True)
+                raise
+        if self.file_index is not None:
+            await asyncio.to_thread(self._save_index, stats, recursive)
+        return stats
+
+    def _rel(self, path: Path) -> str:
+        return str(Path(path).relative_to(self.base_path))
+
+    def _save_index(self, stats: PipelineStats, recursive: bool) -> None:
+        """Record the files documented in this run; forget files that are gone."""
+        self.file_index.update(self._new_states)
+        if recursive:
+            present = {self._rel(path) for path in stats.discovered}
+            self.file_index.remove(path for path in self._known if path not in present)
+
+    async def _discover(self, loop, path_queue: asyncio.Queue, stats: PipelineStats,
+                        recursive: bool, stop: threading.Event) -> None:
+        """Walk the tree on a worker thread, feeding paths into the queue."""
+        def put(item) -> bool:
+            future = asyncio.run_coroutine_threadsafe(path_queue.put(item), loop)
+            while not stop.is_set():
+                try:
+                    future.result(timeout=0.2)
+                    return True
+                except FutureTimeoutError:
+                    continue
+            future.cancel()
+            return False
+
+        def walk():
+            for path in self.discovery.iter_files(self.base_path, recursive):
+                stats.discovered.append(path)
+                if not put(path):
+                    return
+
+        await asyncio.to_thread(walk)
+        for _ in range(self.analysis_workers):
+            await path_queue.put(_DONE)
+
+    async def _analyze(self, loop, executor, path_queue: asyncio.Queue, analyzed_queue: asyncio.Queue,
+                       output_queue: asyncio.Queue, stats: PipelineStats) -> None:
+        """Read and analyze files with a fixed number of worker coroutines.
+
+        Files the index shows as unchanged are collected instead and resolved
+        against the cache in batches; those not found there are read normally.
+        A file whose recorded cache key is no longer the generator's key for
+        its content (a different model or prompt version) counts as changed.
+        """
+        unchanged: List[Tuple[Path, FileState, os.stat_result]] = []
+
+        def check(path: Path):
+            st = os.stat(path)
+            state = self._known.get(self._rel(path))
+            if state is None or not state.matches(st) or state.doc_key != self.ai_generator.doc_key(state.content_hash):
+                return st, None
+            return st, state
+
+        async def read(path: Path, st: Optional[os.stat_result]) -> None:
+            try:
+                result = await loop.run_in_executor(executor, read_and_analyze, path)
+            except Exception:
+                result = None
+            if result is not None:
+                stats.processed += 1
+                stats.total_size += result[1]['size']
+                if st is not None:
+                    self._pending[path] = (st, result[1]['content_hash'])
+                await analyzed_queue.put(result)
+
+        async def resolve(group: List[Tuple[Path, FileState, os.stat_result]]) -> None:
+            docs = await loop.run_in_executor(
+                executor, self.ai_generator.get_cached_docs, [state.doc_key for _, state, _ in group]
+            )
+            for path, state, st in group:
+                doc = docs.get(state.doc_key)
+                if doc is None:
+                    await read(path, st)  # evicted from the cache: document it again
+                    continue
+                stats.processed += 1
+                stats.unchanged += 1
+                stats.total_size += state.size
+                output_queue.put_nowait((path, doc))
+
+        async def worker():
+            while True:
+                path = await path_queue.get()
+                if path is _DONE:
+                    return
+                st = None
+                if self.file_index is not None:
+                    try:
+                        st, state = await loop.run_in_executor(executor, check, path)
+                    except OSError:
+                        continue
+                    if state is not None:
+                        unchanged.append((path, state, st))
+                        if len(unchanged) >= RESOLVE_BATCH:
+                            group = unchanged[:]
+                            unchanged.clear()
+                            await resolve(group)
+                        continue
+                await read(path, st)
+
+        await asyncio.gather(*(worker() for _ in range(self.analysis_workers)))
+        if unchanged:
+            await resolve(unchanged)
+        await analyzed_queue.put(_DONE)
+
+    async def _batch(self, analyzed_queue: asyncio.Queue, output_queue: asyncio.Queue) -> None:
+        """Group analyzed files into batches and dispatch them to the AI client."""
+        window = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        errors: List[BaseException] = []  # from batches that finished before the final gather
+
+        def done(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        async def generate(chunk):
+            try:
+                # Sections are queued for the writer as each document arrives
+                # (the output queue is unbounded, so put_nowait never fails)
+                await self.ai_generator.generate_documentation_batch(
+                    chunk,
+                    on_result=lambda path, doc: output_queue.put_nowait((path, doc))
+                )
+            finally:
+                window.release()
+
+        async def flush(chunk):
+            await window.acquire()
+            if errors:
+                raise errors[0]
+            task = asyncio.create_task(generate(chunk))
+            tasks.add(task)
+            task.add_done_callback(done)
+
+        try:
+            chunk = []
+            finished = False
+            while not finished:
+                try:
+                    if chunk:
+                        item = await asyncio.wait_for(analyzed_queue.get(), self.batch_linger)
+                    else:
+                        item = await analyzed_queue.get()
+                except asyncio.TimeoutError:
+                    item = None
+                if item is _DONE:
+                    finished = True
+                elif item is not None:
+                    chunk.append(item)
+                if chunk and (item is None or finished or len(chunk) >= self.batch_size):
+                    await flush(chunk)
+                    chunk = []
+            if tasks:
+                await asyncio.gather(*list(tasks))
+            if errors:
+                raise errors[0]
+        except BaseException:
+            for task in list(tasks):
+                task.cancel()
+            raise
+        await output_queue.put(_DONE)
+
+    async def _write(self, output_queue: asyncio.Queue, writer: DocumentWriter, stats: PipelineStats) -> None:
+        """Stream finished sections to the writer's spool."""
+        while True:
+            item = await output_queue.get()
+            if item is _DONE:
+                return
+            path, doc = item
+            rel_path = self._rel(path)
+            writer.add_section(rel_path, doc)
+            stats.documented += 1
+            pending = self._pending.pop(path, None)
+            if pending is not None:
+                st, content_hash = pending
+                self._new_states[rel_path] = file_state(
+                    st, content_hash, self.ai_generator.doc_key(content_hash)
+                )
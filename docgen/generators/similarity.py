@@ -0,0 +1,161 @@
+# docgen/generators/similarity.py
+import difflib
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Signature layout: NUM_BANDS * ROWS_PER_BAND one-permutation MinHash bins.
+# 16 bands of 4 rows makes pairs above ~0.5 Jaccard likely LSH candidates;
+# candidates are then checked against the actual threshold.
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+NUM_BINS = NUM_BANDS * ROWS_PER_BAND
+
+SHINGLE_SIZE = 4
+
+# Files with fewer shingles than this are never clustered
+MIN_SHINGLES = 20
+
+DEFAULT_THRESHOLD = 0.8
+
+# Token alignment is quadratic in the worst case; larger files get no mapping
+MAX_ALIGN_TOKENS = 20000
+
+_EMPTY = (1 << 64) - 1
+_TOKEN_RE = re.compile(
+    r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`[^`]*`'  # string literals
+    r'|\d[\w.]*'                                            # numbers
+    r'|[A-Za-z_$][\w$]*'                                    # identifiers
+    r'|[^\s\w]'                                             # punctuation
+)
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+def normalize_tokens(code: str) -> List[str]:
+    """Tokenize code, replacing string and number literals with placeholders.
+
+    Per-locale files, migrations and generated clients mostly differ in their
+    literals, so those are normalized away before comparing files.
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall(code):
+        first = token[0]
+        if first in '"\'`':
+            tokens.append('<str>')
+        elif first.isdigit():
+            tokens.append('<num>')
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def minhash_signature(code: str, shingle_size: int = SHINGLE_SIZE) -> Optional[Tuple[int, ...]]:
+    """One-permutation MinHash signature of the file's token shingles.
+
+    Each shingle is hashed once; the hash picks a bin and the minimum value per
+    bin is kept. Returns None for files too small to compare meaningfully.
+    """
+    tokens = normalize_tokens(code)
+    count = len(tokens) - shingle_size + 1
+    if count < MIN_SHINGLES:
+        return None
+    bins = [_EMPTY] * NUM_BINS
+    for i in range(count):
+        shingle = '\x1f'.join(tokens[i:i + shingle_size]).encode('utf-8')
+        value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), 'big')
+        index = value % NUM_BINS
+        if value < bins[index]:
+            bins[index] = value
+    return tuple(bins)
+
+
+def estimate_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimate the Jaccard similarity of two signatures from matching bins."""
+    matches = total = 0
+    for x, y in zip(a, b):
+        if x == _EMPTY and y == _EMPTY:
+            continue
+        total += 1
+        matches += x == y
+    return matches / total if total else 0.0
+
+
+def cluster_near_duplicates(codes: Sequence[str], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """Group indices of near-duplicate sources.
+
+    Locality-sensitive hashing over signature bands finds candidate pairs
+    without comparing every file to every other. Files are visited largest
+    first, so each cluster's representative (its first index) is its largest
+    member. Files that match nothing form single-element clusters.
+    """
+    signatures = [minhash_signature(code) for code in codes]
+    order = sorted(range(len(codes)), key=lambda i: len(codes[i]), reverse=True)
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    clusters: Dict[int, List[int]] = {}
+
+    for i in order:
+        signature = signatures[i]
+        if signature is None:
+            clusters[i] = [i]
+            continue
+        bands = [
+            (band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+            for band in range(NUM_BANDS)
+        ]
+        best, best_score = None, threshold
+        seen = set()
+        for key in bands:
+            for rep in buckets.get(key, ()):
+                if rep in seen:
+                    continue
+                seen.add(rep)
+                score = estimate_similarity(signature, signatures[rep])
+                if score >= best_score:
+                    best, best_score = rep, score
+        if best is not None:
+            clusters[best].append(i)
+        else:
+            clusters[i] = [i]
+            for key in bands:
+                buckets[key].append(i)
+
+    return [clusters[i] for i in order if i in clusters]
+
+
+def source_diff(old: str, new: str, old_name: str = 'representative', new_name: str = 'file',
+                context: int = 1) -> str:
+    """Unified diff between two sources with minimal context."""
+    return ''.join(difflib.unified_diff(
+        old.splitlines(keepends=True),
+        new.splitlines(keepends=True),
+        fromfile=old_name,
+        tofile=new_name,
+        n=context
+    ))
+
+
+def identifier_mapping(old: str, new: str) -> Dict[str, str]:
+    """Map identifiers of ``old`` to the identifiers replacing them in ``new``.
+
+    Only one-to-one substitutions found by aligning the token streams are
+    kept, e.g. ``UserClient`` -> ``OrderClient`` in two generated clients.
+    """
+    old_tokens, new_tokens = _TOKEN_RE.findall(old), _TOKEN_RE.findall(new)
+    if max(len(old_tokens), len(new_tokens)) > MAX_ALIGN_TOKENS:
+        return {}
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    mapping: Dict[str, str] = {}
+    conflicts = set()
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'replace' or i2 - i1 != j2 - j1:
+            continue
+        for a, b in zip(old_tokens[i1:i2], new_tokens[j1:j2]):
+            if a == b or not (_IDENTIFIER_RE.fullmatch(a) and _IDENTIFIER_RE.fullmatch(b)):
+                continue
+            if mapping.get(a, b) != b:
+                conflicts.add(a)
+            mapping[a] = b
+    for name in conflicts:
+        mapping.pop(name, None)
+    return mapping
@@ -1,3 +1,4 @@
 from .git_utils import GitAnalyzer
+from .file_discovery import FileDiscovery
 
-__all__ = ['GitAnalyzer']
\ No newline at end of file
+__all__ = ['GitAnalyzer', 'FileDiscovery']
\ No newline at end of file
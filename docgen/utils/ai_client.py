@@ -1,268 +1,556 @@
-from typing import Optional, List, Dict, Tuple
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import random
+from typing import Optional, List, Dict, Tuple, Callable, Awaitable
+import json
 import asyncio
+import heapq
+import random
 import aiohttp
 from docgen.auth.api_key_manager import APIKeyManager
 import time
-import hashlib
 from pathlib import Path
-import json
-from datetime import datetime, timedelta
 from docgen.config.urls import URLConfig
+from docgen.config.config_handler import ConfigHandler, DEFAULT_CONFIG
+from docgen.utils.hashing import doc_cache_key, text_hash
+from docgen.utils.rate_limiter import TokenBucket, parse_retry_after
+from docgen.utils.concurrency import AdaptiveLimiter
+from docgen.utils.server_pool import ServerPool
+from docgen.utils.http import get_session
+from docgen.utils.compression import MIN_COMPRESS_BYTES, compress, resolve_encoding
+from docgen.cache.sqlite_cache import DEFAULT_CACHE_DIR
+from docgen.cache.memory_cache import get_shared_cache
+from docgen.cache.backends import CacheBackend
+
+
+class RequestRejected(Exception):
+    """The server refused a request with a 4xx status; resending it will not help."""
+
+    def __init__(self, status: int):
+        super().__init__(f"rejected with status {status}")
+        self.status = status
 
 
 class AIClient:
-    def __init__(self):
-        # Server pool configuration
+    def __init__(self, cache: Optional[CacheBackend] = None):
+        # Server pool configuration; requests go to the least loaded healthy server
         self.base_urls = URLConfig.SERVER_URLS
+        self.server_pool = ServerPool(self.base_urls)
         self.api_key_manager = APIKeyManager()
+        config = ConfigHandler()
+        
+        # Shared pooled session (http and https) for synchronous calls
+        self.session = get_session()
         
-        # Configure session with connection pooling
-        self.session = self._create_session()
+        # Timeouts in seconds, overridable with `docgen config request_timeout --value ...`
+        self.request_timeout = float(config.get('request_timeout', self.DEFAULT_REQUEST_TIMEOUT))
+        self.batch_request_timeout = float(config.get('batch_request_timeout', self.DEFAULT_BATCH_REQUEST_TIMEOUT))
         
         # Async session for concurrent requests
         self._async_session = None
-        self._semaphore = asyncio.Semaphore(50)  # Increased from 10 to 50
         
-        # Rate limiting - Adjusted for better throughput
-        self._request_times = []
-        self._rate_limit_lock = asyncio.Lock()
-        self.RATE_LIMIT_REQUESTS = 15  # Gemini's limit
-        self.RATE_LIMIT_WINDOW = 60    # Window in seconds
+        # Request body compression, opt-in since not every server decodes it:
+        # 'none' (default), 'gzip' or 'zstd' (needs the zstandard package,
+        # falls back to gzip)
+        self.request_encoding = resolve_encoding(config.get('request_compression', 'none'))
         
-        # Larger batches for fewer total requests
+        # Adaptive (AIMD) concurrency limit per server
+        self.max_concurrency = int(config.get('max_concurrency', self.DEFAULT_MAX_CONCURRENCY))
+        initial_concurrency = int(config.get('initial_concurrency', self.DEFAULT_INITIAL_CONCURRENCY))
+        self._concurrency = {
+            url: AdaptiveLimiter(initial=initial_concurrency, max_limit=self.max_concurrency)
+            for url in self.base_urls
+        }
+        
+        # Rate limiting - one token bucket per server (see URLConfig.SERVER_RATE_LIMITS)
+        self._rate_limiters = {
+            url: TokenBucket(**URLConfig.SERVER_RATE_LIMITS.get(url, URLConfig.DEFAULT_RATE_LIMIT))
+            for url in self.base_urls
+        }
+        
+        # Hard limits the server accepts per batch
         self.MAX_BATCH_SIZE = 1000        # Increased significantly
         self.MAX_BATCH_TOKENS = 1000000  # Doubled token limit
         
-        # Add cache initialization
-        self.cache_dir = Path.home() / '.docgen' / 'cache'
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_duration = timedelta(days=1)  # Cache expires after 7 days
-
-    def _create_session(self) -> requests.Session:
-        """Create an optimized session with connection pooling."""
-        session = requests.Session()
-        
-        # Configure retry strategy with faster retries
-        retry_strategy = Retry(
-            total=2,  # Reduced from 3
-            backoff_factor=0.05,  # Reduced from 0.1
-            status_forcelist=[429, 500, 502, 503, 504]
+        # Target size of a batch; smaller batches finish within the timeout and
+        # let several run in parallel. Set with `docgen config batch_token_budget --value ...`
+        self.batch_token_budget = min(
+            int(config.get('batch_token_budget', self.DEFAULT_BATCH_TOKEN_BUDGET)),
+            self.MAX_BATCH_TOKENS
         )
         
-        # Increased pool size
-        adapter = HTTPAdapter(
-            pool_connections=50,  # Increased from 20
-            pool_maxsize=50,      # Increased from 20
-            max_retries=retry_strategy,
-            pool_block=False
-        )
+        # Add cache initialization
+        # Pluggable cache backend; defaults to the shared in-memory LRU tier in
+        # front of the on-disk cache (and the team cache, if configured)
+        self.cache_dir = DEFAULT_CACHE_DIR
+        self.cache = cache or get_shared_cache()
+        self.cache_duration = self.cache.ttl  # Configurable with cache_ttl_days
         
-        session.mount("http://", adapter)
-        return session
+        # Model settings are part of every cache key
+        self.model_settings = config.get('ai_settings', DEFAULT_CONFIG['ai_settings'])
+
+    # Defaults for the configurable request timeouts and concurrency limits
+    DEFAULT_REQUEST_TIMEOUT = 15
+    DEFAULT_BATCH_REQUEST_TIMEOUT = 30
+    DEFAULT_INITIAL_CONCURRENCY = 8
+    DEFAULT_MAX_CONCURRENCY = 50
+    DEFAULT_BATCH_TOKEN_BUDGET = 50000
+
+    # Status codes that mean the server is overloaded
+    OVERLOAD_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    # Client errors worth retrying in smaller pieces: a batch too large for the
+    # server is bisected like a failed one; any other 4xx raises RequestRejected
+    SPLITTABLE_STATUSES = frozenset({413})
+
+    # Retries (each on a different server when possible) after a 429, 5xx,
+    # timeout or connection error, and the back-off used without Retry-After
+    MAX_RETRIES = 3
+    DEFAULT_RETRY_AFTER = 1.0
+
+    # Recovery of failed batches: attempts per file and jittered backoff (seconds)
+    MAX_BATCH_ATTEMPTS = 3
+    BACKOFF_BASE = 0.5
+    BACKOFF_CAP = 10.0
+
+    # Idle connections are kept this long, and DNS results cached this long (seconds)
+    KEEPALIVE_TIMEOUT = 60
+    DNS_CACHE_TTL = 300
+
+    # Content type of streamed batch responses: one {"index", "text"} object per line
+    NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+    # Request fields the server understands; anything else stays client-side
+    WIRE_FIELDS = ('code', 'changes', 'prompt_type', 'file_path')
 
     async def _ensure_async_session(self):
-        """Ensure async session exists."""
-        if self._async_session is None:
-            connector = aiohttp.TCPConnector(limit=50)  # Increased from 20
+        """Ensure async session exists.
+
+        The session lives until ``close()`` (or the end of an ``async with``
+        block), so connections, TLS sessions and DNS lookups are reused across
+        batch calls.
+        """
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(
+                # Enough connections for every server at its maximum concurrency
+                limit=self.max_concurrency * len(self.base_urls),
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=self.DNS_CACHE_TTL,
+                enable_cleanup_closed=True
+            )
             self._async_session = aiohttp.ClientSession(connector=connector)
 
-    def _get_random_server(self) -> str:
-        """Get a random server URL from the pool."""
-        return random.choice(self.base_urls)
+    def _choose_server(self, exclude=()) -> str:
+        """Pick a server from the pool, avoiding the ones in ``exclude`` if possible."""
+        return self.server_pool.choose(exclude)
 
-    async def _wait_for_rate_limit(self):
-        """Wait if necessary to respect rate limits."""
-        async with self._rate_limit_lock:
-            current_time = time.time()
-            
-            # Remove requests older than the window
-            self._request_times = [t for t in self._request_times 
-                                 if current_time - t < self.RATE_LIMIT_WINDOW]
-            
-            if len(self._request_times) >= self.RATE_LIMIT_REQUESTS:
-                # Calculate wait time
-                oldest_request = min(self._request_times)
-                wait_time = oldest_request + self.RATE_LIMIT_WINDOW - current_time
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    # Clear old requests after waiting
-                    self._request_times = []
-            
-            # Add current request
-            self._request_times.append(current_time)
+    async def _wait_for_rate_limit(self, server_url: str):
+        """Wait until ``server_url``'s rate limit allows another request."""
+        await self._rate_limiters[server_url].acquire()
 
-    async def _make_request(self, code: str, changes: Optional[str] = None, prompt_type: str = 'doc') -> Optional[str]:
-        """Make an async request to the AI server."""
+    def _handle_rate_limited(self, server_url: str, response) -> None:
+        """Back off after a 429, honoring the server's ``Retry-After`` header."""
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        self._rate_limiters[server_url].penalize(delay if delay is not None else self.DEFAULT_RETRY_AFTER)
+
+    async def _post(
+        self,
+        endpoint: str,
+        payload: Dict,
+        timeout: float,
+        cost: float,
+        headers: Optional[Dict[str, str]] = None,
+        read: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Dict]]] = None
+    ) -> Optional[Dict]:
+        """POST ``payload`` to a server from the pool and return the JSON response.
+
+        The body is compressed with ``request_encoding``; a server answering
+        415 gets it uncompressed right away, without using up an attempt.
+        ``read`` replaces the default ``response.json()`` for 200 responses,
+        e.g. to consume a streamed body.
+
+        Failed attempts (429, 5xx, timeouts, connection errors) are retried on a
+        different server, backing off once every server has been tried.
+        Returns None if every attempt fails; raises ``RequestRejected`` for a
+        4xx answer (other than 413), which the same request would get again.
+        """
         await self._ensure_async_session()
-        api_key = self.api_key_manager.get_api_key()
+        raw_body = json.dumps(payload).encode('utf-8')
+        body, encoding = await self._encode_body(raw_body)
+        tried = []
         
-        await self._wait_for_rate_limit()
-        
-        async with self._semaphore:
-            for _ in range(1):  # Reduced retries from 2 to 1 for faster failure
-                server_url = self._get_random_server()
-                try:
-                    async with self._async_session.post(
-                        f"{server_url}/api/v1/gemini/generate",
-                        json={
-                            "code": code,
-                            "changes": changes,
-                            "prompt_type": prompt_type,
-                            "api_key": api_key
-                        },
-                        timeout=aiohttp.ClientTimeout(total=15)  # Reduced from 30
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return data.get("text")
-                        elif response.status == 401:
-                            raise ValueError("Rate limit exceeded")
-                        elif response.status == 429:
-                            await asyncio.sleep(1)  # Reduced from 5
-                            continue
-                except Exception as e:
-                    print(f"Request failed: {str(e)}")
-                    continue
+        for attempt in range(1 + self.MAX_RETRIES):
+            if attempt and attempt % len(self.base_urls) == 0:
+                # Every server has been tried once more; give them time to recover
+                await asyncio.sleep(self._backoff_delay(attempt // len(self.base_urls) - 1))
+            server_url = self._choose_server(exclude=tried)
+            tried.append(server_url)
+            await self._wait_for_rate_limit(server_url)
+            limiter = self._concurrency[server_url]
+            started = await limiter.acquire()
+            pool_started = self.server_pool.start(server_url)
+            outcome = 'error'
+            server_ok = True  # Whether the server itself answered properly
+            try:
+                response = await self._send(server_url, endpoint, body, encoding, timeout, headers)
+                if response.status == 415 and encoding:
+                    # Server can't decode compressed bodies; stop compressing and
+                    # resend at once, within the same attempt and slot
+                    response.release()
+                    print(f"{server_url} does not accept {encoding} request bodies; sending uncompressed")
+                    self.request_encoding = None
+                    body, encoding = raw_body, None
+                    response = await self._send(server_url, endpoint, body, encoding, timeout, headers)
+                async with response:
+                    if response.status == 200:
+                        data = await (read(response) if read else response.json())
+                        outcome = 'success'
+                        return data
+                    elif response.status == 401:
+                        raise ValueError("Rate limit exceeded")
+                    elif response.status in self.OVERLOAD_STATUSES:
+                        outcome = 'overload'
+                        server_ok = False
+                        if response.status == 429:
+                            self._handle_rate_limited(server_url, response)
+                        continue
+                    elif 400 <= response.status < 500 and response.status not in self.SPLITTABLE_STATUSES:
+                        raise RequestRejected(response.status)
+                    return None
+            except asyncio.TimeoutError:
+                outcome = 'overload'
+                server_ok = False
+                print(f"Request to {server_url} timed out")
+            except aiohttp.ClientError as e:
+                server_ok = False
+                print(f"Request to {server_url} failed: {str(e)}")
+            finally:
+                await limiter.release(started, outcome, cost=cost)
+                self.server_pool.finish(server_url, pool_started, server_ok, cost=cost)
         return None
 
+    async def _send(
+        self,
+        server_url: str,
+        endpoint: str,
+        body: bytes,
+        encoding: Optional[str],
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None
+    ) -> aiohttp.ClientResponse:
+        """POST one request body; the caller reads and releases the response."""
+        request_headers = {'Content-Type': 'application/json', **(headers or {})}
+        if encoding:
+            request_headers['Content-Encoding'] = encoding
+        return await self._async_session.post(
+            f"{server_url}{endpoint}",
+            data=body,
+            headers=request_headers,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        )
+
+    async def _encode_body(self, raw_body: bytes) -> Tuple[bytes, Optional[str]]:
+        """Compress a request body if compression is enabled and worthwhile."""
+        encoding = self.request_encoding
+        if not encoding or len(raw_body) < MIN_COMPRESS_BYTES:
+            return raw_body, None
+        if len(raw_body) > 64 * 1024:
+            # Keep the event loop responsive while large batches are compressed
+            return await asyncio.to_thread(compress, raw_body, encoding), encoding
+        return compress(raw_body, encoding), encoding
+
+    async def _make_request(self, code: str, changes: Optional[str] = None, prompt_type: str = 'doc') -> Optional[str]:
+        """Make an async request to the AI server."""
+        try:
+            data = await self._post(
+                "/api/v1/gemini/generate",
+                {
+                    "code": code,
+                    "changes": changes,
+                    "prompt_type": prompt_type,
+                    "api_key": self.api_key_manager.get_api_key()
+                },
+                timeout=self.request_timeout,
+                cost=self._estimate_tokens(code)
+            )
+        except Exception as e:
+            print(f"Request failed: {str(e)}")
+            return None
+        return data.get("text") if data else None
+
     def _estimate_tokens(self, code: str) -> int:
         """Rough estimation of tokens in code.
         Uses the same estimation as server: 4 characters per token."""
         return len(code) // 4
         
-    def _create_batches(self, requests: List[Dict]) -> List[List[Dict]]:
-        """Create optimal batches based on file sizes."""
-        batches = []
-        current_batch = []
-        current_tokens = 0
-        
-        for req in requests:
-            tokens = self._estimate_tokens(req['code'])
-            
-            # Start new batch if current would exceed limits
-            if (len(current_batch) >= self.MAX_BATCH_SIZE or 
-                current_tokens + tokens > self.MAX_BATCH_TOKENS):
-                if current_batch:
-                    batches.append(current_batch)
-                current_batch = []
-                current_tokens = 0
-            
-            current_batch.append(req)
-            current_tokens += tokens
-            
-        if current_batch:
-            batches.append(current_batch)
-            
-        return batches
+    def _concurrency_window(self) -> int:
+        """Number of requests the healthy servers currently accept in parallel."""
+        healthy = self.server_pool.healthy() or list(self._concurrency)
+        return max(1, sum(int(self._concurrency[url].limit) for url in healthy))
 
-    async def _make_batch_request(self, batch: List[Dict]) -> List[Optional[str]]:
-        """Make a batch request to the AI server."""
-        await self._ensure_async_session()
-        api_key = self.api_key_manager.get_api_key()
+    def _rate_budget(self) -> int:
+        """Number of requests the healthy servers' rate limits allow right now."""
+        healthy = self.server_pool.healthy() or list(self._rate_limiters)
+        return max(1, sum(self._rate_limiters[url].available() for url in healthy))
+
+    def _pack_batches(self, requests: List[Dict]) -> List[List[int]]:
+        """Pack requests into batches of similar cost.
+
+        Uses enough batches to respect the token budget and fill the concurrency
+        window, but no more than the rate limits let through right away (extra
+        batches would only wait for the rate limit or be answered with 429).
+        Requests are then assigned largest first to the least loaded batch
+        (LPT scheduling), which keeps the slowest batch as short as possible.
+
+        Returns:
+            List[List[int]]: Indices into ``requests``, heaviest batch first
+        """
+        if not requests:
+            return []
+        tokens = [max(1, self._estimate_tokens(req['code'])) for req in requests]
+        total = sum(tokens)
+        count = max(
+            -(-total // self.batch_token_budget),
+            -(-len(requests) // self.MAX_BATCH_SIZE),
+            min(len(requests), self._concurrency_window(), self._rate_budget())
+        )
         
-        await self._wait_for_rate_limit()
+        batches: List[List[int]] = [[] for _ in range(count)]
+        loads = [0] * count
+        heap = [(0, i) for i in range(count)]
+        for index in sorted(range(len(requests)), key=tokens.__getitem__, reverse=True):
+            load, i = heapq.heappop(heap)
+            batches[i].append(index)
+            loads[i] = load + tokens[index]
+            if len(batches[i]) < self.MAX_BATCH_SIZE:
+                heapq.heappush(heap, (loads[i], i))
         
-        async with self._semaphore:
+        order = sorted(range(count), key=loads.__getitem__, reverse=True)
+        return [batches[i] for i in order if batches[i]]
+
+    def _create_batches(self, requests: List[Dict]) -> List[List[Dict]]:
+        """Create batches of similar cost, heaviest first (see ``_pack_batches``)."""
+        return [[requests[i] for i in batch] for batch in self._pack_batches(requests)]
+
+    async def _run_batches(
+        self,
+        requests: List[Dict],
+        on_result: Optional[Callable[[Dict, str], None]] = None
+    ) -> List[Optional[str]]:
+        """Send ``requests`` as concurrent batches; results are in request order."""
+        results: List[Optional[str]] = [None] * len(requests)
+        batches = self._pack_batches(requests)
+        batch_results = await asyncio.gather(
+            *(self._make_batch_request([requests[i] for i in batch], on_result) for batch in batches)
+        )
+        for batch, batch_result in zip(batches, batch_results):
+            for index, result in zip(batch, batch_result):
+                results[index] = result
+        return results
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given attempt (0-based)."""
+        return random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt))
+
+    async def _send_batch(
+        self,
+        batch: List[Dict],
+        on_result: Optional[Callable[[Dict, str], None]] = None
+    ) -> Optional[List[Optional[str]]]:
+        """Send one batch request, asking the server to stream results.
+
+        With a streamed (NDJSON) response each result is passed to
+        ``on_result(request, text)`` as soon as its line arrives, and results
+        received before a timeout or dropped connection are kept. Servers that
+        answer with a single JSON document are handled too.
+
+        Returns:
+            Optional[List[Optional[str]]]: One entry per request (None where the
+            server returned nothing), or None if the request failed outright
+        """
+        texts: List[Optional[str]] = [None] * len(batch)
+        streamed = False
+
+        async def read(response: aiohttp.ClientResponse) -> Dict:
+            nonlocal streamed
+            if response.content_type != self.NDJSON_CONTENT_TYPE:
+                return await response.json()
+            streamed = True
             try:
-                server_url = self._get_random_server()
-                async with self._async_session.post(
-                    f"{server_url}/api/v1/gemini/generate/batch",
-                    json={
-                        "files": batch,
-                        "api_key": api_key
-                    },
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = data.get("texts", [])
-                        
-                        # Debug logging
-                        # print(f"Batch details:")
-                        # print(f"Input batch size: {len(batch)}")
-                        # print(f"Response size: {len(results)}")
-                        
-                        # Always ensure we return exactly the number of results we requested
-                        if len(results) > len(batch):
-                            # print(f"Trimming extra result from server")
-                            results = results[:len(batch)]
-                        elif len(results) < len(batch):
-                            # print(f"Padding missing results")
-                            results.extend([None] * (len(batch) - len(results)))
-                            
-                        return results
-                        
-            except Exception as e:
-                print(f"Batch request failed: {str(e)}")
-            return [None] * len(batch)
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    index, text = item.get('index'), item.get('text')
+                    if isinstance(index, int) and 0 <= index < len(batch) and text and texts[index] is None:
+                        texts[index] = text
+                        if on_result:
+                            on_result(batch[index], text)
+            except (asyncio.TimeoutError, aiohttp.ClientPayloadError, ValueError) as e:
+                if not any(texts):
+                    raise
+                print(f"Streamed batch interrupted after {sum(1 for t in texts if t)} results: {str(e) or type(e).__name__}")
+            return {'texts': texts}
 
-    def _fast_cache_key(self, code: str, analysis: Dict, operation: str = 'generate') -> str:
-        """Generate cache key based on code content and operation type."""
-        # Include first 100 chars of code, class/function names, and operation type
-        key_content = (
-            f"{code[:100]}"
-            f"{str(analysis.get('classes', []))}"
-            f"{str(analysis.get('functions', []))}"
-            f"{operation}"  # Add operation type to differentiate generate vs update
+        data = await self._post(
+            "/api/v1/gemini/generate/batch",
+            {
+                "files": [self._wire_request(req) for req in batch],
+                "api_key": self.api_key_manager.get_api_key()
+            },
+            timeout=self.batch_request_timeout,
+            cost=sum(self._estimate_tokens(req['code']) for req in batch),
+            headers={'Accept': f"{self.NDJSON_CONTENT_TYPE}, application/json"},
+            read=read
         )
-        return hashlib.md5(key_content.encode()).hexdigest()
+        if not data:
+            return None
+        
+        results = list(data.get("texts") or [])[:len(batch)]
+        results.extend([None] * (len(batch) - len(results)))
+        if on_result and not streamed:
+            for req, result in zip(batch, results):
+                if result:
+                    on_result(req, result)
+        return results
+
+    async def _recover_batch(
+        self,
+        batch: List[Dict],
+        attempt: int = 0,
+        on_result: Optional[Callable[[Dict, str], None]] = None
+    ) -> List[Optional[str]]:
+        """Send a batch, recovering as much of it as possible on failure.
 
-    async def generate_text_batch(self, requests: List[Dict]) -> List[Optional[str]]:
-        """Generate text for multiple requests using batching with caching."""
-        results = []
-        uncached_requests = []
-        request_mapping = {}  # Map batch indices to original indices
+        A batch that fails outright is split in half and the halves are
+        retried, so one file that breaks the server (a "poison" file) only
+        loses its own result. Requests the server answered without a text are
+        retried on their own. Retries wait with jittered exponential backoff.
+        A batch the server rejects with a 4xx is not retried at all.
+        """
+        try:
+            results = await self._send_batch(batch, on_result)
+        except RequestRejected as e:
+            print(f"Server {e}; not retrying {len(batch)} requests")
+            return [None] * len(batch)
+        
+        if results is None:
+            if (attempt + 1 >= self.MAX_BATCH_ATTEMPTS and len(batch) == 1) or not self.server_pool.healthy():
+                for req in batch:
+                    print(f"Giving up on {req.get('file_path', 'request')} after {attempt + 1} attempts")
+                return [None] * len(batch)
+            await asyncio.sleep(self._backoff_delay(attempt))
+            if len(batch) == 1:
+                return await self._recover_batch(batch, attempt + 1, on_result)
+            middle = len(batch) // 2
+            first, second = await asyncio.gather(
+                self._recover_batch(batch[:middle], attempt, on_result),
+                self._recover_batch(batch[middle:], attempt, on_result)
+            )
+            return first + second
         
-        # Check cache first
-        for i, req in enumerate(requests):
-            cache_key = self._fast_cache_key(
-                req['code'], 
+        missing = [i for i, result in enumerate(results) if not result]
+        if missing and attempt + 1 < self.MAX_BATCH_ATTEMPTS:
+            await asyncio.sleep(self._backoff_delay(attempt))
+            retried = await self._recover_batch([batch[i] for i in missing], attempt + 1, on_result)
+            for i, result in zip(missing, retried):
+                results[i] = result
+        return results
+
+    async def _make_batch_request(
+        self,
+        batch: List[Dict],
+        on_result: Optional[Callable[[Dict, str], None]] = None
+    ) -> List[Optional[str]]:
+        """Make a batch request to the AI server, with partial-failure recovery.
+
+        ``on_result(request, text)`` is called for each result as it arrives.
+        """
+        try:
+            return await self._recover_batch(batch, on_result=on_result)
+        except Exception as e:
+            print(f"Batch request failed: {str(e)}")
+            return [None] * len(batch)
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-server concurrency limit, health and outcome counters."""
+        health = self.server_pool.snapshot()
+        return {
+            url: dict(limiter.snapshot(), **health[url])
+            for url, limiter in self._concurrency.items()
+        }
+
+    def _fast_cache_key(self, code: str, analysis: Dict, operation: str = 'generate',
+                        changes: Optional[str] = None) -> str:
+        """Generate a content-addressed cache key for a request.
+
+        Uses the hash computed while the file was read when the analysis has
+        one, otherwise hashes the full code.
+        """
+        source_hash = analysis.get('content_hash') or text_hash(code)
+        return doc_cache_key(source_hash, operation, self.model_settings, changes)
+
+    def _wire_request(self, req: Dict) -> Dict:
+        """Strip client-side fields (such as the analysis) before sending a request."""
+        return {key: value for key, value in req.items() if key in self.WIRE_FIELDS}
+
+    async def generate_text_batch(
+        self,
+        requests: List[Dict],
+        on_result: Optional[Callable[[int, str], None]] = None
+    ) -> List[Optional[str]]:
+        """Generate text for multiple requests using batching with caching.
+
+        Each result is passed to ``on_result(index, text)`` as soon as it
+        arrives, cache hits first; new results are cached in one write at
+        the end.
+
+        Returns one result per request, in request order (None on failure).
+        """
+        results: List[Optional[str]] = [None] * len(requests)
+        cache_keys = [
+            self._fast_cache_key(
+                req['code'],
                 req.get('analysis', {}),
-                'generate'
+                'update' if req.get('prompt_type') == 'update' else 'generate',
+                changes=req.get('changes')
             )
-            cached_doc = self._get_cached_doc(cache_key)
-            if cached_doc:
-                results.append(cached_doc)
+            for req in requests
+        ]
+        
+        # Resolve the whole batch against the cache in one query
+        cached_docs = await asyncio.to_thread(self._get_cached_docs, cache_keys)
+        uncached_indices = []
+        for i, cache_key in enumerate(cache_keys):
+            if cache_key in cached_docs:
+                results[i] = cached_docs[cache_key]
+                if on_result:
+                    on_result(i, results[i])
             else:
-                uncached_requests.append(req)
-                request_mapping[len(uncached_requests) - 1] = i
+                uncached_indices.append(i)
         
-        if uncached_requests:
-            # Process uncached requests in batches
-            batches = self._create_batches(uncached_requests)
-            
-            async def process_batch(batch):
-                return await self._make_batch_request(batch)
-            
-            # Create tasks for all batches
-            tasks = [process_batch(batch) for batch in batches]
-            batch_results = await asyncio.gather(*tasks)
-            
-            # Process and cache results
-            flat_results = []
-            for batch_result in batch_results:
-                flat_results.extend(batch_result)
-            
-            # Cache new results and insert them in correct positions
-            final_results = results.copy()
-            for i, result in enumerate(flat_results):
-                if result:
-                    orig_idx = request_mapping[i]
-                    cache_key = self._fast_cache_key(
-                        uncached_requests[i]['code'],
-                        uncached_requests[i].get('analysis', {}),
-                        'generate'
-                    )
-                    self._save_to_cache(cache_key, result)
-                    while len(final_results) <= orig_idx:
-                        final_results.append(None)
-                    final_results[orig_idx] = result
-            
-            return final_results
+        if uncached_indices:
+            # Identical requests (e.g. vendored copies of a file) share a cache
+            # key; send each once and fan the result out to every index
+            duplicates: Dict[str, List[int]] = {}
+            for i in uncached_indices:
+                duplicates.setdefault(cache_keys[i], []).append(i)
+            unique_requests = [requests[indices[0]] for indices in duplicates.values()]
+            key_of = {id(req): key for req, key in zip(unique_requests, duplicates)}
+            new_entries: Dict[str, str] = {}
+
+            # Report results as they stream in
+            def handle_result(req: Dict, text: str) -> None:
+                key = key_of[id(req)]
+                new_entries[key] = text
+                for i in duplicates[key]:
+                    results[i] = text
+                    if on_result:
+                        on_result(i, text)
+
+            batch_results = await self._run_batches(unique_requests, handle_result)
+            for req, result in zip(unique_requests, batch_results):
+                if result and results[duplicates[key_of[id(req)]][0]] is None:
+                    handle_result(req, result)
+            if new_entries:
+                await asyncio.to_thread(self._save_many_to_cache, new_entries)
         
         return results
 
@@ -274,10 +562,18 @@ class AIClient:
             print(f"Error generating text: {str(e)}")
             return None
 
+    async def __aenter__(self) -> 'AIClient':
+        await self._ensure_async_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
     async def close(self):
         """Close the async session."""
         if self._async_session:
-            await self._async_session.close() 
+            await self._async_session.close()
+            self._async_session = None
 
     async def generate_update_documentation_batch(self, files_data: List[Tuple[str, Dict, str, str]]) -> Dict[str, str]:
         """Generate documentation updates with caching."""
@@ -285,25 +581,24 @@ class AIClient:
             results = {}
             uncached_files = []
             
-            # Check cache first
-            for path, analysis, code, changes in files_data:
-                if not changes.strip():
-                    continue
-                    
-                cache_key = self._fast_cache_key(
-                    changes+code,  # Include changes in cache key for updates
-                    analysis,
-                    'update'
-                )
-                cached_doc = self._get_cached_doc(cache_key)
-                
-                if cached_doc:
-                    results[path] = cached_doc
+            # Check cache first, in one lookup for the whole batch
+            files_with_changes = [f for f in files_data if f[3].strip()]
+            cache_keys = [
+                self._fast_cache_key(code, analysis, 'update', changes=changes)
+                for _, analysis, code, changes in files_with_changes
+            ]
+            cached_docs = await asyncio.to_thread(self._get_cached_docs, cache_keys)
+            for file_data, cache_key in zip(files_with_changes, cache_keys):
+                if cache_key in cached_docs:
+                    results[file_data[0]] = cached_docs[cache_key]
                 else:
-                    uncached_files.append((path, analysis, code, changes))
+                    uncached_files.append(file_data + (cache_key,))
             
             if uncached_files:
-                # Process uncached files
+                # Process uncached files, sending identical requests only once
+                unique_files = {}
+                for file_data in uncached_files:
+                    unique_files.setdefault(file_data[4], file_data)
                 requests = [
                     {
                         'code': code,
@@ -311,110 +606,54 @@ class AIClient:
                         'prompt_type': 'update',
                         'file_path': path
                     }
-                    for path, _, code, changes in uncached_files
+                    for path, _, code, changes, _ in unique_files.values()
                 ]
                 
-                batches = self._create_batches(requests)
-                
-                async def process_batch(batch):
-                    return await self._make_batch_request(batch)
-                
-                tasks = [process_batch(batch) for batch in batches]
-                batch_results = await asyncio.gather(*tasks)
-                
                 # Process and cache new results
-                all_results = []
-                for batch_result in batch_results:
-                    all_results.extend(batch_result)
+                all_results = await self._run_batches(requests)
+                new_entries = {
+                    cache_key: result
+                    for cache_key, result in zip(unique_files, all_results)
+                    if result
+                }
                 
-                for (path, analysis, code, changes), result in zip(uncached_files, all_results):
-                    if result:
-                        cache_key = self._fast_cache_key(
-                            changes+code,
-                            analysis,
-                            'update'
-                        )
-                        self._save_to_cache(cache_key, result)
-                        results[path] = result
-                    else:
-                        results[path] = "Error: Failed to generate documentation"
+                for path, _, _, _, cache_key in uncached_files:
+                    results[path] = new_entries.get(cache_key, "Error: Failed to generate documentation")
+                await asyncio.to_thread(self._save_many_to_cache, new_entries)
             
             return results
             
         except Exception as e:
             print(f"Batch update generation failed: {str(e)}")
             return {path: f"Error: {str(e)}" for path, _, _, _ in files_data}
-        finally:
-            await self.close() 
 
     def _get_cached_doc(self, cache_key: str) -> Optional[str]:
         """Retrieve cached documentation if it exists and is valid."""
+        return self._get_cached_docs([cache_key]).get(cache_key)
+
+    def _get_cached_docs(self, cache_keys: List[str]) -> Dict[str, str]:
+        """Retrieve all valid cached documentation for ``cache_keys`` in one lookup."""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if not cache_file.exists():
-                return None
-                
-            cache_data = json.loads(cache_file.read_text())
-            # Check if cache data has the expected structure
-            if not isinstance(cache_data, dict) or 'content' not in cache_data or 'timestamp' not in cache_data:
-                # Invalid cache data, remove it
-                cache_file.unlink()
-                return None
-                
-            cached_time = datetime.fromisoformat(cache_data['timestamp'])
-            
-            # Check if cache is still valid
-            if datetime.now() - cached_time <= self.cache_duration:
-                return cache_data.get('content')
-            
-            # Remove expired cache
-            cache_file.unlink()
-            return None
-            
+            return self.cache.get_many(cache_keys)
         except Exception as e:
-            # If there's an error, clean up the corrupted cache file
-            try:
-                if cache_file.exists():
-                    cache_file.unlink()
-            except:
-                pass
-            print(f"Cache read error for key {cache_key}: {str(e)}")
-            return None
+            print(f"Cache read error: {str(e)}")
+            return {}
 
     def _save_to_cache(self, cache_key: str, content: str) -> None:
         """Save documentation to cache."""
+        self._save_many_to_cache({cache_key: content})
+
+    def _save_many_to_cache(self, entries: Dict[str, str]) -> None:
+        """Save several documentation entries in one transaction."""
         try:
-            if not content or not isinstance(content, str):
-                return  # Don't cache invalid content
-                
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            cache_data = {
-                'content': content,
-                'timestamp': datetime.now().isoformat(),
-                'version': '1.0'  # Adding version for future compatibility
-            }
-            
-            # Write to temporary file first
-            temp_file = cache_file.with_suffix('.tmp')
-            temp_file.write_text(json.dumps(cache_data, ensure_ascii=False, indent=2))
-            
-            # Then rename to final filename (atomic operation)
-            temp_file.replace(cache_file)
-            
+            self.cache.put_many(entries)
         except Exception as e:
-            print(f"Cache write error for key {cache_key}: {str(e)}")
-            # Clean up temporary file if it exists
-            try:
-                if temp_file.exists():
-                    temp_file.unlink()
-            except:
-                pass
+            print(f"Cache write error: {str(e)}")
 
     def _clear_cache(self) -> None:
         """Clear all cached documentation."""
         try:
-            for cache_file in self.cache_dir.glob('*.json'):
-                cache_file.unlink()
+            self.cache.clear()
         except Exception as e:
             print(f"Cache clear error: {str(e)}") 
 
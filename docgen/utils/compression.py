@@ -0,0 +1,38 @@
+# docgen/utils/compression.py
+import gzip
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+# Bodies smaller than this are sent uncompressed; the savings would not pay
+# for the extra CPU and header bytes
+MIN_COMPRESS_BYTES = 1024
+
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+
+
+def resolve_encoding(name: Optional[str]) -> Optional[str]:
+    """Map the ``request_compression`` setting to a usable Content-Encoding.
+
+    Falls back to gzip when zstd is requested but ``zstandard`` is not
+    installed. Returns None when compression is disabled.
+    """
+    name = (name or 'none').lower()
+    if name in ('none', 'off', 'false', 'identity'):
+        return None
+    if name == 'zstd':
+        return 'zstd' if zstandard is not None else 'gzip'
+    return 'gzip'
+
+
+def compress(data: bytes, encoding: Optional[str]) -> bytes:
+    """Compress ``data`` with ``encoding`` ('gzip' or 'zstd')."""
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL)
+    return data
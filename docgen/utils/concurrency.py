@@ -0,0 +1,105 @@
+# docgen/utils/concurrency.py
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for requests to one server.
+
+    The limit grows additively (about one slot per round trip's worth of
+    successes) while responses are healthy, and is cut multiplicatively on
+    overload signals (429/5xx responses and timeouts). Growth pauses while
+    latency per unit of work is well above the best observed, which means the
+    server has started queueing. Only one cut is applied per round of in-flight
+    requests, so a burst of failures does not collapse the limit.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.successes = 0
+        self.overloads = 0
+        self.errors = 0
+        self.min_latency: Optional[float] = None
+        self.ewma_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built outside an event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> float:
+        """Wait for a free slot; returns the start time to pass to ``release``."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self, started: float, outcome: str = 'success', cost: float = 1.0) -> None:
+        """Free a slot and adapt the limit.
+
+        Args:
+            started: Value returned by ``acquire``
+            outcome: ``'success'``, ``'overload'`` (429/5xx/timeout) or
+                ``'error'`` (a failure that says nothing about server load)
+            cost: Size of the request (e.g. estimated tokens), used to compare
+                latencies of differently sized batches
+        """
+        latency = (time.monotonic() - started) / max(cost, 1.0)
+        if outcome == 'success':
+            self._on_success(latency)
+        elif outcome == 'overload':
+            self._on_overload(started)
+        else:
+            self.errors += 1
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def _on_success(self, latency: float) -> None:
+        self.successes += 1
+        self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+        self.ewma_latency = latency if self.ewma_latency is None else 0.8 * self.ewma_latency + 0.2 * latency
+        healthy = self.ewma_latency <= self.min_latency * self.latency_tolerance
+        # Only grow when latency is healthy and the current limit is actually used
+        if healthy and self.in_flight >= int(self.limit):
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def _on_overload(self, started: float) -> None:
+        self.overloads += 1
+        self._decrease(started)
+
+    def _decrease(self, started: float) -> None:
+        if started < self._last_decrease:
+            return  # Sent before the last cut; its signal is already accounted for
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._last_decrease = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limit and counters, for metrics output."""
+        return {
+            'limit': int(self.limit),
+            'in_flight': self.in_flight,
+            'successes': self.successes,
+            'overloads': self.overloads,
+            'errors': self.errors,
+            'ewma_latency': self.ewma_latency,
+            'min_latency': self.min_latency,
+        }
@@ -0,0 +1,120 @@
+# docgen/utils/file_discovery.py
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, FrozenSet
+from docgen.utils.extension import SUPPORTED_EXTENSIONS
+
+# Directories that never contain source worth documenting
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    # Virtual environments
+    'venv', 'env', '.env', '.venv',
+    # Package directories
+    'site-packages', 'node_modules',
+    # Cache directories
+    '__pycache__', '.pytest_cache', '.mypy_cache',
+    # Build directories
+    'build', 'dist', '.build',
+    # Git directory
+    '.git',
+    # IDE directories
+    '.idea', '.vscode',
+    # Other common config directories
+    '.github', '.circleci', '.husky'
+})
+
+
+def is_excluded_dir(name: str, exclude_dirs: FrozenSet[str] = DEFAULT_EXCLUDE_DIRS) -> bool:
+    """Check whether a directory name should be pruned from discovery."""
+    return (name.startswith('.') or
+            name in exclude_dirs or
+            name.endswith('.egg-info'))
+
+
+class FileDiscovery:
+    """Walks a directory tree once and yields files with supported extensions.
+
+    Excluded directories are pruned before descending, and file names are
+    matched against a precomputed suffix set instead of one glob per extension.
+    When a ``matcher`` (see ``IgnoreMatcher``) is given it decides exclusion
+    for both directories and files; otherwise ``exclude_dirs`` is used.
+    """
+
+    def __init__(
+        self,
+        extensions: Optional[Iterable[str]] = None,
+        exclude_dirs: FrozenSet[str] = DEFAULT_EXCLUDE_DIRS,
+        matcher=None
+    ):
+        self.extensions = frozenset(
+            ext.lower() for ext in (extensions if extensions is not None else SUPPORTED_EXTENSIONS)
+        )
+        self.exclude_dirs = exclude_dirs
+        self.matcher = matcher
+
+    def matches(self, name: str) -> bool:
+        """Check whether a file name ends with one of the configured extensions.
+
+        Multi-part extensions such as ``.d.ts`` are handled by checking every
+        dotted tail of the name.
+        """
+        lowered = name.lower()
+        index = lowered.find('.')
+        while index != -1:
+            if lowered[index:] in self.extensions:
+                return True
+            index = lowered.find('.', index + 1)
+        return False
+
+    def iter_files(self, base_path: Path, recursive: bool = True) -> Iterator[Path]:
+        """Yield matching files below ``base_path`` in a single tree walk.
+
+        Args:
+            base_path: Directory to walk
+            recursive: Descend into subdirectories when True
+
+        Yields:
+            Path: Matching file paths, in directory order
+        """
+        stack = [(str(base_path), '')]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            rel_path = f"{rel_dir}{entry.name}"
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive and not self._skip_dir(entry.name, rel_path):
+                                    subdirs.append((entry.path, rel_path + '/'))
+                            elif (entry.is_file() and self.matches(entry.name) and
+                                  not self._skip_file(rel_path)):
+                                yield Path(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            # Reverse so directories are visited in the order scandir returned them
+            stack.extend(reversed(subdirs))
+
+    def find_files(self, base_path: Path, recursive: bool = True) -> List[Path]:
+        """Return all matching files below ``base_path``."""
+        return list(self.iter_files(base_path, recursive))
+
+    def accepts(self, rel_path: str) -> bool:
+        """Whether ``iter_files`` would yield the file at ``rel_path`` (relative, '/'-separated)."""
+        parts = rel_path.split('/')
+        if not self.matches(parts[-1]) or self._skip_file(rel_path):
+            return False
+        return not any(
+            self._skip_dir(name, '/'.join(parts[:i + 1]))
+            for i, name in enumerate(parts[:-1])
+        )
+
+    def _skip_dir(self, name: str, rel_path: str) -> bool:
+        if self.matcher is not None:
+            return self.matcher.matches(rel_path, is_dir=True)
+        return is_excluded_dir(name, self.exclude_dirs)
+
+    def _skip_file(self, rel_path: str) -> bool:
+        return self.matcher is not None and self.matcher.matches(rel_path, is_dir=False)
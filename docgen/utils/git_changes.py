@@ -0,0 +1,144 @@
+# docgen/utils/git_changes.py
+import re
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Paths per git invocation, well below common command-line length limits
+PATHS_PER_CALL = 500
+
+NULL_SHA = '0' * 40
+
+_DIFF_HEADER_RE = re.compile(rb'^diff --git ', re.MULTILINE)
+
+
+@dataclass
+class DiffEntry:
+    """One changed path from ``git diff --raw``."""
+    status: str  # 'A', 'M', 'D', 'R', 'T', ...
+    path: str
+    old_path: Optional[str] = None  # for renames and copies
+    # Blob of the new content, or None when it must be read from the work tree
+    blob: Optional[str] = None
+
+
+class GitChangeDetector:
+    """Change detection through a few batched ``git`` subprocess calls.
+
+    Extensions are filtered by git itself (as pathspecs), patches are
+    requested only for the paths that are kept, and blob contents come from
+    one ``git cat-file --batch`` process instead of per-file reads.
+    """
+
+    def __init__(self, root: Path = Path('.'), extensions: Iterable[str] = ()):
+        self.root = Path(root)
+        self.pathspecs = [f"*{ext}" for ext in sorted(set(extensions))]
+
+    def _git(self, *args: str, input: Optional[bytes] = None) -> bytes:
+        result = subprocess.run(
+            ['git', '-c', 'core.quotepath=off', *args],
+            cwd=self.root,
+            input=input,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout
+
+    def changed_paths(self, base: str) -> List[DiffEntry]:
+        """Paths changed between commit ``base`` and the work tree."""
+        output = self._git('diff', '--raw', '-z', '-M', '--no-abbrev', base, '--', *self.pathspecs)
+        return parse_raw_diff(output)
+
+    def patches(self, base: str, entries: Sequence[DiffEntry]) -> Dict[str, str]:
+        """Unified diffs (from the first hunk on) for ``entries``, keyed by new path."""
+        paths: List[str] = []
+        for entry in entries:
+            paths.append(entry.path)
+            if entry.old_path:
+                paths.append(entry.old_path)  # needed for git to pair up the rename
+        patches: Dict[str, str] = {}
+        for i in range(0, len(paths), PATHS_PER_CALL):
+            output = self._git('diff', '--no-color', '--no-ext-diff', '-M', base, '--', *paths[i:i + PATHS_PER_CALL])
+            patches.update(split_patches(output))
+        return patches
+
+    def read_blobs(self, blobs: Iterable[str]) -> Dict[str, bytes]:
+        """Contents of ``blobs`` from a single ``git cat-file --batch`` call."""
+        blobs = list(dict.fromkeys(blobs))
+        if not blobs:
+            return {}
+        output = self._git('cat-file', '--batch', input=''.join(f"{sha}\n" for sha in blobs).encode('ascii'))
+        contents: Dict[str, bytes] = {}
+        pos = 0
+        while pos < len(output):
+            end = output.index(b'\n', pos)
+            header = output[pos:end].split()
+            pos = end + 1
+            if len(header) < 3:  # "<sha> missing"
+                continue
+            size = int(header[2])
+            contents[header[0].decode('ascii')] = output[pos:pos + size]
+            pos += size + 1
+        return contents
+
+    def untracked_files(self) -> List[str]:
+        """Untracked, non-ignored files with a supported extension."""
+        output = self._git('ls-files', '-o', '--exclude-standard', '-z', '--', *self.pathspecs)
+        return [path for path in output.decode('utf-8', 'surrogateescape').split('\0') if path]
+
+
+def parse_raw_diff(output: bytes) -> List[DiffEntry]:
+    """Parse ``git diff --raw -z`` output."""
+    fields = output.decode('utf-8', 'surrogateescape').split('\0')
+    entries = []
+    i = 0
+    while i < len(fields) and fields[i].startswith(':'):
+        _, _, _, new_sha, status = fields[i][1:].split(' ')
+        kind = status[0]
+        if kind in 'RC':
+            entry = DiffEntry(kind, fields[i + 2], old_path=fields[i + 1])
+            i += 3
+        else:
+            entry = DiffEntry(kind, fields[i + 1])
+            i += 2
+        entry.blob = new_sha if new_sha != NULL_SHA else None
+        entries.append(entry)
+    return entries
+
+
+def split_patches(output: bytes) -> Dict[str, str]:
+    """Split multi-file ``git diff`` output into per-file hunks, keyed by new path."""
+    patches = {}
+    starts = [m.start() for m in _DIFF_HEADER_RE.finditer(output)]
+    for start, end in zip(starts, starts[1:] + [len(output)]):
+        block = output[start:end].decode('utf-8', 'replace')
+        path = None
+        hunks = ''
+        for line in block.splitlines(keepends=True):
+            if line.startswith('+++ '):
+                target = line[4:].rstrip('\n').rstrip('\t')  # git appends a tab to names with spaces
+                path = None if target == '/dev/null' else _strip_prefix(_unquote(target))
+            elif line.startswith('rename to ') and path is None:
+                path = _unquote(line[len('rename to '):].rstrip('\n'))
+            elif line.startswith('@@'):
+                hunks = block[block.index(line):]
+                break
+        if path is not None:
+            patches[path] = hunks
+    return patches
+
+
+def _strip_prefix(path: str) -> str:
+    return path[2:] if path.startswith(('a/', 'b/')) else path
+
+
+def _unquote(path: str) -> str:
+    """Undo git's C-style quoting of unusual file names."""
+    if not (path.startswith('"') and path.endswith('"')):
+        return path
+    raw = path[1:-1].encode('utf-8').decode('unicode_escape')
+    return raw.encode('latin-1').decode('utf-8', 'replace')
@@ -1,16 +1,65 @@
 # docgen/utils/git_utils.py
 from docgen.utils.extension import SUPPORTED_EXTENSIONS
+from docgen.utils.file_discovery import FileDiscovery
+from docgen.utils.git_changes import GitChangeDetector
+from docgen.utils.hashing import content_hash
 from rich.console import Console
 from git import Repo
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
 import json
+import re
 from datetime import datetime
 
 console = Console()
 
+_HUNK_HEADER_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+
+
+def changed_line_ranges(patch: str) -> List[Tuple[int, int]]:
+    """Line ranges of the new file changed by a unified diff, as (first, last).
+
+    Only added and removed lines count, not hunk context. Removed lines that
+    are replaced count as the added lines; a pure deletion touches the lines
+    on either side of where the removed lines were.
+    """
+    ranges: List[Tuple[int, int]] = []
+    line = None
+
+    def add(first: int, last: int) -> None:
+        first = max(first, 1)
+        if ranges and first <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], last))
+        else:
+            ranges.append((first, last))
+
+    deleted = False  # removed lines not (yet) followed by added ones
+    for text in patch.splitlines():
+        header = _HUNK_HEADER_RE.match(text)
+        if text.startswith('\\') or (line is None and not header):
+            continue
+        if text.startswith('-') and not header:
+            deleted = True
+            continue
+        if deleted and not text.startswith('+'):
+            add(line - 1, line)
+        deleted = False
+        if header:
+            line = int(header.group(1))
+        elif text.startswith('+'):
+            add(line, line)
+            line += 1
+        else:
+            line += 1
+    if deleted:
+        add(line - 1, line)
+    return ranges
+
 class GitAnalyzer:
-    def __init__(self):
+    def __init__(self, discovery: Optional[FileDiscovery] = None):
+        """``discovery`` decides which changed files are documented (see
+        ``FileDiscovery.accepts``); by default the built-in directory exclusions
+        apply."""
         try:
             self.repo = Repo(".")
         except Exception:
@@ -20,77 +69,152 @@ class GitAnalyzer:
         self.docgen_dir = Path(".docgen")
         self.docgen_dir.mkdir(exist_ok=True)
         self.last_doc_state_file = self.docgen_dir / "last_state.json"
+        
+        # Batched git subprocess calls for change detection
+        self.detector = GitChangeDetector(Path(self.repo.working_tree_dir), SUPPORTED_EXTENSIONS)
+        self.discovery = discovery if discovery is not None else FileDiscovery()
+
+    def load_state(self) -> Dict:
+        """The state recorded by the last documentation run (empty if none)."""
+        try:
+            return json.loads(self.last_doc_state_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _diff_base(self, state: Dict):
+        """Commit to diff the working tree against: the last documented one, else HEAD."""
+        last_commit = state.get('last_commit')
+        if last_commit:
+            try:
+                return self.repo.commit(last_commit)
+            except Exception:
+                console.print(f"[yellow]Warning: Last documented commit {last_commit[:12]} not found, diffing against HEAD[/yellow]")
+        return self.repo.head.commit
 
     def get_changed_files(self) -> Dict[Path, Dict]:
-        """Get files changed since last documentation update with their changes."""
+        """Get files changed since last documentation update with their changes.
+
+        Diffs the commit recorded by the last run against the working tree, so
+        committed and uncommitted changes are both picked up. Files whose
+        content hash matches the one recorded when they were last documented
+        are skipped, and files left pending by a run that failed to document
+        them are added back. Files ``generate`` would not document (ignored
+        or in excluded directories) are left out. Each entry has a ``type`` of 'modified', 'new',
+        'renamed' (with ``old_path``) or 'deleted', plus ``changes``,
+        ``full_code`` and ``content_hash``.
+        """
         try:
             console.print("[blue]Checking for changed files...[/blue]")
             changed = {}
+            state = self.load_state()
+            documented = state.get('files', {})
             
-            # Get all changes at once using git diff-index
-            diff_index = self.repo.head.commit.diff(None, create_patch=True)
+            def read_current(path: Path) -> Optional[Tuple[str, str]]:
+                """(content, hash) of a working-tree file, or None if unreadable."""
+                try:
+                    raw = path.read_bytes()
+                    return raw.decode('utf-8'), content_hash(raw)
+                except (OSError, UnicodeDecodeError):
+                    return None
             
-            # Process all changes in a single pass
-            for diff in diff_index:
-                if not diff.a_path:
-                    continue
-                    
-                path = Path(diff.a_path)
-                
-                # Skip non-supported files
-                if path.suffix not in SUPPORTED_EXTENSIONS:
+            # Get all changes at once, from the last documented commit; git
+            # filters by extension, so only supported files are listed
+            base = self._diff_base(state).hexsha
+            entries = []
+            for entry in self.detector.changed_paths(base):
+                if self.discovery.accepts(entry.path) and entry.status != 'D':
+                    entries.append(entry)
                     continue
-                
-                try:
-                    # Get patch directly from diff object
-                    patch = ''
-                    if hasattr(diff, 'diff'):
-                        try:
-                            patch = diff.diff.decode('utf-8')
-                        except (AttributeError, UnicodeDecodeError):
-                            pass
-                    
-                    # Only read the file if it exists
-                    if path.exists():
-                        try:
-                            with open(path, 'r', encoding='utf-8') as f:
-                                new_content = f.read()
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        new_content = ''
-                    
-                    # Only add files that have actual changes or content
-                    if patch or new_content:
-                        changed[path] = {
-                            'type': 'modified',
-                            'changes': patch,
-                            'full_code': new_content
-                        }
-                except Exception as e:
-                    console.print(f"[yellow]Warning: Skipping {path} due to error: {str(e)}[/yellow]")
+                # Deletions, and renames to an ignored path, drop the old docs
+                old_path = entry.old_path if entry.status == 'R' else entry.path
+                if entry.status in ('D', 'R') and self.discovery.accepts(old_path):
+                    changed[Path(old_path)] = {
+                        'type': 'deleted', 'changes': '', 'full_code': '', 'content_hash': None
+                    }
+            
+            # New contents: committed or staged blobs in one cat-file call,
+            # files with unstaged edits from the work tree
+            blobs = self.detector.read_blobs(entry.blob for entry in entries if entry.blob)
+            contents: Dict[str, Tuple[str, str]] = {}
+            for entry in entries:
+                raw = blobs.get(entry.blob) if entry.blob else None
+                if raw is not None:
+                    try:
+                        contents[entry.path] = (raw.decode('utf-8'), content_hash(raw))
+                    except UnicodeDecodeError:
+                        continue
+                else:
+                    current = read_current(Path(entry.path))
+                    if current is not None:
+                        contents[entry.path] = current
+            
+            # Files already documented at their current content need no patch
+            to_patch = []
+            for entry in entries:
+                if entry.path not in contents:
                     continue
+                new_content, new_hash = contents[entry.path]
+                path = Path(entry.path)
+                info = {
+                    'type': 'new' if entry.status == 'A' else 'modified',
+                    'changes': '',
+                    'full_code': new_content,
+                    'content_hash': new_hash
+                }
+                if entry.status == 'R':
+                    old_path = Path(entry.old_path)
+                    info.update(type='renamed', old_path=old_path)
+                    # A pure move keeps its documentation; no request needed
+                    if documented.get(str(old_path)) != new_hash:
+                        to_patch.append(entry)
+                elif documented.get(str(path)) == new_hash:
+                    continue  # Already documented at this content
+                else:
+                    to_patch.append(entry)
+                changed[path] = info
+            
+            # One batched diff call for the patches of the remaining files
+            for path_str, patch in self.detector.patches(base, to_patch).items():
+                if Path(path_str) in changed:
+                    changed[Path(path_str)]['changes'] = patch
             
             # Handle untracked files
-            for untracked_file in self.repo.untracked_files:
+            for untracked_file in self.detector.untracked_files():
+                if not self.discovery.accepts(untracked_file):
+                    continue
                 path = Path(untracked_file)
-                
-                # Skip non-supported and hidden files
-                if (path.suffix not in SUPPORTED_EXTENSIONS or
-                    any(p in str(path) for p in ['.docgen', '__pycache__', '.git'])):
+                current = read_current(path)
+                if current is None or documented.get(str(path)) == current[1]:
                     continue
-                
-                if path.exists():
-                    try:
-                        with open(path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        changed[path] = {
-                            'type': 'new',
-                            'changes': f"+++ {path}\n{content}",
-                            'full_code': content
-                        }
-                    except UnicodeDecodeError:
-                        continue
+                content, new_hash = current
+                changed[path] = {
+                    'type': 'new',
+                    'changes': f"+++ {path}\n{content}",
+                    'full_code': content,
+                    'content_hash': new_hash
+                }
+            
+            # Files a previous run failed to document, whose changes may
+            # already be behind the diff base; resent in full
+            for path_str in state.get('pending', []):
+                path = Path(path_str)
+                if path in changed or not self.discovery.accepts(path.as_posix()):
+                    continue
+                if not path.exists():
+                    changed[path] = {
+                        'type': 'deleted', 'changes': '', 'full_code': '', 'content_hash': None
+                    }
+                    continue
+                current = read_current(path)
+                if current is None or documented.get(path_str) == current[1]:
+                    continue
+                content, new_hash = current
+                changed[path] = {
+                    'type': 'modified',
+                    'changes': f"+++ {path}\n{content}",
+                    'full_code': content,
+                    'content_hash': new_hash
+                }
             
             # Output results
             if changed:
@@ -109,16 +233,40 @@ class GitAnalyzer:
             console.print(f"[red]Exception type: {type(e).__name__}[/red]")
             return {}
 
-    def update_last_documented_state(self):
-        """Update the last documented state."""
+    def update_last_documented_state(
+        self,
+        documented: Optional[Dict[Path, str]] = None,
+        removed: Iterable[Path] = (),
+        failed: Iterable[Path] = ()
+    ):
+        """Update the last documented state.
+
+        Args:
+            documented: Content hash of each file documented in this run
+            removed: Deleted files, and the old paths of renamed ones
+            failed: Changed files that were not documented; kept as pending
+                and returned by the next ``get_changed_files``
+        """
         try:
+            state = self.load_state()
+            files = state.get('files', {})
+            removed = {str(path) for path in removed}
+            documented = {str(path): file_hash for path, file_hash in (documented or {}).items()}
+            for path in removed:
+                files.pop(path, None)
+            files.update(documented)
+            pending = set(state.get('pending', [])) | {str(path) for path in failed}
+            pending -= removed | set(documented)
+            
             current_state = {
                 'last_commit': self.repo.head.commit.hexsha,
                 'timestamp': datetime.now().isoformat(),
-                'branch': self.repo.active_branch.name
+                'branch': self.repo.active_branch.name,
+                'files': files,
+                'pending': sorted(pending)
             }
             
             self.last_doc_state_file.write_text(json.dumps(current_state, indent=2))
             
         except Exception as e:
-            console.print(f"[yellow]Warning: Could not update documentation state: {str(e)}[/yellow]")
\ No newline at end of file
+            console.print(f"[yellow]Warning: Could not update documentation state: {str(e)}[/yellow]")
@@ -0,0 +1,44 @@
+# docgen/utils/hashing.py
+import hashlib
+import json
+from typing import Dict, Optional
+from docgen import __version__
+
+# Bump when the cached documentation format changes so old entries stop matching
+CACHE_KEY_VERSION = 2
+
+
+def content_hash(data: bytes) -> str:
+    """Fast content hash of raw source bytes."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """Content hash of a string, encoded as UTF-8."""
+    return content_hash(text.encode('utf-8'))
+
+
+def doc_cache_key(
+    source_hash: str,
+    prompt_type: str,
+    model_settings: Optional[Dict] = None,
+    changes: Optional[str] = None
+) -> str:
+    """Build a content-addressed cache key for a documentation request.
+
+    The key covers the full source (via ``source_hash``), the prompt type, the
+    model settings, any diff sent along with the code, and the tool version, so
+    files that only share a prefix never collide.
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    for part in (
+        source_hash,
+        prompt_type,
+        json.dumps(model_settings or {}, sort_keys=True),
+        text_hash(changes) if changes else '',
+        __version__,
+        str(CACHE_KEY_VERSION),
+    ):
+        hasher.update(part.encode('utf-8'))
+        hasher.update(b'\0')
+    return hasher.hexdigest()
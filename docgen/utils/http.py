@@ -0,0 +1,47 @@
+# docgen/utils/http.py
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connections kept per host by the shared session
+POOL_SIZE = 50
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_size: int = POOL_SIZE) -> requests.Session:
+    """Create a pooled session mounted for both http:// and https://.
+
+    Idempotent requests (GET/PUT/...) are retried on transient errors; POSTs
+    are not, since the server may already have counted them.
+    """
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=2,
+        backoff_factor=0.05,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry_strategy,
+        pool_block=False
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled session for usage, auth and other synchronous API calls.
+
+    Reusing it keeps TLS connections to the DocGen servers alive between calls.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
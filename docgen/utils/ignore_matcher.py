@@ -0,0 +1,200 @@
+# docgen/utils/ignore_matcher.py
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from docgen.utils.file_discovery import DEFAULT_EXCLUDE_DIRS
+
+IGNORE_FILES = ('.gitignore',)
+DOCGEN_IGNORE_FILE = '.docgenignore'
+
+# Built-in rules, expressed in gitignore syntax
+BUILTIN_PATTERNS = [f"{name}/" for name in sorted(DEFAULT_EXCLUDE_DIRS)] + [
+    '*.egg-info/',
+    # Hidden directories
+    '.*/',
+]
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob body into a regex fragment without capturing groups."""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif c == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif c == '?':
+            parts.append('[^/]')
+            i += 1
+        elif c == '[':
+            # A ']' right after '[' or '[!' is part of the class, as in git
+            start = i + 2 if pattern.startswith(('[!', '[^'), i) else i + 1
+            end = pattern.find(']', start + 1 if pattern.startswith(']', start) else start)
+            if end == -1:
+                parts.append(re.escape(c))
+                i += 1
+            else:
+                negate = '^' if start > i + 1 else ''
+                body = ''.join('\\' + ch if ch in '\\[]^&~|' else ch for ch in pattern[start:end])
+                parts.append(f"[{negate}{body}]")
+                i = end + 1
+        elif c == '\\' and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(c))
+            i += 1
+    return ''.join(parts)
+
+
+def parse_pattern(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """Parse one gitignore line.
+
+    Returns:
+        Optional[Tuple[str, bool, bool]]: (regex, negate, dir_only), or None for
+        blank lines, comments and patterns that cannot be matched
+    """
+    line = line.rstrip('\n').rstrip()
+    if not line or line.startswith('#'):
+        return None
+
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    elif line.startswith('\\'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    # "dir/**" ignores everything inside dir, which is the same as ignoring dir
+    if line.endswith('/**'):
+        line = line[:-3]
+        dir_only = True
+    if not line:
+        return None
+
+    anchored = '/' in line
+    line = line.lstrip('/')
+    regex = _translate_glob(line)
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    try:
+        re.compile(regex)
+    except re.error:
+        return None  # Malformed (e.g. the range in "[z-a]"); git skips it too
+    return regex, negate, dir_only
+
+
+class _RuleSet:
+    """Rules from one directory level, compiled into two alternation regexes.
+
+    Rules are joined in reverse order with one capturing group each, so the
+    group that matches is the last matching rule, mirroring gitignore's
+    last-match-wins semantics without evaluating the rules one by one.
+    """
+
+    def __init__(self, rules: List[Tuple[str, bool, bool]]):
+        self._file_regex, self._file_negate = self._compile([r for r in rules if not r[2]])
+        self._dir_regex, self._dir_negate = self._compile(rules)
+
+    @staticmethod
+    def _compile(rules: List[Tuple[str, bool, bool]]):
+        if not rules:
+            return None, []
+        ordered = list(reversed(rules))
+        regex = re.compile('^(?:' + '|'.join(f"({r[0]})" for r in ordered) + ')$', re.DOTALL)
+        return regex, [r[1] for r in ordered]
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True if ignored, False if re-included, None if no rule applies."""
+        regex, negate = (self._dir_regex, self._dir_negate) if is_dir else (self._file_regex, self._file_negate)
+        if regex is None:
+            return None
+        m = regex.match(rel_path)
+        if m is None:
+            return None
+        return not negate[m.lastindex - 1]
+
+
+class IgnoreMatcher:
+    """Decides which paths below a project root are excluded from documentation.
+
+    Merges the built-in excludes, ``exclude_patterns`` from the configuration,
+    ``.gitignore`` files (loaded lazily per directory) and an optional root
+    ``.docgenignore``. A lookup costs one compiled regex match per ancestor
+    directory that has its own ignore file.
+    """
+
+    def __init__(self, root: Path, patterns: Iterable[str] = (), use_gitignore: bool = True):
+        self.root = Path(root)
+        self.use_gitignore = use_gitignore
+        self._rule_sets: Dict[str, Optional[_RuleSet]] = {}
+
+        root_lines = list(BUILTIN_PATTERNS) + list(patterns)
+        if use_gitignore:
+            root_lines += self._read_lines(self.root / '.git' / 'info' / 'exclude')
+            for name in IGNORE_FILES:
+                root_lines += self._read_lines(self.root / name)
+        root_lines += self._read_lines(self.root / DOCGEN_IGNORE_FILE)
+        self._rule_sets[''] = self._build(root_lines)
+
+    @staticmethod
+    def _read_lines(path: Path) -> List[str]:
+        try:
+            return path.read_text(encoding='utf-8', errors='ignore').splitlines()
+        except OSError:
+            return []
+
+    @staticmethod
+    def _build(lines: Iterable[str]) -> Optional[_RuleSet]:
+        rules = [rule for rule in (parse_pattern(line) for line in lines) if rule]
+        return _RuleSet(rules) if rules else None
+
+    def _rule_set(self, rel_dir: str) -> Optional[_RuleSet]:
+        if rel_dir not in self._rule_sets:
+            lines = []
+            if self.use_gitignore:
+                for name in IGNORE_FILES:
+                    lines += self._read_lines(self.root / rel_dir / name)
+            self._rule_sets[rel_dir] = self._build(lines)
+        return self._rule_sets[rel_dir]
+
+    def matches(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a single path against the rules, assuming its parents are not ignored.
+
+        Args:
+            rel_path: POSIX path relative to the matcher root
+            is_dir: Whether the path is a directory
+
+        Returns:
+            bool: True if the path is excluded
+        """
+        parts = rel_path.split('/')
+        # Deeper ignore files take precedence over shallower ones
+        for depth in range(len(parts) - 1, -1, -1):
+            rule_set = self._rule_set('/'.join(parts[:depth]))
+            if rule_set is None:
+                continue
+            result = rule_set.match('/'.join(parts[depth:]), is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def is_ignored(self, path: Path, is_dir: bool = False) -> bool:
+        """Check a path, including whether any parent directory is excluded."""
+        try:
+            rel_path = Path(path).relative_to(self.root)
+        except ValueError:
+            rel_path = Path(path)
+        parts = rel_path.as_posix().split('/')
+        for depth in range(1, len(parts)):
+            if self.matches('/'.join(parts[:depth]), is_dir=True):
+                return True
+        return self.matches('/'.join(parts), is_dir=is_dir)
@@ -0,0 +1,70 @@
+# docgen/utils/rate_limiter.py
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """Async rate limiter using the generic cell rate algorithm (GCRA).
+
+    Allows ``requests`` per ``window`` seconds on average with bursts of up to
+    ``burst`` requests. With the default burst of 1 no ``window`` ever holds
+    more than ``requests`` requests; a larger burst lets one window hold up to
+    ``requests + burst - 1``. Each caller reserves its slot synchronously and
+    then sleeps without holding any lock, so waiting callers never queue
+    behind one another and the limit holds exactly instead of being reset
+    after a wait.
+    """
+
+    def __init__(self, requests: float, window: float, burst: int = 1):
+        if requests <= 0 or window <= 0:
+            raise ValueError("requests and window must be positive")
+        self.interval = window / requests
+        self.burst = max(1, int(burst))
+        self._tolerance = self.interval * (self.burst - 1)
+        self._tat = 0.0  # Theoretical arrival time of the next request
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Reserve the next slot and return how long the caller must wait."""
+        now = time.monotonic() if now is None else now
+        tat = max(self._tat, now)
+        wait = max(0.0, tat - self._tolerance - now)
+        self._tat = tat + self.interval
+        return wait
+
+    def available(self, now: Optional[float] = None) -> int:
+        """How many requests could be sent right now without waiting."""
+        now = time.monotonic() if now is None else now
+        free = (now + self._tolerance - max(self._tat, now)) // self.interval + 1
+        return int(min(self.burst, max(0, free)))
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        # reserve() never awaits, so it is atomic with respect to other tasks
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, delay: float, now: Optional[float] = None) -> None:
+        """Block new requests for ``delay`` seconds (e.g. from a ``Retry-After`` header)."""
+        now = time.monotonic() if now is None else now
+        self._tat = max(self._tat, now + delay + self._tolerance)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,123 @@
+# docgen/utils/server_pool.py
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class ServerState:
+    """Health of one server: latency, outstanding requests and circuit breaker."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.ewma_latency: Optional[float] = None
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.successes = 0
+        self.failures = 0
+
+    def is_available(self, now: float) -> bool:
+        """Closed circuits are available; open ones become half-open after the cooldown."""
+        return now >= self.open_until
+
+    def score(self) -> float:
+        # Expected wait if we queue behind the outstanding requests; servers
+        # without measurements score 0 so they get probed
+        return (self.ewma_latency or 0.0) * (self.outstanding + 1)
+
+
+class ServerPool:
+    """Pick servers by latency and load instead of uniformly at random.
+
+    Selection uses power-of-two-choices: two random available servers are
+    compared and the one with the lower ``ewma_latency * (outstanding + 1)``
+    wins, which avoids herding onto a single "best" server. A server whose
+    requests fail ``failure_threshold`` times in a row is taken out of rotation
+    (circuit open) for ``cooldown`` seconds, after which one request probes it.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        alpha: float = 0.3
+    ):
+        self.servers: Dict[str, ServerState] = {url: ServerState(url) for url in urls}
+        if not self.servers:
+            raise ValueError("ServerPool needs at least one server")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+
+    def choose(self, exclude: Iterable[str] = ()) -> str:
+        """Pick a server, preferring healthy ones not in ``exclude``.
+
+        Falls back to excluded or open-circuit servers rather than failing, so
+        a request is always attempted somewhere.
+        """
+        now = time.monotonic()
+        exclude = set(exclude)
+        candidates = [s for s in self.servers.values() if s.url not in exclude and s.is_available(now)]
+        if not candidates:
+            candidates = [s for s in self.servers.values() if s.is_available(now)]
+        if not candidates:
+            # Every circuit is open: try the one that will recover first
+            return min(self.servers.values(), key=lambda s: s.open_until).url
+        if len(candidates) == 1:
+            return candidates[0].url
+        first, second = random.sample(candidates, 2)
+        return min((first, second), key=ServerState.score).url
+
+    def start(self, url: str) -> float:
+        """Record a request being sent; returns the start time for ``finish``."""
+        state = self.servers[url]
+        state.outstanding += 1
+        if state.open_until:
+            # Half-open: let only this probe through until it reports back
+            state.open_until = time.monotonic() + self.cooldown
+        return time.monotonic()
+
+    def finish(self, url: str, started: float, ok: bool, cost: float = 1.0) -> None:
+        """Record a request's outcome.
+
+        Args:
+            url: Server the request was sent to
+            started: Value returned by ``start``
+            ok: Whether the server answered successfully
+            cost: Size of the request, so latencies of different batch sizes compare
+        """
+        state = self.servers[url]
+        state.outstanding = max(0, state.outstanding - 1)
+        if ok:
+            latency = (time.monotonic() - started) / max(cost, 1.0)
+            state.ewma_latency = latency if state.ewma_latency is None else (
+                (1 - self.alpha) * state.ewma_latency + self.alpha * latency
+            )
+            state.successes += 1
+            state.consecutive_failures = 0
+            state.open_until = 0.0
+        else:
+            state.failures += 1
+            state.consecutive_failures += 1
+            if state.consecutive_failures >= self.failure_threshold:
+                state.open_until = time.monotonic() + self.cooldown
+
+    def healthy(self) -> List[str]:
+        """URLs whose circuit is currently closed or half-open."""
+        now = time.monotonic()
+        return [url for url, state in self.servers.items() if state.is_available(now)]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-server health, for metrics output."""
+        now = time.monotonic()
+        return {
+            url: {
+                'ewma_latency': state.ewma_latency,
+                'outstanding': state.outstanding,
+                'successes': state.successes,
+                'failures': state.failures,
+                'circuit': 'closed' if not state.open_until else ('open' if now < state.open_until else 'half-open'),
+            }
+            for url, state in self.servers.items()
+        }
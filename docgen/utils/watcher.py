@@ -0,0 +1,170 @@
+# docgen/utils/watcher.py
+import os
+import queue
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Optional dependency; PollingWatcher is used instead
+    FileSystemEventHandler = object
+    Observer = None
+
+CHANGED = 'changed'
+DELETED = 'deleted'
+
+# Seconds without new events before a burst is flushed, and the longest a
+# change may wait while events keep arriving
+DEFAULT_DEBOUNCE = 0.5
+MAX_DELAY = 5.0
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+Change = Tuple[Path, str]
+
+
+class ChangeBatcher:
+    """Debounces file events and coalesces them per path.
+
+    Only the last event for a path is kept, so an editor that writes a file
+    several times per save causes one regeneration, and a file created and
+    deleted within a burst ends up as a single deletion.
+    """
+
+    def __init__(self, debounce: float = DEFAULT_DEBOUNCE, max_delay: float = MAX_DELAY):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._pending: Dict[Path, str] = {}
+        self._first = 0.0
+        self._last = 0.0
+
+    def add(self, path: Path, kind: str, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        if not self._pending:
+            self._first = now
+        self._last = now
+        self._pending[path] = kind
+
+    def ready(self, now: Optional[float] = None) -> bool:
+        """Whether the current burst has settled (or has waited ``max_delay``)."""
+        if not self._pending:
+            return False
+        now = time.monotonic() if now is None else now
+        return now - self._last >= self.debounce or now - self._first >= self.max_delay
+
+    def drain(self) -> Dict[Path, str]:
+        """Take the coalesced changes, by path."""
+        pending, self._pending = self._pending, {}
+        return pending
+
+
+class PollingWatcher:
+    """Detects changes by rescanning the tree and comparing mtime and size."""
+
+    name = 'polling'
+
+    def __init__(self, base_path: Path, discovery, interval: float = DEFAULT_POLL_INTERVAL):
+        self.base_path = Path(base_path)
+        self.discovery = discovery
+        self.interval = interval
+        self._snapshot: Dict[Path, Tuple[int, int]] = {}
+        self._next_scan = 0.0
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.discovery.iter_files(self.base_path):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def start(self) -> None:
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + self.interval
+
+    def poll(self) -> List[Change]:
+        """Changes since the previous scan; empty until ``interval`` has passed."""
+        if time.monotonic() < self._next_scan:
+            return []
+        snapshot = self._scan()
+        self._next_scan = time.monotonic() + self.interval
+        changes = [(path, CHANGED) for path, sig in snapshot.items() if self._snapshot.get(path) != sig]
+        changes.extend((path, DELETED) for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changes
+
+    def stop(self) -> None:
+        pass
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards watchdog events for documentable files to a queue."""
+
+    def __init__(self, watcher: 'EventWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        if event.event_type == 'moved':
+            self.watcher.push(event.src_path, DELETED)
+            self.watcher.push(event.dest_path, CHANGED)
+        elif event.event_type == 'deleted':
+            self.watcher.push(event.src_path, DELETED)
+        elif event.event_type in ('created', 'modified', 'closed'):
+            self.watcher.push(event.src_path, CHANGED)
+
+
+class EventWatcher:
+    """Receives changes from OS file events (inotify, FSEvents, ...) through watchdog."""
+
+    name = 'filesystem events'
+
+    def __init__(self, base_path: Path, discovery):
+        self.base_path = Path(base_path).resolve()
+        self.discovery = discovery
+        self._events: 'queue.SimpleQueue[Change]' = queue.SimpleQueue()
+        self._observer = None
+
+    def push(self, raw_path, kind: str) -> None:
+        """Queue an event if the file is one ``generate`` would document (any thread)."""
+        path = Path(os.fsdecode(raw_path))
+        try:
+            rel_path = path.resolve().relative_to(self.base_path).as_posix()
+        except ValueError:
+            return
+        if self.discovery.accepts(rel_path):
+            self._events.put((self.base_path / rel_path, kind))
+
+    def start(self) -> None:
+        self._observer = Observer()
+        self._observer.schedule(_EventHandler(self), str(self.base_path), recursive=True)
+        self._observer.start()
+
+    def poll(self) -> List[Change]:
+        """Events received since the last call."""
+        changes = []
+        while True:
+            try:
+                changes.append(self._events.get_nowait())
+            except queue.Empty:
+                return changes
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+
+def make_watcher(base_path: Path, discovery, force_polling: bool = False,
+                 interval: float = DEFAULT_POLL_INTERVAL):
+    """Use filesystem events when ``watchdog`` is installed, polling otherwise."""
+    if Observer is not None and not force_polling:
+        return EventWatcher(base_path, discovery)
+    return PollingWatcher(base_path, discovery, interval)
@@ -105,7 +105,13 @@ setup(
             'mypy>=1.8.0',
             'pytest-cov>=4.1.0',
             'pytest-asyncio>=0.23.0',
-        ]
+        ],
+        'zstd': [
+            'zstandard>=0.22.0',
+        ],
+        'watch': [
+            'watchdog>=3.0.0',
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,37 @@
+# tests/conftest.py
+import asyncio
+import pytest
+
+
+class FakeGenerator:
+    """Stands in for ``AIDocGenerator`` in pipeline and watch tests.
+
+    Documents every file as ``Generated docs for <name>``, records the paths
+    of each batch, and keeps the results in a dict standing in for the
+    documentation cache.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.cache = {}
+
+    async def generate_documentation_batch(self, files_data, on_result=None):
+        self.batches.append([path for path, _, _ in files_data])
+        await asyncio.sleep(0)
+        docs = {path: f"Generated docs for {path.name}" for path, _, _ in files_data}
+        for path, analysis, _ in files_data:
+            self.cache[self.doc_key(analysis["content_hash"])] = docs[path]
+            if on_result:
+                on_result(path, docs[path])
+        return docs
+
+    def doc_key(self, content_hash):
+        return f"key-{content_hash}"
+
+    def get_cached_docs(self, keys):
+        return {key: self.cache[key] for key in keys if key in self.cache}
+
+
+@pytest.fixture
+def fake_generator():
+    return FakeGenerator()
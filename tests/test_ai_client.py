@@ -0,0 +1,375 @@
+import asyncio
+import json
+import pytest
+from aiohttp import web
+from docgen.utils.ai_client import AIClient
+from docgen.utils.hashing import content_hash
+from docgen.cache.sqlite_cache import DocCache
+from docgen.utils.concurrency import AdaptiveLimiter
+from docgen.utils.rate_limiter import TokenBucket
+from docgen.utils.server_pool import ServerPool
+
+@pytest.fixture
+def client(tmp_path):
+    client = AIClient()
+    client.cache = DocCache(tmp_path / "docs.db")
+    return client
+
+def test_cache_key_covers_full_content(client):
+    header = "# Licensed under the MIT License\n" * 5
+    key_a = client._fast_cache_key(header + "def a(): pass", {})
+    key_b = client._fast_cache_key(header + "def b(): pass", {})
+    assert key_a != key_b
+
+def test_cache_key_uses_read_hash_and_prompt_type(client):
+    code = "def a(): pass"
+    analysis = {"content_hash": content_hash(code.encode("utf-8"))}
+    assert client._fast_cache_key(code, analysis) == client._fast_cache_key(code, {})
+    assert client._fast_cache_key(code, {}, "generate") != client._fast_cache_key(code, {}, "update")
+    assert (client._fast_cache_key(code, {}, "update", changes="+a") !=
+            client._fast_cache_key(code, {}, "update", changes="+b"))
+
+def test_cache_key_depends_on_model_settings(client):
+    code = "def a(): pass"
+    key = client._fast_cache_key(code, {})
+    client.model_settings = dict(client.model_settings, temperature=0.1)
+    assert client._fast_cache_key(code, {}) != key
+
+def test_generate_text_batch_keeps_request_order(client):
+    requests = [{"code": f"x = {i}", "prompt_type": "doc", "file_path": f"f{i}.py"} for i in range(4)]
+    client._save_to_cache(client._fast_cache_key("x = 1", {}), "cached 1")
+    sent = []
+
+    async def fake_batch_request(batch, on_result=None):
+        sent.extend(req["file_path"] for req in batch)
+        return [f"doc {req['file_path']}" for req in batch]
+
+    client._make_batch_request = fake_batch_request
+    results = asyncio.run(client.generate_text_batch(requests))
+
+    assert results == ["doc f0.py", "cached 1", "doc f2.py", "doc f3.py"]
+    assert sorted(sent) == ["f0.py", "f2.py", "f3.py"]
+
+def test_generate_text_batch_caches_results_in_one_write(client):
+    requests = [{"code": f"x = {i}", "prompt_type": "doc", "file_path": f"f{i}.py"} for i in range(3)]
+    writes = []
+
+    async def fake_batch_request(batch, on_result=None):
+        for req in batch:
+            on_result(req, f"doc {req['file_path']}")
+        return [f"doc {req['file_path']}" for req in batch]
+
+    client._make_batch_request = fake_batch_request
+    client._save_many_to_cache = lambda entries: writes.append(dict(entries))
+    asyncio.run(client.generate_text_batch(requests))
+
+    assert len(writes) == 1
+    assert sorted(writes[0].values()) == ["doc f0.py", "doc f1.py", "doc f2.py"]
+
+def test_pack_batches_fills_concurrency_window_largest_first(client):
+    client._rate_limiters = {url: TokenBucket(100, 1, burst=100) for url in client.base_urls}
+    sizes = [40, 4000, 400, 4000, 40, 400, 40, 4000]
+    requests = [{"code": "x" * size} for size in sizes]
+    batches = client._pack_batches(requests)
+    assert len(batches) == len(requests)  # Window (16) exceeds the request count
+    assert sorted(i for batch in batches for i in batch) == list(range(len(requests)))
+    assert [sizes[batch[0]] for batch in batches[:3]] == [4000, 4000, 4000]
+
+def test_pack_batches_are_capped_by_available_rate_limit_tokens(client):
+    requests = [{"code": "x = 1"} for _ in range(8)]
+    # One request per server may be sent right away with the default limits
+    assert len(client._pack_batches(requests)) == len(client.base_urls)
+    for bucket in client._rate_limiters.values():
+        bucket.reserve()
+    assert len(client._pack_batches(requests)) == 1
+
+def test_pack_batches_respects_token_budget_and_balances(client):
+    client.batch_token_budget = 1000
+    client._concurrency_window = lambda: 1
+    requests = [{"code": "x" * 400} for _ in range(20)]  # 100 tokens each
+    batches = client._pack_batches(requests)
+    assert len(batches) == 2
+    assert [len(batch) for batch in batches] == [10, 10]
+
+def test_pack_batches_respects_max_batch_size(client):
+    client.MAX_BATCH_SIZE = 3
+    client._concurrency_window = lambda: 1
+    batches = client._pack_batches([{"code": "x = 1"} for _ in range(7)])
+    assert all(len(batch) <= 3 for batch in batches)
+    assert sum(len(batch) for batch in batches) == 7
+
+def test_rate_limiters_are_per_server(client):
+    assert set(client._rate_limiters) == set(client.base_urls)
+    first, second = (client._rate_limiters[url] for url in client.base_urls[:2])
+    assert first is not second
+
+def test_metrics_report_concurrency_per_server(client):
+    metrics = client.metrics()
+    assert set(metrics) == set(client.base_urls)
+    assert all(m["limit"] == client.DEFAULT_INITIAL_CONCURRENCY for m in metrics.values())
+
+def test_failed_request_is_retried_on_another_server(client):
+    async def run():
+        async def failing(request):
+            return web.Response(status=503)
+
+        async def working(request):
+            return web.json_response({"text": "doc"})
+
+        runners, urls = [], []
+        for handler in (failing, working):
+            app = web.Application()
+            app.router.add_post("/api/v1/gemini/generate", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            runners.append(runner)
+            urls.append(f"http://127.0.0.1:{runner.addresses[0][1]}")
+
+        client.base_urls = urls
+        client.server_pool = ServerPool(urls)
+        client._concurrency = {url: AdaptiveLimiter() for url in urls}
+        client._rate_limiters = {url: TokenBucket(100, 1) for url in urls}
+        # Make the failing server look fastest so it is tried first
+        client.server_pool.servers[urls[1]].ewma_latency = 10.0
+        try:
+            return await client._make_request("x = 1"), client.metrics()
+        finally:
+            await client.close()
+            for runner in runners:
+                await runner.cleanup()
+
+    text, metrics = asyncio.run(run())
+    assert text == "doc"
+    failing_url, working_url = sorted(metrics, key=lambda url: metrics[url]["failures"], reverse=True)
+    assert metrics[failing_url]["failures"] == 1
+    assert metrics[working_url]["successes"] == 1
+
+def test_failed_batch_is_bisected_to_isolate_poison_file(client):
+    client.BACKOFF_BASE = 0
+    calls = []
+
+    async def fake_send_batch(batch, on_result=None):
+        paths = [req["file_path"] for req in batch]
+        calls.append(paths)
+        if "bad.py" in paths:
+            return None
+        return [f"doc {path}" for path in paths]
+
+    client._send_batch = fake_send_batch
+    batch = [{"code": "x", "file_path": path} for path in ["a.py", "b.py", "bad.py", "c.py", "d.py"]]
+    results = asyncio.run(client._make_batch_request(batch))
+
+    assert results == ["doc a.py", "doc b.py", None, "doc c.py", "doc d.py"]
+    assert calls.count(["bad.py"]) == client.MAX_BATCH_ATTEMPTS
+
+def test_rejected_batch_is_not_bisected_or_retried(client):
+    async def run():
+        calls = []
+
+        async def handler(request):
+            calls.append(len((await request.json())["files"]))
+            return web.Response(status=403)
+
+        runner, url = await _start_batch_server(handler)
+        _use_single_server(client, url)
+        try:
+            batch = [{"code": "x", "file_path": f"{i}.py"} for i in range(8)]
+            return await client._make_batch_request(batch), calls
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    results, calls = asyncio.run(run())
+    assert results == [None] * 8
+    assert calls == [8]
+
+def test_missing_results_are_retried_alone(client):
+    client.BACKOFF_BASE = 0
+    calls = []
+
+    async def fake_send_batch(batch, on_result=None):
+        paths = [req["file_path"] for req in batch]
+        calls.append(paths)
+        if len(calls) == 1:
+            return ["doc a.py", None, "doc c.py"]
+        return [f"doc {path}" for path in paths]
+
+    client._send_batch = fake_send_batch
+    batch = [{"code": "x", "file_path": path} for path in ["a.py", "b.py", "c.py"]]
+    results = asyncio.run(client._make_batch_request(batch))
+
+    assert results == ["doc a.py", "doc b.py", "doc c.py"]
+    assert calls == [["a.py", "b.py", "c.py"], ["b.py"]]
+
+def test_backoff_delay_is_jittered_and_capped(client):
+    delays = [client._backoff_delay(10) for _ in range(50)]
+    assert all(0 <= delay <= client.BACKOFF_CAP for delay in delays)
+    assert len(set(delays)) > 1
+
+async def _start_batch_server(handler):
+    app = web.Application()
+    app.router.add_post("/api/v1/gemini/generate/batch", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+def _use_single_server(client, url):
+    client.base_urls = [url]
+    client.server_pool = ServerPool([url])
+    client._concurrency = {url: AdaptiveLimiter()}
+    client._rate_limiters = {url: TokenBucket(100, 1)}
+
+def test_streamed_batch_keeps_results_received_before_timeout(client):
+    async def run():
+        async def streaming(request):
+            assert "application/x-ndjson" in request.headers["Accept"]
+            files = (await request.json())["files"]
+            response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+            await response.prepare(request)
+            for index in (1, 0):
+                line = {"index": index, "text": f"doc {files[index]['file_path']}"}
+                await response.write((json.dumps(line) + "\n").encode())
+            await asyncio.sleep(1)  # Never finishes the last file
+            return response
+
+        runner, url = await _start_batch_server(streaming)
+        _use_single_server(client, url)
+        client.batch_request_timeout = 0.3
+        arrived = []
+        batch = [{"code": "x", "file_path": path} for path in ("a.py", "b.py", "c.py")]
+        try:
+            results = await client._send_batch(batch, lambda req, text: arrived.append(req["file_path"]))
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return results, arrived
+
+    results, arrived = asyncio.run(run())
+    assert results == ["doc a.py", "doc b.py", None]
+    assert arrived == ["b.py", "a.py"]
+
+def test_plain_json_batch_response_still_supported(client):
+    async def run():
+        async def plain(request):
+            files = (await request.json())["files"]
+            return web.json_response({"texts": [f"doc {f['file_path']}" for f in files]})
+
+        runner, url = await _start_batch_server(plain)
+        _use_single_server(client, url)
+        arrived = []
+        requests = [{"code": f"x = {i}", "prompt_type": "doc", "file_path": f"f{i}.py"} for i in range(3)]
+        try:
+            results = await client.generate_text_batch(requests, on_result=lambda i, text: arrived.append(i))
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return results, arrived
+
+    results, arrived = asyncio.run(run())
+    assert results == ["doc f0.py", "doc f1.py", "doc f2.py"]
+    assert sorted(arrived) == [0, 1, 2]
+    assert client._get_cached_doc(client._fast_cache_key("x = 1", {})) == "doc f1.py"
+
+def test_identical_requests_are_sent_once_and_fanned_out(client):
+    requests = [
+        {"code": "def stub(): pass", "prompt_type": "doc", "file_path": "vendor/a/stub.py"},
+        {"code": "x = 1", "prompt_type": "doc", "file_path": "x.py"},
+        {"code": "def stub(): pass", "prompt_type": "doc", "file_path": "vendor/b/stub.py"},
+    ]
+    sent = []
+
+    async def fake_batch_request(batch, on_result=None):
+        sent.extend(req["file_path"] for req in batch)
+        return [f"doc {req['code']}" for req in batch]
+
+    client._make_batch_request = fake_batch_request
+    arrived = []
+    results = asyncio.run(client.generate_text_batch(requests, on_result=lambda i, text: arrived.append(i)))
+
+    assert results == ["doc def stub(): pass", "doc x = 1", "doc def stub(): pass"]
+    assert sorted(sent) == ["vendor/a/stub.py", "x.py"]
+    assert sorted(arrived) == [0, 1, 2]
+
+def test_request_bodies_are_not_compressed_by_default(client):
+    assert client.request_encoding is None
+
+def test_request_bodies_are_compressed(client):
+    client.request_encoding = "gzip"
+
+    async def run():
+        received = {}
+
+        async def handler(request):
+            received["encoding"] = request.headers.get("Content-Encoding")
+            received["sent_bytes"] = request.content_length
+            received["files"] = (await request.json())["files"]
+            return web.json_response({"texts": ["doc"]})
+
+        runner, url = await _start_batch_server(handler)
+        _use_single_server(client, url)
+        try:
+            await client._send_batch([{"code": "x = 1\n" * 2000, "file_path": "big.py"}])
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return received
+
+    received = asyncio.run(run())
+    assert received["encoding"] == "gzip"
+    assert received["sent_bytes"] < 1000
+    assert received["files"][0]["file_path"] == "big.py"
+
+def test_compression_is_disabled_when_server_rejects_it(client):
+    client.request_encoding = "gzip"
+    client.MAX_RETRIES = 0  # The uncompressed resend is not a retry
+
+    async def run():
+        encodings = []
+
+        async def handler(request):
+            encodings.append(request.headers.get("Content-Encoding"))
+            if request.headers.get("Content-Encoding"):
+                return web.Response(status=415)
+            return web.json_response({"texts": ["doc"]})
+
+        runner, url = await _start_batch_server(handler)
+        _use_single_server(client, url)
+        try:
+            results = await client._send_batch([{"code": "x = 1\n" * 2000, "file_path": "big.py"}])
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return results, encodings
+
+    results, encodings = asyncio.run(run())
+    assert results == ["doc"]
+    assert encodings == ["gzip", None]
+    assert client.request_encoding is None
+    health = next(iter(client.server_pool.snapshot().values()))
+    assert (health["successes"], health["failures"]) == (1, 0)
+
+def test_session_is_reused_across_batches_until_context_exits(client):
+    async def run():
+        async def plain(request):
+            files = (await request.json())["files"]
+            return web.json_response({"texts": [f"doc {f['file_path']}" for f in files]})
+
+        runner, url = await _start_batch_server(plain)
+        _use_single_server(client, url)
+        try:
+            async with client:
+                await client.generate_update_documentation_batch([("a.py", {}, "x = 1", "+x = 1")])
+                first = client._async_session
+                await client.generate_update_documentation_batch([("b.py", {}, "y = 2", "+y = 2")])
+                assert client._async_session is first and not first.closed
+            return first
+        finally:
+            await runner.cleanup()
+
+    session = asyncio.run(run())
+    assert session.closed
+    assert client._async_session is None
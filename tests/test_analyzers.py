@@ -0,0 +1,124 @@
+from pathlib import Path
+from docgen.analyzers import CodeAnalyzer
+from docgen.analyzers.parallel_analyzer import read_and_analyze
+
+def test_read_and_analyze_reads_file_once(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("value = 1\n")
+
+    result_path, analysis, source = read_and_analyze(path)
+
+    assert result_path == path
+    assert analysis["source_code"] == source == "value = 1\n"
+    assert analysis["file_path"] == str(path)
+    assert analysis["content_hash"]
+
+def test_read_and_analyze_skips_large_empty_and_binary(tmp_path):
+    large = tmp_path / "large.py"
+    large.write_text("x" * 100)
+    empty = tmp_path / "empty.py"
+    empty.write_text("   \n")
+    binary = tmp_path / "binary.py"
+    binary.write_bytes(b"\xff\xfe\x00")
+    missing = tmp_path / "missing.py"
+
+    assert [read_and_analyze(path, max_file_size=50) for path in (large, empty, binary, missing)] == [None] * 4
+
+def test_python_structure_and_spans(tmp_path):
+    path = tmp_path / "service.py"
+    path.write_text(
+        '"""Service module."""\n'
+        'import os\n'
+        'from .base import Base\n'
+        '\n'
+        'class Service(Base):\n'
+        '    """A service."""\n'
+        '\n'
+        '    @property\n'
+        '    def name(self) -> str:\n'
+        '        return os.getcwd()\n'
+        '\n'
+        'async def run(service, *args, retries: int = 3):\n'
+        '    return helper(service)\n'
+    )
+
+    result = CodeAnalyzer(path).analyze_file()
+
+    assert result["language"] == "python"
+    assert result["file_docstring"] == "Service module."
+    assert [imp["type"] for imp in result["imports"]] == ["import", "from"]
+    service = result["classes"][0]
+    assert (service["name"], service["bases"], service["line"], service["end_line"]) == ("Service", ["Base"], 5, 10)
+    assert service["methods"][0]["line"] == 8  # decorator included
+    run = result["functions"][0]
+    assert run["async"] and run["args"] == ["service", "*args", "retries: int"]
+    assert result["relationships"]["inheritance"] == [{"class": "Service", "inherits_from": "Base"}]
+    assert {"caller": "run", "called": "helper"} in result["relationships"]["function_calls"]
+
+def test_javascript_structure_and_jsdoc(tmp_path):
+    path = tmp_path / "widget.js"
+    path.write_text(
+        "import React, { useState as us } from 'react';\n"
+        "\n"
+        "/**\n"
+        " * A widget.\n"
+        " */\n"
+        "export class Widget extends React.Component {\n"
+        "  render(a, b = 2, ...rest) { return helper(a); }\n"
+        "}\n"
+        "\n"
+        "const handler = async (req) => { fetch(req); };\n"
+    )
+
+    result = CodeAnalyzer(path).analyze_file()
+
+    assert result["language"] == "javascript"
+    assert result["imports"][0]["names"] == [
+        {"name": "default", "asname": "React"}, {"name": "useState", "asname": "us"}
+    ]
+    widget = result["classes"][0]
+    assert (widget["docstring"], widget["bases"], widget["line"], widget["end_line"]) == (
+        "A widget.", ["React.Component"], 3, 8
+    )
+    assert widget["methods"][0]["args"] == ["a", "b=", "...rest"]
+    assert result["functions"][0]["name"] == "handler" and result["functions"][0]["async"]
+    assert result["relationships"]["function_calls"] == [{"caller": "handler", "called": "fetch"}]
+
+def test_java_structure_and_spans(tmp_path):
+    path = tmp_path / "Service.java"
+    path.write_text(
+        "import java.util.List;\n"
+        "\n"
+        "public class Service extends Base implements Runnable {\n"
+        "    @Override\n"
+        "    public void run() {\n"
+        "        if (ready()) { helper(List.of(1)); }\n"
+        "    }\n"
+        "\n"
+        "    /** Helper. */\n"
+        "    private List<String> helper(List<Integer> xs) { return null; }\n"
+        "}\n"
+    )
+
+    result = CodeAnalyzer(path).analyze_file()
+
+    assert result["language"] == "java"
+    assert result["imports"][0]["module"] == "java.util"
+    service = result["classes"][0]
+    assert (service["bases"], service["line"], service["end_line"]) == (["Base", "Runnable"], 3, 11)
+    run, helper = service["methods"]
+    assert (run["line"], run["end_line"]) == (4, 7)
+    assert (helper["docstring"], helper["returns"], helper["args"]) == ("Helper.", "List<String>", ["List<Integer> xs"])
+    assert {"caller": "Service.run", "called": "helper"} in result["relationships"]["function_calls"]
+
+def test_unparseable_and_unknown_files_get_empty_structure(tmp_path):
+    broken = tmp_path / "broken.py"
+    broken.write_text("def broken(:\n")
+    notes = tmp_path / "notes.txt"
+    notes.write_text("plain text\n")
+
+    for path in (broken, notes):
+        result = CodeAnalyzer(path).analyze_file()
+        assert result["language"] is None
+        assert result["classes"] == [] and result["relationships"]["function_calls"] == []
+        assert result["source_code"] == path.read_text()
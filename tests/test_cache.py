@@ -0,0 +1,170 @@
+from datetime import timedelta
+from docgen.cache.sqlite_cache import DocCache
+import docgen.cache.sqlite_cache as sqlite_cache
+
+def test_put_and_get_many(tmp_path):
+    cache = DocCache(tmp_path / "docs.db")
+    cache.put_many({"a": "doc a", "b": "doc b", "empty": ""})
+
+    assert cache.get("a") == "doc a"
+    assert cache.get_many(["a", "b", "missing"]) == {"a": "doc a", "b": "doc b"}
+    assert cache.get("empty") is None
+    assert len(cache) == 2
+
+def test_entries_persist_across_instances(tmp_path):
+    DocCache(tmp_path / "docs.db").put("key", "content")
+    assert DocCache(tmp_path / "docs.db").get("key") == "content"
+
+def test_expired_entries_are_removed(tmp_path, monkeypatch):
+    cache = DocCache(tmp_path / "docs.db", ttl=timedelta(seconds=10))
+    cache.put("key", "content")
+
+    real_time = sqlite_cache.time.time
+    monkeypatch.setattr(sqlite_cache.time, "time", lambda: real_time() + 60)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+def test_large_key_sets(tmp_path):
+    cache = DocCache(tmp_path / "docs.db")
+    cache.put_many({f"k{i}": f"v{i}" for i in range(1200)})
+    found = cache.get_many(f"k{i}" for i in range(0, 1200, 2))
+    assert len(found) == 600
+
+def test_prune_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache = DocCache(tmp_path / "docs.db", max_entries=2)
+    clock = [1000.0]
+    monkeypatch.setattr(sqlite_cache.time, "time", lambda: clock[0])
+    for key in ("a", "b", "c"):
+        clock[0] += 1
+        cache.put(key, f"doc {key}")
+    clock[0] += 1
+    cache.get("a")  # "b" is now the least recently used
+
+    assert cache.prune() == {"expired": 0, "evicted": 1}
+    assert sorted(cache.get_many(["a", "b", "c"])) == ["a", "c"]
+
+def test_reads_buffer_access_times_until_flush(tmp_path, monkeypatch):
+    cache = DocCache(tmp_path / "docs.db")
+    clock = [1000.0]
+    monkeypatch.setattr(sqlite_cache.time, "time", lambda: clock[0])
+    cache.put("a", "doc a")
+    clock[0] += 5
+    cache.get_many(["a", "missing"])
+
+    def accessed_at():
+        return cache._conn.execute("SELECT accessed_at FROM entries WHERE key = 'a'").fetchone()[0]
+
+    assert accessed_at() == 1000.0  # the lookup itself wrote nothing
+    assert cache.stats()["hits"] == 1
+    assert accessed_at() == 1005.0
+    cache.close()
+    cache.close()
+
+def test_caches_share_one_exit_hook(tmp_path):
+    caches = [DocCache(tmp_path / f"docs{i}.db") for i in range(3)]
+    assert set(caches) <= set(sqlite_cache._open_caches)
+    for cache in caches:
+        cache.close()
+    assert not set(caches) & set(sqlite_cache._open_caches)
+
+def test_prune_enforces_byte_limit(tmp_path):
+    cache = DocCache(tmp_path / "docs.db", max_bytes=25)
+    cache.put_many({f"k{i}": "x" * 10 for i in range(5)})
+    cache.prune()
+    assert cache.stats()["bytes"] <= 25
+
+def test_stats_and_export(tmp_path):
+    cache = DocCache(tmp_path / "docs.db")
+    cache.put_many({"a": "doc a", "b": "doc b"})
+    cache.get_many(["a", "missing"])
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["age_distribution"]["< 1 hour"] == 2
+
+    assert cache.export(tmp_path / "export.jsonl") == 2
+    assert len((tmp_path / "export.jsonl").read_text().splitlines()) == 2
+
+def test_memory_lru_evicts_and_counts():
+    from docgen.cache.memory_cache import MemoryLRU
+    memory = MemoryLRU(max_entries=2)
+    memory.put("a", "doc a")
+    memory.put("b", "doc b")
+    assert memory.get("a") == "doc a"
+    memory.put("c", "doc c")  # evicts "b"
+
+    assert memory.get("b") is None
+    assert memory.get("c") == "doc c"
+    assert memory.stats()["hits"] == 2
+    assert memory.stats()["misses"] == 1
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    from docgen.cache.memory_cache import TieredCache
+    disk = DocCache(tmp_path / "docs.db")
+    disk.put("a", "doc a")
+    cache = TieredCache(disk)
+
+    assert cache.get_many(["a", "b"]) == {"a": "doc a"}
+    assert cache.memory.get("a") == "doc a"
+
+    cache.put_many({"b": "doc b"})
+    assert disk.get("b") == "doc b"
+    assert cache.get("b") == "doc b"
+    assert disk.stats()["hits"] == 2  # "b" was served from memory
+
+def test_tiered_cache_memory_hits_refresh_disk_lru(tmp_path, monkeypatch):
+    from docgen.cache.memory_cache import TieredCache
+    disk = DocCache(tmp_path / "docs.db", max_entries=2)
+    clock = [1000.0]
+    monkeypatch.setattr(sqlite_cache.time, "time", lambda: clock[0])
+    cache = TieredCache(disk)
+    for key in ("a", "b"):
+        clock[0] += 1
+        cache.put(key, f"doc {key}")
+    clock[0] += 1
+    assert cache.get("a") == "doc a"  # served from memory
+
+    clock[0] += 1
+    disk.put("c", "doc c")
+    assert disk.prune()["evicted"] == 1
+    assert sorted(disk.get_many(["a", "b", "c"])) == ["a", "c"]
+
+def test_shared_directory_cache(tmp_path):
+    from docgen.cache.backends import SharedDirectoryCache
+    shared = SharedDirectoryCache(tmp_path / "shared")
+    shared.put_many({"ab12": "doc", "cd34": ""})
+    assert SharedDirectoryCache(tmp_path / "shared").get_many(["ab12", "cd34"]) == {"ab12": "doc"}
+
+def test_read_through_http_cache(tmp_path):
+    import threading
+    from docgen.cache.backends import HTTPCache, ReadThroughCache
+    from docgen.cache.server import make_server
+
+    server = make_server(tmp_path / "remote", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = server.url
+        assert url.startswith("http://127.0.0.1:") and not url.endswith(":0")
+        key = "0123456789abcdef0123"
+
+        # One machine generates documentation...
+        writer = ReadThroughCache(DocCache(tmp_path / "a.db"), HTTPCache(url))
+        writer.put(key, "shared doc ✓")
+
+        # ...and another gets it from the remote, then locally
+        local = DocCache(tmp_path / "b.db")
+        reader = ReadThroughCache(local, HTTPCache(url))
+        assert reader.get_many([key, "ffffffffffffffff"]) == {key: "shared doc ✓"}
+        assert local.get(key) == "shared doc ✓"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_http_cache_treats_unreachable_server_as_miss():
+    from docgen.cache.backends import HTTPCache
+    cache = HTTPCache("http://127.0.0.1:9", timeout=0.5)
+    assert cache.get_many(["0123456789abcdef"]) == {}
+    cache.put("0123456789abcdef", "doc")  # must not raise
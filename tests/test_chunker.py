@@ -0,0 +1,194 @@
+import asyncio
+from pathlib import Path
+from docgen.analyzers import CodeAnalyzer
+from docgen.analyzers.chunker import (
+    MODULE_CHUNK, MISSING_SYMBOL_DOC, chunk_file, missing_symbols, reassemble, should_chunk, split_symbol_docs
+)
+from docgen.generators.ai_doc_generator import AIDocGenerator
+
+SOURCE = '''import os
+from typing import List
+
+LIMIT = 10
+
+def small(x):
+    return x + 1
+
+class Big:
+    """A large class."""
+    size = 3
+
+    def first(self):
+{first_body}
+    def second(self):
+        return os.getcwd()
+'''
+
+def _analyze(tmp_path, source, name="big.py"):
+    path = tmp_path / name
+    path.write_text(source)
+    return path, CodeAnalyzer(path).analyze_file()
+
+def test_chunks_follow_symbols_with_shared_header(tmp_path):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+
+    chunks = chunk_file(path, analysis, source, max_tokens=1000)
+
+    assert [c.name for c in chunks] == [MODULE_CHUNK, "small", "Big"]
+    assert "LIMIT = 10" in chunks[0].source and "def small" not in chunks[0].source
+    assert all(c.header.startswith("# File: big.py\nimport os\nfrom typing import List") for c in chunks)
+    assert chunks[1].code.endswith(chunks[1].source)
+
+def test_large_classes_split_into_methods(tmp_path):
+    source = SOURCE.format(first_body="".join(f"        value_{i} = {i}\n" for i in range(40)) + "        return value_0\n")
+    path, analysis = _analyze(tmp_path, source)
+
+    chunks = chunk_file(path, analysis, source, max_tokens=100)
+
+    names = [c.name for c in chunks]
+    assert "Big" in names and "Big.second" in names
+    assert any(name.startswith("Big.first (part") for name in names)
+    second = chunks[names.index("Big.second")]
+    assert "class Big:" in second.header and second.source.lstrip().startswith("def second")
+    # Every line of the file ends up in exactly one chunk
+    covered = sorted(line for c in chunks for line in c.source.splitlines(keepends=True))
+    assert covered == sorted(source.splitlines(keepends=True))
+
+def test_chunk_keys_ignore_context_changes(tmp_path):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+    changed = "import sys\n" + source
+    _, changed_analysis = _analyze(tmp_path, changed, "changed.py")
+
+    before = {c.name: c.key for c in chunk_file(path, analysis, source, max_tokens=1000)}
+    after = {c.name: c.key for c in chunk_file(path, changed_analysis, changed, max_tokens=1000)}
+
+    assert before["small"] == after["small"] and before["Big"] == after["Big"]
+    assert before[MODULE_CHUNK] != after[MODULE_CHUNK]
+
+def test_unstructured_files_split_by_lines(tmp_path):
+    source = "".join(f"line {i}\n" for i in range(100))
+    path, analysis = _analyze(tmp_path, source, "notes.txt")
+
+    chunks = chunk_file(path, analysis, source, max_tokens=50)
+
+    assert len(chunks) > 1 and "".join(c.source for c in chunks) == source
+
+def test_generator_documents_large_files_per_symbol(tmp_path, monkeypatch):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+    generator = AIDocGenerator()
+    generator.chunk_tokens = 20
+    assert should_chunk(source, generator.chunk_tokens)
+    sent = []
+
+    async def fake_generate_text_batch(requests, on_result=None):
+        sent.extend(requests)
+        results = [f"doc {i}" for i in range(len(requests))]
+        for i, text in enumerate(results):
+            on_result(i, text)
+        return results
+
+    monkeypatch.setattr(generator.ai_client, "generate_text_batch", fake_generate_text_batch)
+    docs = asyncio.run(generator.generate_documentation_batch([(path, analysis, source)]))
+
+    assert len(sent) > 1 and all(req["code"].startswith("# File: big.py") for req in sent)
+    chunks = chunk_file(path, analysis, source, max_tokens=20)
+    assert docs[path] == reassemble(chunks, [f"doc {i}" for i in range(len(chunks))])
+
+def test_update_regenerates_only_touched_symbols(tmp_path, monkeypatch):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+    generator = AIDocGenerator()
+    generator.chunk_tokens = 20
+    chunks = chunk_file(path, analysis, source, max_tokens=20)
+    existing = reassemble(chunks, [f"old {c.name}" for c in chunks])
+    line = source.splitlines().index("        return os.getcwd()") + 1
+    patch = f"@@ -{line},1 +{line},1 @@\n-        return os.getcwd()\n+        return os.getcwd()  # changed\n"
+    sent = []
+
+    async def fake_generate_text_batch(requests, on_result=None):
+        sent.extend(requests)
+        return ["new doc"] * len(requests)
+
+    monkeypatch.setattr(generator.ai_client, "generate_text_batch", fake_generate_text_batch)
+    docs = asyncio.run(generator.generate_update_documentation_batch(
+        [(path, analysis, source, patch)], {path: existing}
+    ))
+
+    touched = [c for c in chunks if c.touches([(line, line)])]
+    assert len(sent) == len(touched) == 1
+    assert docs[path] == reassemble(chunks, ["new doc" if c in touched else f"old {c.name}" for c in chunks])
+
+def test_incremental_update_describes_touched_symbols(tmp_path, monkeypatch):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+    generator = AIDocGenerator()
+    generator.chunk_tokens = 20
+    chunks = chunk_file(path, analysis, source, max_tokens=20)
+    line = source.splitlines().index("        return os.getcwd()") + 1
+    patch = f"@@ -{line},1 +{line},1 @@\n-        return os.getcwd()\n+        return os.getcwd()  # changed\n"
+    sent = []
+
+    async def fake_generate_text_batch(requests, on_result=None):
+        sent.extend(requests)
+        return ["what changed"] * len(requests)
+
+    monkeypatch.setattr(generator.ai_client, "generate_text_batch", fake_generate_text_batch)
+    docs = asyncio.run(generator.generate_update_documentation_batch([(path, analysis, source, patch)]))
+
+    touched = [c for c in chunks if c.touches([(line, line)])]
+    assert [(req["prompt_type"], req["changes"]) for req in sent] == [("update", patch)]
+    assert docs[path] == reassemble(touched, ["what changed"])
+
+def test_update_regenerates_placeholders_and_hunkless_changes(tmp_path, monkeypatch):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+    generator = AIDocGenerator()
+    generator.chunk_tokens = 20
+    chunks = chunk_file(path, analysis, source, max_tokens=20)
+    existing = reassemble(chunks, [None] + [f"old {c.name}" for c in chunks[1:]])
+    line = source.splitlines().index("        return os.getcwd()") + 1
+    patch = f"@@ -{line},1 +{line},1 @@\n-        return os.getcwd()\n+        return os.getcwd()  # changed\n"
+    sent = []
+
+    async def fake_generate_text_batch(requests, on_result=None):
+        sent.append(len(requests))
+        return ["new doc"] * len(requests)
+
+    monkeypatch.setattr(generator.ai_client, "generate_text_batch", fake_generate_text_batch)
+    asyncio.run(generator.generate_update_documentation_batch([(path, analysis, source, patch)], {path: existing}))
+    # Pending and untracked files carry their content without hunk headers
+    asyncio.run(generator.generate_update_documentation_batch(
+        [(path, analysis, source, f"+++ {path}\n{source}")], {path: existing}
+    ))
+
+    assert MODULE_CHUNK not in split_symbol_docs(existing)
+    assert sent == [2, len(chunks)]
+
+def test_update_reports_symbols_that_failed(tmp_path, monkeypatch):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+    generator = AIDocGenerator()
+    generator.chunk_tokens = 20
+
+    async def fake_generate_text_batch(requests, on_result=None):
+        return [None] + ["new doc"] * (len(requests) - 1)
+
+    monkeypatch.setattr(generator.ai_client, "generate_text_batch", fake_generate_text_batch)
+    docs = asyncio.run(generator.generate_update_documentation_batch([(path, analysis, source, f"+++ {path}\n{source}")]))
+
+    assert MISSING_SYMBOL_DOC in docs[path]
+    assert missing_symbols(docs[path]) == [MODULE_CHUNK]
+
+def test_split_symbol_docs_ignores_headings_inside_docs(tmp_path):
+    source = SOURCE.format(first_body="        return 1\n")
+    path, analysis = _analyze(tmp_path, source)
+    chunks = chunk_file(path, analysis, source, max_tokens=20)
+    docs = [f"Intro\n\n### `helper`\n\nDetails for {c.name}" for c in chunks]
+
+    split = split_symbol_docs(reassemble(chunks, docs))
+
+    assert list(split) == [c.name for c in chunks]
+    assert split[MODULE_CHUNK] == f"Intro\n\n### `helper`\n\nDetails for {MODULE_CHUNK}"
@@ -1,6 +1,9 @@
 # tests/test_cli.py
 from typer.testing import CliRunner
-from docgen.cli import app
+from pathlib import Path
+from docgen.cli import app, _is_documented, update_existing_documentation
+from docgen.analyzers.chunker import reassemble, SymbolChunk
+from docgen.generators.doc_writer import DocumentWriter, parse_sections
 import pytest
 
 runner = CliRunner()
@@ -22,3 +25,56 @@ def test_cli_analyze_valid(tmp_path):
     result = runner.invoke(app, ["analyze", str(test_file)])
     assert result.exit_code == 0
     assert "Analysis complete" in result.stdout
+
+def test_update_existing_documentation_moves_and_removes_sections(tmp_path):
+    doc_file = tmp_path / "codebase_documentation.md"
+    writer = DocumentWriter(doc_file, "Codebase")
+    for name in ("gone.py", "keep.py", "old.py"):
+        writer.add_section(name, f"Docs for {name}")
+    writer.finalize(["gone.py", "keep.py", "old.py"])
+
+    update_existing_documentation(
+        doc_file, {Path("keep.py"): "New docs"}, [Path("keep.py")],
+        renamed={Path("old.py"): Path("new.py")}, deleted=[Path("gone.py")]
+    )
+
+    sections = parse_sections(doc_file.read_text())
+    assert sections == {"keep.py": "New docs", "new.py": "Docs for old.py"}
+
+def test_update_existing_documentation_removes_sections_with_inner_headings(tmp_path):
+    doc_file = tmp_path / "codebase_documentation.md"
+    writer = DocumentWriter(doc_file, "Codebase")
+    writer.add_section("gone.py", "Intro\n\n## Overview\n\nDetails\n\n---\n\nMore")
+    writer.add_section("keep.py", "Docs for keep.py")
+    writer.add_section("old.py", "Docs for old.py")
+    writer.finalize(["gone.py", "keep.py", "old.py"])
+
+    update_existing_documentation(
+        doc_file, {}, [], renamed={Path("old.py"): Path("new.py")}, deleted=[Path("gone.py")]
+    )
+
+    text = doc_file.read_text()
+    assert parse_sections(text) == {"keep.py": "Docs for keep.py", "new.py": "Docs for old.py"}
+    assert "gone" not in text and "Details" not in text
+    assert "- [old.py]" not in text and "- [new.py]" in text
+
+def test_updates_with_undocumented_symbols_are_not_documented():
+    chunks = [SymbolChunk("a", "function", 1, 2, "def a(): pass"), SymbolChunk("b", "function", 3, 4, "def b(): pass")]
+
+    assert _is_documented("Docs")
+    assert _is_documented(reassemble(chunks, ["Docs for a", "Docs for b"]))
+    assert not _is_documented("Error: Failed to generate documentation")
+    assert not _is_documented(reassemble(chunks, ["Docs for a", None]))
+
+def test_clean_skips_ignored_directories(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".gitignore").write_text("vendor/\n")
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "notes.md").write_text("keep")
+    (tmp_path / "codebase_documentation.md").write_text("docs")
+
+    result = runner.invoke(app, ["clean"])
+
+    assert result.exit_code == 0
+    assert not (tmp_path / "codebase_documentation.md").exists()
+    assert (tmp_path / "vendor" / "notes.md").exists()
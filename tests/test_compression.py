@@ -0,0 +1,15 @@
+import gzip
+from docgen.utils import compression
+from docgen.utils.compression import compress, resolve_encoding
+
+def test_resolve_encoding():
+    assert resolve_encoding(None) is None
+    assert resolve_encoding("none") is None
+    assert resolve_encoding("gzip") == "gzip"
+    expected = "zstd" if compression.zstandard is not None else "gzip"
+    assert resolve_encoding("zstd") == expected
+
+def test_gzip_round_trip():
+    data = b'{"code": "x = 1"}' * 100
+    assert gzip.decompress(compress(data, "gzip")) == data
+    assert compress(data, None) == data
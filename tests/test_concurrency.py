@@ -0,0 +1,64 @@
+import asyncio
+from docgen.utils.concurrency import AdaptiveLimiter
+
+def test_limit_grows_while_fully_used_and_healthy():
+    limiter = AdaptiveLimiter(initial=2, max_limit=4)
+
+    async def run():
+        for _ in range(20):
+            starts = [await limiter.acquire() for _ in range(int(limiter.limit))]
+            for started in starts:
+                await limiter.release(started, 'success')
+
+    asyncio.run(run())
+    assert limiter.limit == 4
+    assert limiter.successes > 0
+
+def test_overload_halves_limit_once_per_round():
+    limiter = AdaptiveLimiter(initial=8)
+
+    async def run():
+        starts = [await limiter.acquire() for _ in range(4)]
+        for started in starts:
+            await limiter.release(started, 'overload')
+
+    asyncio.run(run())
+    assert int(limiter.limit) == 4
+    assert limiter.overloads == 4
+
+def test_limit_never_drops_below_minimum():
+    limiter = AdaptiveLimiter(initial=2, min_limit=1)
+
+    async def run():
+        for _ in range(5):
+            await limiter.release(await limiter.acquire(), 'overload')
+
+    asyncio.run(run())
+    assert limiter.limit == 1
+
+def test_errors_do_not_change_limit():
+    limiter = AdaptiveLimiter(initial=3)
+
+    async def run():
+        await limiter.release(await limiter.acquire(), 'error')
+
+    asyncio.run(run())
+    assert limiter.limit == 3
+    assert limiter.snapshot()["errors"] == 1
+
+def test_acquire_waits_for_free_slot():
+    limiter = AdaptiveLimiter(initial=1)
+    order = []
+
+    async def worker(name):
+        started = await limiter.acquire()
+        order.append(f"start {name}")
+        await asyncio.sleep(0.01)
+        order.append(f"end {name}")
+        await limiter.release(started)
+
+    async def run():
+        await asyncio.gather(worker("a"), worker("b"))
+
+    asyncio.run(run())
+    assert order == ["start a", "end a", "start b", "end b"]
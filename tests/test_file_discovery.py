@@ -0,0 +1,44 @@
+from docgen.utils.file_discovery import FileDiscovery
+from pathlib import Path
+
+def _touch(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x = 1")
+
+def test_discovery_prunes_excluded_dirs(tmp_path):
+    _touch(tmp_path / "main.py")
+    _touch(tmp_path / "pkg" / "module.py")
+    _touch(tmp_path / "node_modules" / "lib" / "index.js")
+    _touch(tmp_path / ".git" / "hooks" / "hook.py")
+    _touch(tmp_path / "venv" / "lib" / "site.py")
+    _touch(tmp_path / "docgen_cli.egg-info" / "setup.py")
+    _touch(tmp_path / "notes.txt")
+
+    files = FileDiscovery().find_files(tmp_path)
+    rel = sorted(f.relative_to(tmp_path).as_posix() for f in files)
+
+    assert rel == ["main.py", "pkg/module.py"]
+
+def test_discovery_non_recursive(tmp_path):
+    _touch(tmp_path / "main.py")
+    _touch(tmp_path / "pkg" / "module.py")
+
+    files = FileDiscovery().find_files(tmp_path, recursive=False)
+    assert [f.name for f in files] == ["main.py"]
+
+def test_discovery_matches_multi_part_extensions():
+    discovery = FileDiscovery(extensions=[".d.ts"])
+    assert discovery.matches("types.d.ts")
+    assert not discovery.matches("types.ts")
+
+def test_discovery_yields_each_file_once(tmp_path):
+    _touch(tmp_path / "types.d.ts")
+    files = FileDiscovery().find_files(tmp_path)
+    assert len(files) == 1
+
+def test_discovery_accepts_matches_iter_files():
+    discovery = FileDiscovery()
+    assert discovery.accepts("pkg/module.py")
+    assert not discovery.accepts("node_modules/lib/index.js")
+    assert not discovery.accepts(".docgen/file_index.db")
+    assert not discovery.accepts("notes.txt")
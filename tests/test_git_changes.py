@@ -0,0 +1,46 @@
+from git import Repo
+from docgen.utils.git_changes import GitChangeDetector, parse_raw_diff, split_patches
+
+SHA = "1" * 40
+
+def test_parse_raw_diff_handles_renames_and_work_tree_files():
+    output = (
+        f":100644 100644 {'2' * 40} {SHA} R090\0old name.py\0new name.py\0"
+        f":100644 100644 {'3' * 40} {'0' * 40} M\0edited.py\0"
+    ).encode()
+    first, second = parse_raw_diff(output)
+    assert (first.status, first.old_path, first.path, first.blob) == ("R", "old name.py", "new name.py", SHA)
+    assert (second.status, second.path, second.blob) == ("M", "edited.py", None)
+
+def test_split_patches_keys_hunks_by_new_path():
+    output = (
+        b"diff --git a/a.py b/a.py\nindex 1..2 100644\n--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-x\n+y\n"
+        b"diff --git a/old.py b/new.py\nsimilarity index 100%\nrename from old.py\nrename to new.py\n"
+        b"diff --git a/gone.py b/gone.py\n--- a/gone.py\n+++ /dev/null\n@@ -1 +0,0 @@\n-z\n"
+    )
+    assert split_patches(output) == {"a.py": "@@ -1 +1 @@\n-x\n+y\n", "new.py": ""}
+
+def test_detector_filters_extensions_and_reads_blobs(tmp_path):
+    repo = Repo.init(tmp_path)
+    repo.config_writer().set_value("user", "name", "Test").set_value("user", "email", "test@example.com").release()
+    (tmp_path / "app.py").write_text("a = 1\n")
+    (tmp_path / "notes.txt").write_text("one\n")
+    repo.git.add(A=True)
+    repo.git.commit(m="initial")
+    base = repo.head.commit.hexsha
+
+    (tmp_path / "app.py").write_text("a = 2\n")
+    (tmp_path / "notes.txt").write_text("two\n")
+    (tmp_path / "staged.py").write_text("s = 1\n")
+    repo.git.add("staged.py")
+    (tmp_path / "untracked.py").write_text("u = 1\n")
+    (tmp_path / "untracked.txt").write_text("u\n")
+
+    detector = GitChangeDetector(tmp_path, [".py"])
+    entries = {entry.path: entry for entry in detector.changed_paths(base)}
+
+    assert sorted(entries) == ["app.py", "staged.py"]
+    assert entries["app.py"].blob is None  # unstaged edit: read from the work tree
+    assert detector.read_blobs([entries["staged.py"].blob]) == {entries["staged.py"].blob: b"s = 1\n"}
+    assert detector.patches(base, [entries["app.py"]])["app.py"].endswith("-a = 1\n+a = 2\n")
+    assert detector.untracked_files() == ["untracked.py"]
@@ -1,6 +1,9 @@
 import pytest
 from unittest.mock import Mock, patch
-from docgen.utils.git_utils import GitAnalyzer
+from git import Repo
+from docgen.utils.git_utils import GitAnalyzer, changed_line_ranges
+from docgen.utils.file_discovery import FileDiscovery
+from docgen.utils.ignore_matcher import IgnoreMatcher
 from pathlib import Path
 
 @pytest.fixture
@@ -66,4 +69,102 @@ def test_error_handling(mock_repo):
     with pytest.raises(ValueError) as exc_info:
         analyzer.get_pr_changes(123)
     
-    assert "Error analyzing PR #123" in str(exc_info.value)
\ No newline at end of file
+    assert "Error analyzing PR #123" in str(exc_info.value)
+
+def test_changed_line_ranges_ignore_context():
+    patch = (
+        "--- a/app.py\n+++ b/app.py\n"
+        "@@ -1,5 +1,6 @@\n a\n-b\n+B\n+C\n c\n d\n"
+        "@@ -20,4 +21,3 @@\n x\n-y\n z\n"
+        "\\ No newline at end of file\n"
+    )
+    # Replaced lines 2-3, then a deletion between new lines 21 and 22
+    assert changed_line_ranges(patch) == [(2, 3), (21, 22)]
+    assert changed_line_ranges("+++ new.py\nprint(1)\n") == []
+
+
+def _commit(repo, message):
+    repo.git.add(A=True)
+    repo.git.commit(m=message, author="Test <test@example.com>")
+
+def test_changes_since_last_documented_commit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    repo = Repo.init(tmp_path)
+    repo.config_writer().set_value("user", "name", "Test").set_value("user", "email", "test@example.com").release()
+    (tmp_path / "keep.py").write_text("x = 1\n")
+    (tmp_path / "gone.py").write_text("y = 1\n")
+    (tmp_path / "old_name.py").write_text("z = 1\n")
+    _commit(repo, "initial")
+
+    analyzer = GitAnalyzer()
+    analyzer.update_last_documented_state()
+
+    # Committed changes after the documented commit are still picked up
+    (tmp_path / "keep.py").write_text("x = 2\n")
+    (tmp_path / "gone.py").unlink()
+    repo.git.mv("old_name.py", "new_name.py")
+    _commit(repo, "edit")
+    (tmp_path / "fresh.py").write_text("w = 1\n")
+
+    changed = analyzer.get_changed_files()
+    assert {path: info["type"] for path, info in changed.items()} == {
+        Path("keep.py"): "modified",
+        Path("gone.py"): "deleted",
+        Path("new_name.py"): "renamed",
+        Path("fresh.py"): "new",
+    }
+    assert changed[Path("new_name.py")]["old_path"] == Path("old_name.py")
+    assert "+x = 2" in changed[Path("keep.py")]["changes"]
+
+    # Documented content is skipped on the next run, even if still uncommitted
+    analyzer.update_last_documented_state(
+        {path: info["content_hash"] for path, info in changed.items() if info["content_hash"]},
+        removed=[Path("gone.py"), Path("old_name.py")]
+    )
+    assert analyzer.get_changed_files() == {}
+    (tmp_path / "fresh.py").write_text("w = 2\n")
+    assert list(analyzer.get_changed_files()) == [Path("fresh.py")]
+
+def test_failed_files_are_retried_after_the_base_moves(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    repo = Repo.init(tmp_path)
+    repo.config_writer().set_value("user", "name", "Test").set_value("user", "email", "test@example.com").release()
+    (tmp_path / "ok.py").write_text("x = 1\n")
+    (tmp_path / "bad.py").write_text("y = 1\n")
+    _commit(repo, "initial")
+    analyzer = GitAnalyzer()
+    analyzer.update_last_documented_state()
+
+    (tmp_path / "ok.py").write_text("x = 2\n")
+    (tmp_path / "bad.py").write_text("y = 2\n")
+    _commit(repo, "edit")
+    changed = analyzer.get_changed_files()
+    analyzer.update_last_documented_state(
+        {Path("ok.py"): changed[Path("ok.py")]["content_hash"]}, failed=[Path("bad.py")]
+    )
+
+    # The base is now HEAD, but the failed file still comes back
+    changed = analyzer.get_changed_files()
+    assert list(changed) == [Path("bad.py")]
+    assert "y = 2" in changed[Path("bad.py")]["full_code"]
+
+    analyzer.update_last_documented_state({Path("bad.py"): changed[Path("bad.py")]["content_hash"]})
+    assert analyzer.get_changed_files() == {}
+
+def test_changed_files_follow_the_ignore_rules(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    repo = Repo.init(tmp_path)
+    repo.config_writer().set_value("user", "name", "Test").set_value("user", "email", "test@example.com").release()
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "app.py").write_text("x = 1\n")
+    (tmp_path / "tests" / "test_app.py").write_text("y = 1\n")
+    _commit(repo, "initial")
+    analyzer = GitAnalyzer(FileDiscovery(matcher=IgnoreMatcher(tmp_path, ["**/tests/**"])))
+    analyzer.update_last_documented_state()
+
+    (tmp_path / "app.py").write_text("x = 2\n")
+    (tmp_path / "tests" / "test_app.py").write_text("y = 2\n")
+    (tmp_path / "tests" / "test_new.py").write_text("z = 1\n")
+    (tmp_path / "new.py").write_text("w = 1\n")
+
+    assert set(analyzer.get_changed_files()) == {Path("app.py"), Path("new.py")}
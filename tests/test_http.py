@@ -0,0 +1,8 @@
+from docgen.utils.http import create_session, get_session
+
+def test_session_is_pooled_for_http_and_https():
+    session = create_session(pool_size=4)
+    assert session.get_adapter("https://api1.docgen.dev") is session.get_adapter("http://localhost")
+
+def test_get_session_is_shared():
+    assert get_session() is get_session()
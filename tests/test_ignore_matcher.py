@@ -0,0 +1,56 @@
+from docgen.utils.ignore_matcher import IgnoreMatcher
+from docgen.utils.file_discovery import FileDiscovery
+from pathlib import Path
+
+def _touch(path: Path, content: str = "x = 1"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+def test_builtin_excludes(tmp_path):
+    matcher = IgnoreMatcher(tmp_path)
+    assert matcher.is_ignored(tmp_path / "node_modules" / "a.js")
+    assert matcher.is_ignored(tmp_path / "pkg.egg-info" / "a.py")
+    assert matcher.is_ignored(tmp_path / ".hidden" / "a.py")
+    assert not matcher.is_ignored(tmp_path / "environment.py")
+    assert not matcher.is_ignored(tmp_path / "src" / "build_utils.py")
+
+def test_config_patterns(tmp_path):
+    matcher = IgnoreMatcher(tmp_path, ["**/tests/**", "*.min.js"])
+    assert matcher.is_ignored(tmp_path / "pkg" / "tests" / "test_a.py")
+    assert matcher.matches("pkg/tests", is_dir=True)
+    assert matcher.is_ignored(tmp_path / "static" / "app.min.js")
+    assert not matcher.is_ignored(tmp_path / "static" / "app.js")
+
+def test_malformed_patterns_are_skipped(tmp_path):
+    _touch(tmp_path / ".gitignore", "[z-a].py\n[\\w]x.js\n[]]y.js\n[!a]z.js\nskip.py\n")
+    matcher = IgnoreMatcher(tmp_path)
+
+    assert matcher.is_ignored(tmp_path / "skip.py")
+    assert not matcher.is_ignored(tmp_path / "m.py")
+    assert matcher.is_ignored(tmp_path / "\\x.js")
+    assert not matcher.is_ignored(tmp_path / "ax.js")
+    assert matcher.is_ignored(tmp_path / "]y.js")
+    assert matcher.is_ignored(tmp_path / "bz.js")
+    assert not matcher.is_ignored(tmp_path / "az.js")
+
+def test_gitignore_and_negation(tmp_path):
+    _touch(tmp_path / ".gitignore", "generated/\n*.py\n!keep.py\n/root_only.js\n")
+    _touch(tmp_path / "sub" / ".gitignore", "local.js\n")
+    matcher = IgnoreMatcher(tmp_path)
+
+    assert matcher.is_ignored(tmp_path / "generated" / "a.js")
+    assert matcher.is_ignored(tmp_path / "a.py")
+    assert not matcher.is_ignored(tmp_path / "keep.py")
+    assert matcher.is_ignored(tmp_path / "root_only.js")
+    assert not matcher.is_ignored(tmp_path / "sub" / "root_only.js")
+    assert matcher.is_ignored(tmp_path / "sub" / "local.js")
+    assert not matcher.is_ignored(tmp_path / "local.js")
+
+def test_docgenignore_with_discovery(tmp_path):
+    _touch(tmp_path / ".docgenignore", "migrations/\n")
+    _touch(tmp_path / "app" / "models.py")
+    _touch(tmp_path / "app" / "migrations" / "0001_initial.py")
+
+    discovery = FileDiscovery(matcher=IgnoreMatcher(tmp_path))
+    files = discovery.find_files(tmp_path)
+    assert [f.relative_to(tmp_path).as_posix() for f in files] == ["app/models.py"]
@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+from pathlib import Path
+from docgen.generators.doc_writer import DocumentWriter, parse_sections
+from docgen.generators.pipeline import GenerationPipeline
+from docgen.utils.file_discovery import FileDiscovery
+
+def test_pipeline_streams_sections_in_path_order(tmp_path, fake_generator):
+    for i in range(25):
+        (tmp_path / f"mod_{i:02d}.py").write_text(f"x = {i}\n")
+    (tmp_path / "empty.py").write_text("")
+
+    generator = fake_generator
+    output = tmp_path / "out" / "codebase_documentation.md"
+    writer = DocumentWriter(output, "Codebase")
+    pipeline = GenerationPipeline(generator, FileDiscovery(), tmp_path,
+                                  batch_size=10, analysis_workers=3)
+
+    stats = asyncio.run(pipeline.run(writer))
+    writer.finalize(str(p.relative_to(tmp_path)) for p in sorted(stats.discovered))
+
+    assert len(stats.discovered) == 26
+    assert stats.processed == 25
+    assert stats.documented == 25
+    assert all(len(batch) <= 10 for batch in generator.batches)
+
+    content = output.read_text()
+    assert content.startswith("# Codebase Documentation\n")
+    assert content.index("## mod_00.py") < content.index("## mod_24.py")
+    assert "Generated docs for mod_13.py" in content
+    # Files without a result keep the failure placeholder
+    assert "## empty.py\n\nError: Documentation generation failed" in content
+
+def test_pipeline_propagates_generation_errors(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+
+    class FailingGenerator:
+        async def generate_documentation_batch(self, files_data, on_result=None):
+            raise RuntimeError("boom")
+
+    writer = DocumentWriter(tmp_path / "out.md", "Codebase")
+    pipeline = GenerationPipeline(FailingGenerator(), FileDiscovery(), tmp_path, analysis_workers=2)
+    try:
+        asyncio.run(pipeline.run(writer))
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert "boom" in str(e)
+    finally:
+        writer.close()
+
+def test_pipeline_raises_errors_of_batches_that_finished_early(tmp_path, fake_generator):
+    for i in range(3):
+        (tmp_path / f"mod_{i}.py").write_text(f"x = {i}\n")
+    generate = fake_generator.generate_documentation_batch
+
+    async def first_batch_fails(files_data, on_result=None):
+        if not fake_generator.batches:
+            fake_generator.batches.append(None)
+            raise RuntimeError("first batch failed")
+        await asyncio.sleep(0.05)
+        return await generate(files_data, on_result)
+
+    fake_generator.generate_documentation_batch = first_batch_fails
+    writer = DocumentWriter(tmp_path / "out.md", "Codebase")
+    pipeline = GenerationPipeline(fake_generator, FileDiscovery(), tmp_path,
+                                  batch_size=1, batch_linger=0.01, analysis_workers=1)
+    with pytest.raises(RuntimeError, match="first batch failed"):
+        asyncio.run(pipeline.run(writer))
+    writer.close()
+
+def test_parse_sections_reads_back_finalized_document(tmp_path):
+    writer = DocumentWriter(tmp_path / "docs.md", "Codebase")
+    writer.add_section("pkg/a.py", "Docs for a\n\n### `f`\n\nf docs")
+    writer.add_section("b.py", "Docs for b")
+    writer.finalize(["b.py", "pkg/a.py"])
+
+    sections = parse_sections((tmp_path / "docs.md").read_text())
+    assert sections == {"b.py": "Docs for b", "pkg/a.py": "Docs for a\n\n### `f`\n\nf docs"}
+
+def test_file_index_skips_unchanged_files(tmp_path, monkeypatch, fake_generator):
+    from docgen.cache.file_index import FileIndex
+    from docgen.generators import pipeline as pipeline_module
+
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(5):
+        (src / f"mod_{i}.py").write_text(f"x = {i}\n")
+    generator = fake_generator
+    index = FileIndex(tmp_path / ".docgen" / "file_index.db")
+
+    def run():
+        writer = DocumentWriter(tmp_path / "docs.md", "Codebase")
+        stats = asyncio.run(GenerationPipeline(generator, FileDiscovery(), src, file_index=index).run(writer))
+        writer.finalize(str(p.relative_to(src)) for p in sorted(stats.discovered))
+        return stats
+
+    first = run()
+    assert (first.processed, first.unchanged) == (5, 0)
+    assert len(index.load()) == 5
+
+    # Unchanged files are never read on the second run
+    (src / "mod_3.py").write_text("x = 'changed'\n")
+    (src / "mod_4.py").unlink()
+    read = []
+    original = pipeline_module.read_and_analyze
+    monkeypatch.setattr(pipeline_module, "read_and_analyze", lambda path: read.append(path.name) or original(path))
+    second = run()
+
+    assert read == ["mod_3.py"]
+    assert (second.processed, second.unchanged, second.documented) == (4, 3, 4)
+    assert sorted(index.load()) == ["mod_0.py", "mod_1.py", "mod_2.py", "mod_3.py"]
+    assert "Generated docs for mod_1.py" in (tmp_path / "docs.md").read_text()
+
+    # Entries recorded under another cache key (e.g. a new model) are stale,
+    # and cache misses are documented again
+    read.clear()
+    generator.doc_key = lambda content_hash: f"key2-{content_hash}"
+    third = run()
+
+    assert sorted(read) == ["mod_0.py", "mod_1.py", "mod_2.py", "mod_3.py"]
+    assert (third.processed, third.unchanged) == (4, 0)
+    assert index.load()["mod_1.py"].doc_key.startswith("key2-")
+
+    read.clear()
+    del generator.cache[index.load()["mod_2.py"].doc_key]
+    fourth = run()
+
+    assert read == ["mod_2.py"]
+    assert (fourth.processed, fourth.unchanged) == (4, 3)
+    assert "Generated docs for mod_2.py" in (tmp_path / "docs.md").read_text()
+    index.close()
@@ -0,0 +1,59 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from docgen.config.urls import URLConfig
+from docgen.utils.rate_limiter import TokenBucket, parse_retry_after
+
+def test_burst_then_even_spacing():
+    bucket = TokenBucket(requests=10, window=10, burst=3)
+    waits = [bucket.reserve(now=100.0) for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3:] == [1.0, 2.0]
+
+def test_sustained_rate_never_exceeds_limit():
+    bucket = TokenBucket(**URLConfig.DEFAULT_RATE_LIMIT)
+    send_times = []
+    for _ in range(45):
+        send_times.append(100.0 + bucket.reserve(now=100.0))
+    # No 60s sliding window may contain more than the server's 15 requests
+    for start in send_times:
+        in_window = [t for t in send_times if start <= t < start + 60]
+        assert len(in_window) <= 15
+    assert send_times[1] - send_times[0] == 4.0
+
+def test_idle_bucket_refills():
+    bucket = TokenBucket(requests=2, window=2, burst=2)
+    assert bucket.reserve(now=0.0) == 0.0
+    assert bucket.reserve(now=0.0) == 0.0
+    assert bucket.reserve(now=0.0) == 1.0
+    assert bucket.reserve(now=10.0) == 0.0
+
+def test_available_counts_requests_sendable_now():
+    bucket = TokenBucket(requests=10, window=10, burst=3)
+    assert bucket.available(now=100.0) == 3
+    bucket.reserve(now=100.0)
+    bucket.reserve(now=100.0)
+    assert bucket.available(now=100.0) == 1
+    assert bucket.available(now=101.0) == 2
+    assert bucket.available(now=200.0) == 3
+
+def test_penalize_delays_next_request():
+    bucket = TokenBucket(requests=10, window=10, burst=5)
+    bucket.penalize(3.0, now=50.0)
+    assert bucket.reserve(now=50.0) == 3.0
+
+def test_acquire_does_not_wait_within_burst():
+    bucket = TokenBucket(requests=1, window=60, burst=2)
+
+    async def run():
+        await asyncio.wait_for(asyncio.gather(bucket.acquire(), bucket.acquire()), timeout=1)
+
+    asyncio.run(run())
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("garbage") is None
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(http_date) <= 30
@@ -0,0 +1,40 @@
+import time
+from docgen.utils.server_pool import ServerPool
+
+def test_choose_prefers_lower_latency_and_load():
+    pool = ServerPool(["a", "b"])
+    pool.servers["a"].ewma_latency = 0.1
+    pool.servers["b"].ewma_latency = 1.0
+    assert all(pool.choose() == "a" for _ in range(20))
+    pool.servers["a"].outstanding = 20
+    assert pool.choose() == "b"
+
+def test_choose_avoids_excluded_servers():
+    pool = ServerPool(["a", "b", "c"])
+    assert all(pool.choose(exclude=["a", "b"]) == "c" for _ in range(10))
+    # With every server excluded it still returns one
+    assert pool.choose(exclude=["a", "b", "c"]) in {"a", "b", "c"}
+
+def test_circuit_opens_after_consecutive_failures():
+    pool = ServerPool(["a", "b"], failure_threshold=2, cooldown=60)
+    for _ in range(2):
+        pool.finish("a", pool.start("a"), ok=False)
+    assert pool.healthy() == ["b"]
+    assert all(pool.choose() == "b" for _ in range(10))
+    assert pool.snapshot()["a"]["circuit"] == "open"
+
+def test_circuit_half_opens_after_cooldown_and_closes_on_success():
+    pool = ServerPool(["a"], failure_threshold=1, cooldown=60)
+    pool.finish("a", pool.start("a"), ok=False)
+    pool.servers["a"].open_until = time.monotonic() - 1
+    assert pool.snapshot()["a"]["circuit"] == "half-open"
+    pool.finish("a", pool.start("a"), ok=True)
+    assert pool.snapshot()["a"]["circuit"] == "closed"
+    assert pool.servers["a"].ewma_latency is not None
+
+def test_outstanding_requests_are_tracked():
+    pool = ServerPool(["a"])
+    started = pool.start("a")
+    assert pool.servers["a"].outstanding == 1
+    pool.finish("a", started, ok=True)
+    assert pool.servers["a"].outstanding == 0
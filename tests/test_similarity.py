@@ -0,0 +1,123 @@
+import asyncio
+from pathlib import Path
+from docgen.generators.ai_doc_generator import AIDocGenerator
+from docgen.generators.similarity import (
+    cluster_near_duplicates, estimate_similarity, identifier_mapping, minhash_signature, normalize_tokens
+)
+
+CLIENT_TEMPLATE = '''
+class {name}Client:
+    """Generated client for the {name} API."""
+
+    def __init__(self, session, base_url="https://api.example.com/{path}"):
+        self.session = session
+        self.base_url = base_url
+
+    def get_{path}(self, item_id):
+        return self.session.get(f"{{self.base_url}}/{{item_id}}", timeout=30)
+
+    def list_{path}(self, page=1, per_page=50):
+        return self.session.get(self.base_url, params={{"page": page, "per_page": per_page}})
+
+    def delete_{path}(self, item_id):
+        return self.session.delete(f"{{self.base_url}}/{{item_id}}")
+'''
+
+UNRELATED = '''
+def parse_config(path):
+    with open(path) as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    result = {}
+    for line in lines:
+        key, _, value = line.partition("=")
+        result[key.strip()] = value.strip()
+    return result
+'''
+
+def test_literals_are_normalized():
+    assert normalize_tokens('greeting = "hello"; n = 42') == normalize_tokens("greeting = 'bonjour'; n = 7")
+
+def test_locale_files_are_identical_after_normalization():
+    en = "\n".join(f'MESSAGES_{i} = "message number {i}"' for i in range(30))
+    fr = "\n".join(f'MESSAGES_{i} = "message numero {i}"' for i in range(30))
+    assert estimate_similarity(minhash_signature(en), minhash_signature(fr)) == 1.0
+
+def test_tiny_files_have_no_signature():
+    assert minhash_signature("x = 1") is None
+
+def test_cluster_groups_generated_clients():
+    codes = [
+        CLIENT_TEMPLATE.format(name="User", path="users"),
+        UNRELATED,
+        CLIENT_TEMPLATE.format(name="Order", path="orders") + "\n# extra\n",
+        "x = 1",
+    ]
+    clusters = cluster_near_duplicates(codes, threshold=0.5)
+    assert sorted(map(sorted, clusters)) == [[0, 2], [1], [3]]
+    # The largest member represents its cluster
+    assert [c for c in clusters if len(c) == 2][0][0] == 2
+
+def test_identifier_mapping_finds_substitutions():
+    old = CLIENT_TEMPLATE.format(name="User", path="users")
+    new = CLIENT_TEMPLATE.format(name="Order", path="orders")
+    mapping = identifier_mapping(old, new)
+    assert mapping["UserClient"] == "OrderClient"
+    assert mapping["get_users"] == "get_orders"
+
+def test_generator_sends_members_as_diff_requests(monkeypatch):
+    generator = AIDocGenerator()
+    generator.near_duplicate_threshold = 0.5
+    sent = []
+
+    async def fake_generate_text_batch(requests, on_result=None):
+        sent.extend(requests)
+        results = []
+        for i, req in enumerate(requests):
+            text = "Documents `UserClient` in `users.py`" if req["prompt_type"] == "doc" else "Uses orders"
+            results.append(text)
+            on_result(i, text)
+        return results
+
+    monkeypatch.setattr(generator.ai_client, "generate_text_batch", fake_generate_text_batch)
+    files = [
+        (Path("users.py"), {}, CLIENT_TEMPLATE.format(name="User", path="users") + "\n# longest\n"),
+        (Path("orders.py"), {}, CLIENT_TEMPLATE.format(name="Order", path="orders")),
+    ]
+    arrived = []
+    docs = asyncio.run(generator.generate_documentation_batch(files, on_result=lambda p, d: arrived.append(p)))
+
+    assert [req["prompt_type"] for req in sent] == ["doc", "update"]
+    assert sent[1]["code"].startswith("--- users.py")
+    assert docs[Path("users.py")] == "Documents `UserClient` in `users.py`"
+    assert docs[Path("orders.py")].startswith("Documents `OrderClient` in `orders.py`")
+    assert "Uses orders" in docs[Path("orders.py")]
+    assert sorted(arrived) == [Path("orders.py"), Path("users.py")]
+
+def test_adapt_template_only_rewrites_code_spans():
+    generator = AIDocGenerator()
+    rep = (Path("index.py"), {}, "def a(x):\n    return sum(x)\n")
+    member = (Path("main.py"), {}, "def x(x):\n    return sum(x)\n")
+    doc = generator._adapt_template(
+        "This is a helper that returns a sum. See index for a list.\n\nCall `a()` from `index.py`.", rep, member
+    )
+    assert doc.startswith("This is a helper that returns a sum. See index for a list.")
+    assert "Call `x()` from `main.py`." in doc
+
+def test_exact_duplicates_send_no_diff_request(monkeypatch):
+    generator = AIDocGenerator()
+    generator.near_duplicate_threshold = 0.5
+    sent = []
+
+    async def fake_generate_text_batch(requests, on_result=None):
+        sent.extend(requests)
+        for i in range(len(requests)):
+            on_result(i, "Documents `users.py`")
+        return ["Documents `users.py`"] * len(requests)
+
+    monkeypatch.setattr(generator.ai_client, "generate_text_batch", fake_generate_text_batch)
+    code = CLIENT_TEMPLATE.format(name="User", path="users")
+    files = [(Path("users.py"), {}, code), (Path("copy.py"), {}, code)]
+    docs = asyncio.run(generator.generate_documentation_batch(files))
+
+    assert [req["prompt_type"] for req in sent] == ["doc"]
+    assert docs[Path("copy.py")].startswith("Documents `copy.py`")
@@ -0,0 +1,104 @@
+# tests/test_watcher.py
+import asyncio
+from pathlib import Path
+from docgen.cli import _watch_burst, regenerate_changed
+from docgen.generators.doc_writer import DocumentWriter, parse_sections, rewrite_sections
+from docgen.utils.file_discovery import FileDiscovery
+from docgen.utils.watcher import ChangeBatcher, PollingWatcher, CHANGED, DELETED
+
+def test_change_batcher_debounces_and_coalesces():
+    batcher = ChangeBatcher(debounce=0.5, max_delay=5.0)
+    batcher.add(Path("a.py"), CHANGED, now=0.0)
+    batcher.add(Path("a.py"), CHANGED, now=0.3)
+    batcher.add(Path("b.py"), CHANGED, now=0.4)
+    batcher.add(Path("b.py"), DELETED, now=0.6)
+
+    assert not batcher.ready(now=1.0)
+    assert batcher.ready(now=1.1)
+    assert batcher.drain() == {Path("a.py"): CHANGED, Path("b.py"): DELETED}
+    assert not batcher.ready(now=10.0)
+
+def test_change_batcher_flushes_after_max_delay():
+    batcher = ChangeBatcher(debounce=0.5, max_delay=2.0)
+    for i in range(10):
+        batcher.add(Path("a.py"), CHANGED, now=i * 0.25)
+    assert batcher.ready(now=2.25)
+
+def test_polling_watcher_reports_changes(tmp_path):
+    (tmp_path / "keep.py").write_text("x = 1\n")
+    (tmp_path / "edit.py").write_text("x = 1\n")
+    (tmp_path / "gone.py").write_text("x = 1\n")
+    watcher = PollingWatcher(tmp_path, FileDiscovery(), interval=0)
+    watcher.start()
+
+    (tmp_path / "edit.py").write_text("x = 'edited'\n")
+    (tmp_path / "gone.py").unlink()
+    (tmp_path / "new.py").write_text("x = 2\n")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    changes = sorted((path.name, kind) for path, kind in watcher.poll())
+    assert changes == [("edit.py", CHANGED), ("gone.py", DELETED), ("new.py", CHANGED)]
+    assert watcher.poll() == []
+
+def _write_doc(doc_file, names):
+    writer = DocumentWriter(doc_file, "Codebase")
+    for name in names:
+        writer.add_section(name, f"Docs for {name}")
+    writer.finalize(names)
+
+def test_rewrite_sections_in_place(tmp_path):
+    doc_file = tmp_path / "codebase_documentation.md"
+    _write_doc(doc_file, ["a.py", "b.py", "c.py"])
+
+    rewrite_sections(doc_file, {"b.py": "New b", "d.py": "Docs for d.py"}, removed=["c.py"])
+
+    text = doc_file.read_text()
+    assert parse_sections(text) == {"a.py": "Docs for a.py", "b.py": "New b", "d.py": "Docs for d.py"}
+    assert "- [c.py]" not in text
+    assert text.index("- [a.py]") < text.index("- [b.py]") < text.index("- [d.py]") < text.index("<a id=")
+
+def test_regenerate_changed_rewrites_affected_sections(tmp_path, fake_generator):
+    from docgen.cache.file_index import FileIndex
+
+    doc_file = tmp_path / "codebase_documentation.md"
+    _write_doc(doc_file, ["a.py", "b.py", "c.py"])
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("x = 2\n")
+    generator = fake_generator
+    index = FileIndex(tmp_path / ".docgen" / "file_index.db")
+
+    updated = asyncio.run(regenerate_changed(
+        {tmp_path / "b.py": CHANGED, tmp_path / "c.py": DELETED}, tmp_path, doc_file, generator, index
+    ))
+
+    assert updated == ["b.py", "c.py"]
+    assert generator.batches == [[tmp_path / "b.py"]]
+    assert parse_sections(doc_file.read_text()) == {"a.py": "Docs for a.py", "b.py": "Generated docs for b.py"}
+    assert list(index.load()) == ["b.py"]
+    index.close()
+
+class CountingTracker:
+    def __init__(self):
+        self.tracked = 0
+
+    def track_request(self):
+        self.tracked += 1
+
+def test_watch_burst_survives_errors_and_tracks_only_generated_docs(tmp_path, fake_generator):
+    doc_file = tmp_path / "codebase_documentation.md"
+    _write_doc(doc_file, ["a.py", "b.py"])
+    (tmp_path / "a.py").write_text("x = 1\n")
+    tracker = CountingTracker()
+
+    async def unreachable(files_data, on_result=None):
+        raise RuntimeError("server unreachable")
+
+    fake_generator.generate_documentation_batch = unreachable
+    asyncio.run(_watch_burst({tmp_path / "a.py": CHANGED}, tmp_path, doc_file, fake_generator, None, tracker))
+    del fake_generator.generate_documentation_batch
+    asyncio.run(_watch_burst({tmp_path / "b.py": DELETED}, tmp_path, doc_file, fake_generator, None, tracker))
+    assert tracker.tracked == 0
+
+    asyncio.run(_watch_burst({tmp_path / "a.py": CHANGED}, tmp_path, doc_file, fake_generator, None, tracker))
+    assert tracker.tracked == 1
+    assert parse_sections(doc_file.read_text()) == {"a.py": "Generated docs for a.py"}